@@ -9,6 +9,7 @@ import importlib
 import pytest
 
 from tests.utils import plugin_finders
+from tests.utils.fake_cli import FakeCLI
 
 
 # Allow developers to skip all tests in plugins.
@@ -27,19 +28,32 @@ def pytest_addoption(parser):
 
 
 # Don't look at any test files in the sample_project/ dir.
-# Don't collect e2e tests; only run when specified over CLI.
-collect_ignore = ["sample_project", "tests/e2e_tests"]
+# Don't collect e2e tests or benchmarks; only run when specified over CLI.
+collect_ignore = ["sample_project", "tests/e2e_tests", "tests/benchmarks"]
 
 # Let plugins import utilities.
 path = Path(__file__).parent / "tests" / "integration_tests" / "utils"
 sys.path.insert(0, str(path))
 
 
+@pytest.fixture()
+def fake_cli(tmp_path):
+    """Provide fake platform CLIs and a fake `git push`, placed at the front of PATH.
+
+    This is available to unit and integration tests, in core and in plugins, so they
+    can run --automate-all code paths offline. Add commands with
+    fake_cli.add_command() and fake_cli.add_git(), and inspect calls with
+    fake_cli.invocations(). PATH is restored when the test finishes.
+    """
+    with FakeCLI(tmp_path / "fake_cli") as cli:
+        yield cli
+
+
 def pytest_configure(config):
     """Add plugin test paths to what's being collected."""
 
-    # Don't modify test collection when running e2e tests.
-    if any("e2e_tests" in arg for arg in config.args):
+    # Don't modify test collection when running e2e tests or benchmarks.
+    if any("e2e_tests" in arg or "benchmarks" in arg for arg in config.args):
         return
 
     if config.option.skip_plugin_tests:
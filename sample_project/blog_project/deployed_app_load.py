@@ -0,0 +1,244 @@
+"""Generate concurrent load against a running copy of the blog project.
+
+test_deployed_app_functionality.py checks that a deployment works. This module checks
+how well it performs, by replaying the same user journeys with a number of concurrent
+virtual users. Each virtual user has its own session, with a pooled connection, and
+repeats these journeys:
+- Anonymous visitor: home page, all_blogs, latest_posts, and the login page.
+- Member: register an account, log in from a new session, create a blog, create a
+  post on that blog, and view the post.
+
+Every request is timed, and the report shows throughput, error rate, and p50, p95,
+and p99 latency for each endpoint.
+
+This works against any server that's running the project: a deployed copy, runserver,
+or a local WSGI server such as gunicorn. It creates a new user account for every
+member journey, so it's best run against a project whose db can be thrown away.
+
+Usage:
+  $ python test_deployed_app_functionality.py --url http://localhost:8000/ --load
+  $ python test_deployed_app_functionality.py --url deployed_project_url --load --users 20 --iterations 10
+"""
+
+import math
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LoadStats:
+    """Thread-safe collection of timings for each endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.errors = {}
+
+    def record(self, endpoint, elapsed, ok):
+        with self.lock:
+            self.timings.setdefault(endpoint, []).append(elapsed)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+class VirtualUser:
+    """One simulated user, with its own pooled session."""
+
+    def __init__(self, app_url, stats, user_num, run_id, timeout):
+        self.app_url = app_url
+        self.stats = stats
+        self.user_num = user_num
+        self.run_id = run_id
+        self.timeout = timeout
+
+    def run(self, iterations):
+        for iteration in range(iterations):
+            self.anonymous_journey()
+            self.member_journey(iteration)
+
+    def anonymous_journey(self):
+        session = make_session()
+        self.request(session, "GET", "", expected_text="BlogMaker Lite")
+        self.request(session, "GET", "all_blogs", expected_text="Public Blogs")
+        self.request(session, "GET", "latest_posts", expected_text="Latest Posts")
+        self.request(session, "GET", "users/login/", expected_text="Log in")
+
+    def member_journey(self, iteration):
+        username = f"load_{self.run_id}_{self.user_num}_{iteration}"
+        # Django rejects passwords that are too similar to the username.
+        password = "Lo4d-test-pw-7f3k"
+
+        # Register a new account.
+        session = make_session()
+        self.request(session, "GET", "users/register/")
+        register_data = {
+            "username": username,
+            "password1": password,
+            "password2": password,
+        }
+        r = self.post_form(
+            session,
+            "users/register/",
+            register_data,
+            expected_text=f"Hello, {username}.",
+        )
+        if r is None:
+            return
+
+        # Log in from a new session.
+        session = make_session()
+        self.request(session, "GET", "users/login/")
+        # The project doesn't set LOGIN_REDIRECT_URL, so say where to go next.
+        login_data = {"username": username, "password": password, "next": "/"}
+        r = self.post_form(
+            session, "users/login/", login_data, expected_text=f"Hello, {username}."
+        )
+        if r is None:
+            return
+
+        # Create a blog, and find its id on the my_blogs page it redirects to.
+        blog_title = f"Load test blog {username}"
+        blog_data = {"title": blog_title, "public": "on"}
+        r = self.post_form(session, "new_blog/", blog_data, expected_text=blog_title)
+        if r is None:
+            return
+        m = re.search(rf'href="[^"]*/blogs/(\d+)/">{re.escape(blog_title)}<', r.text)
+        if not m:
+            return
+        blog_id = m.group(1)
+
+        # Create a post, and view it.
+        post_data = {
+            "title": f"Load test post {username}",
+            "body": "This post was created by the load generator.",
+            "public": "on",
+        }
+        self.post_form(
+            session,
+            f"new_post/{blog_id}/",
+            post_data,
+            endpoint="POST new_post/<blog_id>/",
+            expected_text=post_data["title"],
+        )
+        self.request(
+            session,
+            "GET",
+            f"blogs/{blog_id}/",
+            endpoint="GET blogs/<blog_id>/",
+            expected_text=post_data["title"],
+        )
+
+    def post_form(self, session, path, data, endpoint=None, expected_text=None):
+        """Post a form, including the csrf token from the session's cookies."""
+        data = {**data, "csrfmiddlewaretoken": session.cookies.get("csrftoken", "")}
+        headers = {"referer": f"{self.app_url}{path}"}
+        return self.request(
+            session,
+            "POST",
+            path,
+            endpoint=endpoint,
+            expected_text=expected_text,
+            data=data,
+            headers=headers,
+        )
+
+    def request(
+        self, session, method, path, endpoint=None, expected_text=None, **kwargs
+    ):
+        """Make a timed request, and record the result.
+
+        Returns:
+            Response, or None if the request failed.
+        """
+        endpoint = endpoint or f"{method} {path or '/'}"
+        start = time.perf_counter()
+        try:
+            r = session.request(
+                method, f"{self.app_url}{path}", timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException:
+            self.stats.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+
+        elapsed = time.perf_counter() - start
+        ok = r.status_code < 400
+        if ok and expected_text:
+            ok = expected_text in r.text
+        self.stats.record(endpoint, elapsed, ok)
+
+        return r if ok else None
+
+
+def make_session():
+    """Make a session that reuses its connection across requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def percentile(sorted_values, pct):
+    """Get a percentile from a sorted list, using the nearest-rank method."""
+    if not sorted_values:
+        return 0
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_load(app_url, users=10, iterations=5, timeout=30):
+    """Run the load test, and print a report.
+
+    Returns:
+        LoadStats
+    """
+    run_id = uuid.uuid4().hex[:8]
+    stats = LoadStats()
+    print(f"\nGenerating load against {app_url}...")
+    print(f"  {users} virtual users, {iterations} iterations each.\n")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        vusers = [
+            VirtualUser(app_url, stats, user_num, run_id, timeout)
+            for user_num in range(users)
+        ]
+        futures = [executor.submit(vuser.run, iterations) for vuser in vusers]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    print(format_report(stats, elapsed))
+    return stats
+
+
+def format_report(stats, elapsed):
+    """Format throughput, error rate, and latency percentiles for each endpoint."""
+    header = f"{'endpoint':32} {'reqs':>6} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    lines = [header, "-" * len(header)]
+
+    total_requests, total_errors = 0, 0
+    for endpoint, timings in stats.timings.items():
+        timings = sorted(timings)
+        errors = stats.errors.get(endpoint, 0)
+        total_requests += len(timings)
+        total_errors += errors
+
+        p50, p95, p99 = (percentile(timings, pct) * 1000 for pct in (50, 95, 99))
+        lines.append(
+            f"{endpoint:32} {len(timings):6} {len(timings) / elapsed:8.1f} "
+            f"{errors / len(timings):7.1%} {p50:8.1f} {p95:8.1f} {p99:8.1f}"
+        )
+
+    lines.append("-" * len(header))
+    error_rate = total_errors / total_requests if total_requests else 0
+    lines.append(
+        f"{'total':32} {total_requests:6} {total_requests / elapsed:8.1f} {error_rate:7.1%}"
+    )
+    lines.append(f"\nFinished in {elapsed:.1f}s.")
+    return "\n".join(lines)
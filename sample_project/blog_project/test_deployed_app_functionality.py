@@ -25,6 +25,8 @@ Usage:
   $ python test_deployed_app_functionality.py --url http://localhost:8000/ --flush-db
 - Run against freshly-pushed project:
   $ python test_deployed_app_functionality.py --url deployed_project_url
+- Generate concurrent load instead of checking functionality. See deployed_app_load.py:
+  $ python test_deployed_app_functionality.py --url deployed_project_url --load --users 20
 """
 
 import sys, re, subprocess, argparse
@@ -36,6 +38,9 @@ import requests
 parser = argparse.ArgumentParser()
 parser.add_argument("--url", type=str, required=True)
 parser.add_argument("--flush-db", action="store_true")
+parser.add_argument("--load", action="store_true")
+parser.add_argument("--users", type=int, default=10)
+parser.add_argument("--iterations", type=int, default=5)
 args = parser.parse_args()
 
 # Get URL of deployed project from CLI args.
@@ -57,6 +62,15 @@ if args.flush_db:
     print("  Flushed db.")
 
 
+# In load mode, replay the same user journeys concurrently instead of checking
+#   functionality.
+if args.load:
+    from deployed_app_load import run_load
+
+    stats = run_load(app_url, users=args.users, iterations=args.iterations)
+    sys.exit(1 if stats.errors else 0)
+
+
 print(f"\nTesting functionality of deployed app at {app_url}...\n")
 
 # --- Anonymous home page ---
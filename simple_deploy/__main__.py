@@ -0,0 +1,33 @@
+"""Run deploy through the project's deploy daemon, if one is running.
+
+    $ python -m simple_deploy [deploy options]
+
+If there's no daemon for this project, or the daemon needs to be restarted, this
+runs `manage.py deploy` directly. See management/commands/deploy_daemon.py.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from simple_deploy.management.commands.utils import daemon_protocol
+
+
+def main():
+    argv = sys.argv[1:]
+
+    # Deploy runs in a separate process for --service, which the daemon can't relay.
+    # --watch runs until it's interrupted, which the daemon can't relay either.
+    if any(arg.split("=")[0] in ("--service", "--watch") for arg in argv):
+        exit_code = None
+    else:
+        exit_code = daemon_protocol.run_client(argv)
+    if exit_code is None:
+        project_root = daemon_protocol.find_project_root(Path.cwd()) or Path.cwd()
+        cmd = [sys.executable, str(project_root / "manage.py"), "deploy", *argv]
+        exit_code = subprocess.run(cmd).returncode
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
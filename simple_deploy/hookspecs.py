@@ -12,9 +12,24 @@ def simple_deploy_get_plugin_config():
     - platform_name
     Optional:
     - confirm_automate_all_msg (required if automate_all_supported is True)
+    - instance_cpus, instance_memory_mb: Size of the instance the project will run
+      on, used by plugin_utils.get_worker_settings()
+    - workload_profile: "io", "cpu", or "mixed"; also used for sizing workers
     """
 
 
 @hookspec
 def simple_deploy_deploy():
     """Carry out all platform-specific configuration and deployment work."""
+
+
+@hookspec(firstresult=True)
+def simple_deploy_get_performance_settings():
+    """Get a block of performance-related settings for production.
+
+    Core provides a default implementation. Plugins can implement this hook to
+    customize the block, and return None to fall back to core's block.
+
+    Returns:
+    - Str: Settings block, to be added at the end of the plugin's settings block.
+    """
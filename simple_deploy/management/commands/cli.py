@@ -3,13 +3,29 @@
 
 import argparse
 
+from .utils import log_retention
+
 
 def get_usage():
     """Return a custom usage text."""
     return """manage.py deploy
         [--automate-all]
         [--no-logging]
+        [--log-max-count COUNT]
+        [--log-max-age DAYS]
+        [--log-max-size MB]
         [--ignore-unclean-git]
+        [--precompress-static]
+        [--build-wheelhouse]
+        [--service SERVICE]
+        [--list-services]
+        [--watch]
+
+        [--analyze-cold-start]
+        [--cold-start-budget SECONDS]
+        [--dependency-report]
+        [--analyze-migrations]
+        [--max-migration-risk {low,medium,high}]
 
         [--region REGION]
         [--deployed-project-name DEPLOYED_PROJECT_NAME]"""
@@ -27,6 +43,7 @@ class SimpleDeployCLI:
         deployment_config_group = parser.add_argument_group(
             "Customize deployment configuration"
         )
+        analysis_group = parser.add_argument_group("Analyze the project")
 
         # Show our own help message.
         help_group.add_argument(
@@ -48,6 +65,31 @@ class SimpleDeployCLI:
             action="store_true",
         )
 
+        # Old logs are removed when a run starts, if they're beyond any of these limits.
+        behavior_group.add_argument(
+            "--log-max-count",
+            type=int,
+            metavar="COUNT",
+            help="Keep at most this many logs in simple_deploy_logs/. Use 0 for no limit.",
+            default=log_retention.MAX_COUNT,
+        )
+
+        behavior_group.add_argument(
+            "--log-max-age",
+            type=int,
+            metavar="DAYS",
+            help="Remove logs older than this many days. Use 0 for no limit.",
+            default=log_retention.MAX_AGE_DAYS,
+        )
+
+        behavior_group.add_argument(
+            "--log-max-size",
+            type=int,
+            metavar="MB",
+            help="Remove the oldest logs when all logs together are larger than this. Use 0 for no limit.",
+            default=log_retention.MAX_SIZE_MB,
+        )
+
         # Allow users to use simple_deploy even with an unclean git status.
         behavior_group.add_argument(
             "--ignore-unclean-git",
@@ -55,6 +97,83 @@ class SimpleDeployCLI:
             action="store_true",
         )
 
+        # Collect static files into a build dir, and write compressed copies of them.
+        behavior_group.add_argument(
+            "--precompress-static",
+            help="Collect static files into simple_deploy_build/, and precompress them.",
+            action="store_true",
+        )
+
+        # Download wheels for all requirements, so remote builds can install offline.
+        behavior_group.add_argument(
+            "--build-wheelhouse",
+            help="Build a wheelhouse of all requirements in simple_deploy_build/, for offline installs on the platform.",
+            action="store_true",
+        )
+
+        # In a repository with several Django projects, choose one by name.
+        behavior_group.add_argument(
+            "--service",
+            type=str,
+            help="Configure the Django project with this name, or path, in a repository that has several projects.",
+            default=None,
+        )
+
+        behavior_group.add_argument(
+            "--list-services",
+            help="List the Django projects in this repository, and exit.",
+            action="store_true",
+        )
+
+        # Plan changes without writing them, and update the plan as files change.
+        behavior_group.add_argument(
+            "--watch",
+            help="Show the changes deploy would make, without making them. Keep running, and update them when settings, requirements, or templates change.",
+            action="store_true",
+        )
+
+        # --- Arguments to analyze the project before configuring it ---
+
+        # Measure how long the project takes to boot in a fresh interpreter. This
+        # matters on platforms that scale to zero.
+        analysis_group.add_argument(
+            "--analyze-cold-start",
+            help="Measure import time of settings, installed apps, and the WSGI application.",
+            action="store_true",
+        )
+
+        # Passing a budget implies --analyze-cold-start.
+        analysis_group.add_argument(
+            "--cold-start-budget",
+            type=float,
+            metavar="SECONDS",
+            help="Stop if the project takes longer than this to boot.",
+            default=None,
+        )
+
+        # Report the size and import cost of each requirement.
+        analysis_group.add_argument(
+            "--dependency-report",
+            help="Report install size, native extension size, and import time for each requirement.",
+            action="store_true",
+        )
+
+        # Classify unapplied migrations by how likely they are to lock or rewrite
+        # tables.
+        analysis_group.add_argument(
+            "--analyze-migrations",
+            help="Report unapplied migrations that may lock or rewrite tables.",
+            action="store_true",
+        )
+
+        # Passing a maximum risk implies --analyze-migrations.
+        analysis_group.add_argument(
+            "--max-migration-risk",
+            choices=["low", "medium", "high"],
+            help="With --automate-all, stop if any unapplied migration is riskier than this.",
+            default=None,
+        )
+
         # --- Arguments to customize deployment configuration ---
 
         # Allow users to set the deployed project name. This is the name that will be
@@ -14,18 +14,22 @@ Overview:
     mode, it also makes the actual deployment. The entire process is coordinated in 
     handle():
     - Parse the CLI options that were passed.
-    - Start logging, unless suppressed.
+    - Start logging, unless suppressed, and remove or compress old logs.
+    - Run deploy in another project, if --service names one.
     - Validate the set of arguments that were passed.
     - Inspect the user's system.
     - Inspect the project.
     - Add django-simple-deploy to project requirements.
+    - Collect and precompress static files, if requested.
+    - Build a wheelhouse of requirements, if requested.
     - Call the platform's `deploy()` method.
+    - With --watch, show the planned changes, and update them as files change.
 
 See the project documentation for more about this process:
     https://django-simple-deploy.readthedocs.io/en/latest/
 """
 
-import sys, os, platform, re, subprocess, logging, shlex
+import sys, os, io, platform, re, subprocess, logging, shlex, json, time
 from datetime import datetime
 from pathlib import Path
 from importlib import import_module
@@ -38,6 +42,19 @@ import toml
 from . import sd_messages
 from .utils import sd_utils
 from .utils import plugin_utils
+from .utils import cold_start
+from .utils import performance_settings
+from .utils import capacity_planner
+from .utils import static_assets
+from .utils import dependency_report
+from .utils import migration_risk
+from .utils import git_reader
+from .utils import project_index
+from .utils import log_retention
+from .utils import log_index
+from .utils import redaction
+from .utils import daemon_protocol
+from .utils import watch
 
 from .utils.plugin_utils import sd_config
 from .utils.command_errors import SimpleDeployCommandError
@@ -55,6 +72,15 @@ class Command(BaseCommand):
     # Show a summary of simple_deploy in the help text.
     help = "Configures your project for deployment to the specified platform."
 
+    # CLI args, when run from the command line. See run_from_argv().
+    argv = None
+
+    # Path to this run's log, if logging has started.
+    log_path = None
+
+    # The phase of the run that's in progress. See log_index.PHASES.
+    phase = None
+
     def __init__(self):
         """Customize help output, assign attributes."""
 
@@ -75,6 +101,15 @@ class Command(BaseCommand):
 
         super().__init__()
 
+    @property
+    def log_dir_path(self):
+        """Path to the log dir, whether logging is on or not.
+
+        Past runs are recorded in the log dir, and analysis reads them even when this
+        run isn't logged.
+        """
+        return settings.BASE_DIR / "simple_deploy_logs"
+
     def create_parser(self, prog_name, subcommand, **kwargs):
         """Customize the ArgumentParser object that will be created."""
         epilog = "For more help, see the full documentation at: "
@@ -90,6 +125,33 @@ class Command(BaseCommand):
 
         return parser
 
+    def run_from_argv(self, argv):
+        """Keep the CLI args, so deploy can be run again in another project."""
+        self.argv = argv[2:]
+        super().run_from_argv(argv)
+
+    def execute(self, *args, **options):
+        """Run the command, and record how the run ended in the index of runs."""
+        started, start = datetime.now(), time.perf_counter()
+        outcome, error = "failed", None
+        try:
+            output = super().execute(*args, **options)
+            outcome = "succeeded"
+            return output
+        except SystemExit as e:
+            # Declining --automate-all exits without an error.
+            if not e.code:
+                outcome = "cancelled"
+            raise
+        except KeyboardInterrupt:
+            outcome = "interrupted"
+            raise
+        except Exception as e:
+            error = str(e).strip()
+            raise
+        finally:
+            self._record_run(started, outcome, error, time.perf_counter() - start)
+
     def add_arguments(self, parser):
         """Define CLI options."""
         sd_cli = cli.SimpleDeployCLI(parser)
@@ -114,6 +176,14 @@ class Command(BaseCommand):
         # has been passed.
         self._parse_cli_options(options)
 
+        # In a repository with several Django projects, the project to configure can be
+        # chosen by name. Do this before logging, so the log is written in that project.
+        if self.list_services:
+            self._list_services()
+            return
+        if self.service and self._run_in_service():
+            return
+
         if sd_config.log_output:
             self._start_logging()
             self._log_cli_args(options)
@@ -122,19 +192,36 @@ class Command(BaseCommand):
 
         # Import the platform-specific plugin module. This performs some validation, so
         # it's best to call this before modifying project in any way.
+        self._start_phase("load_plugin")
         platform_module = self._load_plugin()
         pm.register(platform_module)
         self._validate_plugin(pm)
 
+        # Register core's default hook implementations. This happens after validation,
+        # because validation expects the plugin to be the first registered module.
+        if not pm.is_registered(performance_settings):
+            pm.register(performance_settings)
+
         platform_name = self.plugin_config.platform_name
         plugin_utils.write_output(f"\nDeployment target: {platform_name}")
 
         # Inspect the user's system and project, and make sure simple_deploy is included
         # in project requirements.
+        self._start_phase("inspect")
         self._inspect_system()
         self._inspect_project()
+
+        self._start_phase("analyze")
+        self._analyze_cold_start()
+        self._analyze_dependencies()
+        self._analyze_migrations()
+
+        self._start_phase("prepare")
         self._add_simple_deploy_req()
+        self._precompress_static()
+        self._build_wheelhouse()
 
+        self._start_phase("confirm")
         self._confirm_automate_all(pm)
 
         # At this point sd_config is fully defined, so we can validate it before handing
@@ -142,15 +229,44 @@ class Command(BaseCommand):
         sd_config.validate()
 
         # Platform-agnostic work is finished. Hand off to plugin.
+        self._start_phase("plugin_deploy")
+        # With --watch, core's planned changes are reused each time the plan is updated.
+        self.core_plan = dict(sd_config.plan or {})
         pm.hook.simple_deploy_deploy()
 
+        if self.watch:
+            self._watch(platform_module)
+
+    def _start_phase(self, phase):
+        """Note the start of a phase, so logs can be queried by phase later."""
+        self.phase = phase
+        plugin_utils.log_info(f"{log_index.PHASE_MARKER}{phase}")
+
     def _parse_cli_options(self, options):
         """Parse CLI options from simple_deploy command."""
 
         # Platform-agnostic arguments.
         sd_config.automate_all = options["automate_all"]
         sd_config.log_output = not (options["no_logging"])
+        self.log_max_count = options["log_max_count"]
+        self.log_max_age = options["log_max_age"]
+        self.log_max_size = options["log_max_size"]
         self.ignore_unclean_git = options["ignore_unclean_git"]
+        self.precompress_static = options["precompress_static"]
+        self.build_wheelhouse = options["build_wheelhouse"]
+        self.cold_start_budget = options["cold_start_budget"]
+        self.dependency_report = options["dependency_report"]
+        self.max_migration_risk = options["max_migration_risk"]
+        self.service = options["service"]
+        self.list_services = options["list_services"]
+        self.watch = options["watch"]
+        sd_config.plan = {} if self.watch else None
+        self.analyze_migrations = (
+            options["analyze_migrations"] or self.max_migration_risk is not None
+        )
+        self.analyze_cold_start = (
+            options["analyze_cold_start"] or self.cold_start_budget is not None
+        )
 
         # Platform.sh arguments.
         sd_config.deployed_project_name = options["deployed_project_name"]
@@ -191,6 +307,49 @@ class Command(BaseCommand):
         plugin_utils.write_output("Logging run of `manage.py deploy`...")
         plugin_utils.write_output(f"Created {verbose_log_path}.")
 
+        self.log_path = verbose_log_path
+        self._manage_old_logs()
+
+    def _manage_old_logs(self):
+        """Remove logs beyond the retention limits, and compress the rest.
+
+        Compression happens in the background, while deploy carries on.
+        """
+        removed_logs = log_retention.apply_retention(
+            self.log_dir_path,
+            self.log_path,
+            max_count=self.log_max_count,
+            max_age_days=self.log_max_age,
+            max_size_mb=self.log_max_size,
+        )
+        if removed_logs:
+            msg = f"Removed {len(removed_logs)} old log(s) from {self.log_dir_path}."
+            plugin_utils.write_output(msg)
+
+        self.compression_thread = log_retention.start_compression(
+            self.log_dir_path, self.log_path
+        )
+
+    def _record_run(self, started, outcome, error, duration):
+        """Add this run to the index of runs, if it was logged."""
+        if self.log_path is None:
+            return
+
+        run = {
+            "log": self.log_path.name,
+            "timestamp": started.isoformat(timespec="seconds"),
+            "plugin": getattr(self, "plugin_name", None),
+            "outcome": outcome,
+            "phase": self.phase,
+            "duration": round(duration, 3),
+        }
+        if error:
+            run["error"] = redaction.redact(error.splitlines()[0])
+        if outcome == "succeeded" and sd_config.automate_all:
+            # The platform applied these migrations; later analysis starts from them.
+            run["migrations"] = migration_risk.get_migration_names()
+        log_retention.record_run(self.log_dir_path, run)
+
     def _log_cli_args(self, options):
         """Log the args used for this call."""
         plugin_utils.log_info(f"\nCLI args:")
@@ -203,7 +362,6 @@ class Command(BaseCommand):
         Returns:
             bool: True if created directory, False if already one present.
         """
-        self.log_dir_path = settings.BASE_DIR / "simple_deploy_logs"
         if not self.log_dir_path.exists():
             self.log_dir_path.mkdir()
             return True
@@ -223,6 +381,76 @@ class Command(BaseCommand):
         platform_module = import_module(f"{self.plugin_name}.deploy")
         return platform_module
 
+    def _get_services(self):
+        """Get the Django projects in this repository, from the index if possible.
+
+        Returns:
+            Tuple[Path, List[dict]]: Root of the repository, and its services.
+        """
+        try:
+            repo = git_reader.find_repo(settings.BASE_DIR)
+        except git_reader.GitReaderError as e:
+            raise SimpleDeployCommandError(f"Could not read the .git/ directory: {e}")
+        if repo is None:
+            raise SimpleDeployCommandError("Could not find a .git/ directory.")
+
+        services, rescanned = project_index.get_services(repo.work_tree)
+        index_path = project_index.get_index_path(repo.work_tree)
+        if rescanned:
+            msg = f"Found {len(services)} Django project(s); wrote {index_path}."
+        else:
+            msg = f"Using project index at {index_path}."
+        plugin_utils.write_output(msg)
+
+        return repo.work_tree, services
+
+    def _list_services(self):
+        """Show every Django project in the repository."""
+        _repo_root, services = self._get_services()
+        plugin_utils.write_output(project_index.format_services(services))
+
+    def _run_in_service(self):
+        """Run deploy in the project named by --service, if it's not this project.
+
+        Returns:
+            bool: True if deploy was run in another project, False if the named
+            service is this project.
+
+        Raises:
+            SimpleDeployCommandError: If the service, or its virtual environment, can't
+            be found.
+            SystemExit: With deploy's exit code, if deploy fails in the other project.
+        """
+        repo_root, services = self._get_services()
+        service = project_index.find_service(services, self.service)
+        if service is None:
+            names = [found["name"] for found in services]
+            raise SimpleDeployCommandError(
+                sd_messages.service_not_found(self.service, names)
+            )
+
+        service_root = (repo_root / service["path"]).resolve()
+        if service_root == Path(settings.BASE_DIR).resolve():
+            return False
+
+        if self.argv is None:
+            raise SimpleDeployCommandError(sd_messages.service_needs_argv)
+
+        # Run the other project with its own environment, not this one.
+        python_path = project_index.find_venv_python(service_root, repo_root)
+        if python_path is None:
+            raise SimpleDeployCommandError(
+                sd_messages.service_venv_not_found(service["name"], service_root)
+            )
+
+        plugin_utils.write_output(f"Running deploy in {service_root}...")
+        argv = project_index.remove_option(self.argv, "--service")
+        cmd = [str(python_path), "manage.py", "deploy", *argv]
+        exit_code = subprocess.run(cmd, cwd=service_root).returncode
+        if exit_code:
+            sys.exit(exit_code)
+        return True
+
     def _validate_command(self):
         """Verify deploy has been called with a valid set of arguments.
 
@@ -232,9 +460,17 @@ class Command(BaseCommand):
         Raises:
             SimpleDeployCommandError: If we can't do a deployment with given set of args.
         """
-        # DEV: This was used to validate the deprecated --platform arg, but will probably
-        # be used again.
-        pass
+        # --watch only plans changes, so it can't be used with options that make
+        # changes outside the plan.
+        if self.watch:
+            for option, used in [
+                ("--automate-all", sd_config.automate_all),
+                ("--precompress-static", self.precompress_static),
+                ("--build-wheelhouse", self.build_wheelhouse),
+            ]:
+                if used:
+                    error_msg = sd_messages.watch_incompatible(option)
+                    raise SimpleDeployCommandError(error_msg)
 
     def _inspect_system(self):
         """Inspect the user's local system for relevant information.
@@ -263,7 +499,10 @@ class Command(BaseCommand):
             Determine project name.
             Find paths: .git/, settings, project root.
             Determine if it's a nested project or not.
-            Get the dependency management approach: requirements.txt, Pipenv, Poetry
+            Find the nearest dependency manifest, which may be below the .git/ dir in
+              a repository with several projects.
+            Get the dependency management approach: requirements.txt, Pipenv, Poetry,
+              uv
             Get current requirements.
 
         Anything that might cause us to exit before making the first remote call should
@@ -286,6 +525,11 @@ class Command(BaseCommand):
         self._find_git_dir()
         self._check_git_status()
 
+        self.manifest_dir = (
+            project_index.find_manifest_dir(sd_config.project_root, sd_config.git_path)
+            or sd_config.git_path
+        )
+
         # Now that we know where .git is, we can ignore simple_deploy logs.
         if sd_config.log_output:
             self._ignore_sd_logs()
@@ -294,17 +538,127 @@ class Command(BaseCommand):
             sd_config.project_root / sd_config.local_project_name / "settings.py"
         )
 
-        # Find out which package manager is being used: req_txt, poetry, or pipenv
+        # Find out which package manager is being used: req_txt, poetry, pipenv, or uv
         sd_config.pkg_manager = self._get_dep_man_approach()
         msg = f"Dependency management system: {sd_config.pkg_manager}"
         plugin_utils.write_output(msg)
 
         sd_config.requirements = self._get_current_requirements()
 
+    def _analyze_cold_start(self):
+        """Measure how long the project takes to boot, if requested.
+
+        The project is booted in a fresh interpreter, so the measurement isn't affected
+        by anything this process has already imported.
+
+        Returns:
+            None
+
+        Raises:
+            SimpleDeployCommandError: If the project can't be booted, or if it takes
+            longer than the budget that was passed.
+        """
+        if not self.analyze_cold_start:
+            return
+
+        plugin_utils.write_output("\nAnalyzing cold start time...")
+        report = self._get_boot_report()
+        plugin_utils.write_output(cold_start.format_report(report))
+
+        if self.cold_start_budget is None:
+            return
+        if report["total"] > self.cold_start_budget:
+            error_msg = sd_messages.cold_start_budget_exceeded(
+                report["total"], self.cold_start_budget
+            )
+            raise SimpleDeployCommandError(error_msg)
+
+    def _analyze_dependencies(self):
+        """Report the footprint of each requirement, if requested.
+
+        The report is written to the console and the log. If logging is enabled, it's
+        also written as JSON to the log directory.
+
+        Returns:
+            None
+
+        Raises:
+            SimpleDeployCommandError: If the project can't be booted.
+        """
+        if not self.dependency_report:
+            return
+
+        plugin_utils.write_output("\nAnalyzing dependencies...")
+        boot_report = self._get_boot_report()
+        report = dependency_report.build_report(sd_config.requirements, boot_report)
+        plugin_utils.write_output(dependency_report.format_report(report))
+
+        if sd_config.log_output:
+            timestamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+            report_path = self.log_dir_path / f"dependency_report_{timestamp}.json"
+            report_path.write_text(json.dumps(report, indent=2))
+            plugin_utils.write_output(f"\n  Wrote {report_path}.")
+
+    def _analyze_migrations(self):
+        """Report unapplied migrations that may lock or rewrite tables, if requested.
+
+        Migrations are compared with the ones recorded by the last successful
+        deployment with --automate-all, or with an empty database if there isn't one.
+
+        With --automate-all, the platform applies these migrations as part of the
+        deployment, so stop before making any changes if they're riskier than the
+        allowed level.
+
+        Returns:
+            None
+
+        Raises:
+            SimpleDeployCommandError: If automating all steps, and a migration is
+            riskier than --max-migration-risk.
+        """
+        if not self.analyze_migrations:
+            return
+
+        plugin_utils.write_output("\nAnalyzing unapplied migrations...")
+        runs = log_retention.read_runs(self.log_dir_path)
+        report = migration_risk.scan(migration_risk.get_last_deployment(runs))
+        plugin_utils.write_output(migration_risk.format_report(report))
+
+        if not (sd_config.automate_all and self.max_migration_risk):
+            return
+        max_risk = migration_risk.get_max_risk(report)
+        if migration_risk.exceeds(max_risk, self.max_migration_risk):
+            baseline = migration_risk.describe_baseline(report)
+            error_msg = sd_messages.migration_risk_exceeded(
+                max_risk, self.max_migration_risk, baseline
+            )
+            raise SimpleDeployCommandError(error_msg)
+
+    def _get_boot_report(self):
+        """Boot the project in a fresh interpreter, once per run.
+
+        Returns:
+            dict: Report from cold_start.run_boot_probe().
+
+        Raises:
+            SimpleDeployCommandError: If the project can't be booted.
+        """
+        if getattr(self, "_boot_report", None) is None:
+            try:
+                self._boot_report = cold_start.run_boot_probe(
+                    sd_config.project_root, settings.SETTINGS_MODULE
+                )
+            except cold_start.ProbeReportError as e:
+                error_msg = sd_messages.cold_start_report_invalid(str(e))
+                raise SimpleDeployCommandError(error_msg)
+            except RuntimeError as e:
+                raise SimpleDeployCommandError(sd_messages.cold_start_failed(str(e)))
+        return self._boot_report
+
     def _find_git_dir(self):
         """Find .git/ location.
 
-        Should be in BASE_DIR or BASE_DIR.parent. If it's in BASE_DIR.parent, this is a
+        Usually in BASE_DIR or BASE_DIR.parent. If it's in BASE_DIR.parent, this is a
         project with a nested directory structure. A nested project has the structure
         set up by:
            `django-admin startproject project_name`
@@ -313,8 +667,14 @@ class Command(BaseCommand):
         This matters for knowing where manage.py is, and knowing where the .git/ dir is
         likely to be.
 
+        The search continues upwards, the way git finds a repository, so projects in a
+        subdirectory of a larger repository are found as well. A .git file, as used by
+        worktrees, is followed to the actual git dir. Only a project one level below
+        the repository root is nested; sd_config.project_rel_path is the project's
+        location in the repository, however deep it is.
+
         Sets:
-            sd_config.git_path, sd_config.nested_project
+            sd_config.git_path, sd_config.nested_project, sd_config.project_rel_path
 
         Returns:
             None
@@ -322,19 +682,28 @@ class Command(BaseCommand):
         Raises:
             SimpleDeployCommandError: If .git/ dir not found.
         """
-        if (sd_config.project_root / ".git").exists():
-            sd_config.git_path = sd_config.project_root
-            plugin_utils.write_output(f"Found .git dir at {sd_config.git_path}.")
-            sd_config.nested_project = False
-        elif (self.project_root.parent / ".git").exists():
-            sd_config.git_path = sd_config.project_root.parent
-            plugin_utils.write_output(f"Found .git dir at {sd_config.git_path}.")
-            sd_config.nested_project = True
-        else:
+        try:
+            self.git_repo = git_reader.find_repo(sd_config.project_root)
+        except git_reader.GitReaderError as e:
+            raise SimpleDeployCommandError(f"Could not read the .git/ directory: {e}")
+
+        if self.git_repo is None:
             error_msg = "Could not find a .git/ directory."
-            error_msg += f"\n  Looked in {sd_config.project_root} and in {sd_config.project_root.parent}."
+            error_msg += f"\n  Looked in {sd_config.project_root} and its parents."
             raise SimpleDeployCommandError(error_msg)
 
+        sd_config.git_path = self.git_repo.work_tree
+        project_root = Path(sd_config.project_root).resolve()
+        sd_config.nested_project = sd_config.git_path == project_root.parent
+        sd_config.project_rel_path = project_root.relative_to(sd_config.git_path)
+        plugin_utils.write_output(f"Found .git dir at {sd_config.git_path}.")
+
+        try:
+            branch, head = self.git_repo.read_head()
+            plugin_utils.log_info(f"Current branch: {branch}, HEAD: {head}")
+        except git_reader.GitReaderError as e:
+            plugin_utils.log_info(f"Couldn't read HEAD without git: {e}")
+
     def _check_git_status(self):
         """Make sure all non-simple_deploy changes have already been committed.
 
@@ -347,6 +716,8 @@ class Command(BaseCommand):
         simple_deploy's work is acceptable, for example if they are doing a couple
         runs to get things right.
 
+        Status is read in-process when possible, and with the git CLI otherwise.
+
         Users can override this check with the --ignore-unclean-git flag.
 
         Returns:
@@ -360,14 +731,13 @@ class Command(BaseCommand):
             plugin_utils.write_output(msg)
             return
 
-        cmd = "git status --porcelain"
-        output_obj = plugin_utils.run_quick_command(cmd)
-        status_output = output_obj.stdout.decode()
-        plugin_utils.log_info(f"{status_output}")
+        try:
+            status_output, diff_output = self._read_git_status()
+        except git_reader.GitReaderError as e:
+            plugin_utils.log_info(f"Using the git CLI to check status: {e}")
+            status_output, diff_output = self._run_git_status()
 
-        cmd = "git diff --unified=0"
-        output_obj = plugin_utils.run_quick_command(cmd)
-        diff_output = output_obj.stdout.decode()
+        plugin_utils.log_info(f"{status_output}")
         plugin_utils.log_info(f"{diff_output}\n")
 
         proceed = sd_utils.check_status_output(status_output, diff_output)
@@ -378,6 +748,44 @@ class Command(BaseCommand):
         else:
             self._raise_unclean_error()
 
+    def _read_git_status(self):
+        """Get the equivalent of `git status --porcelain` and `git diff --unified=0`.
+
+        Only settings.py and .gitignore are diffed, because those are the only files
+        whose changes are examined.
+
+        Returns:
+            Tuple[str, str]: Status output, and diff output.
+
+        Raises:
+            git_reader.GitReaderError: If the repository can't be read without git.
+        """
+        status = self.git_repo.get_status()
+        status_output = self.git_repo.get_porcelain_status(status)
+
+        diff_paths = [
+            path
+            for path, change in status["unstaged"].items()
+            if change == "M" and Path(path).name in ("settings.py", ".gitignore")
+        ]
+        diff_output = self.git_repo.get_diff(diff_paths)
+        return status_output, diff_output
+
+    def _run_git_status(self):
+        """Run `git status --porcelain` and `git diff --unified=0`.
+
+        Returns:
+            Tuple[str, str]: Status output, and diff output.
+        """
+        cmd = "git status --porcelain"
+        output_obj = plugin_utils.run_quick_command(cmd)
+        status_output = output_obj.stdout.decode()
+
+        cmd = "git diff --unified=0"
+        output_obj = plugin_utils.run_quick_command(cmd)
+        diff_output = output_obj.stdout.decode()
+        return status_output, diff_output
+
     def _raise_unclean_error(self):
         """Raise unclean git status error."""
         error_msg = sd_messages.unclean_git_status
@@ -391,47 +799,57 @@ class Command(BaseCommand):
 
         Adds a .gitignore file if one is not found.
         """
-        ignore_msg = "simple_deploy_logs/\n"
+        self._add_gitignore_entry("simple_deploy_logs/")
+
+    def _add_gitignore_entry(self, entry):
+        """Add an entry to .gitignore, if it's not already there.
+
+        Adds a .gitignore file if one is not found.
+        """
+        ignore_msg = f"{entry}\n"
 
         gitignore_path = sd_config.git_path / ".gitignore"
-        if not gitignore_path.exists():
-            # Make the .gitignore file, and add log directory.
-            gitignore_path.write_text(ignore_msg, encoding="utf-8")
+        if not plugin_utils.path_exists(gitignore_path):
+            # Make the .gitignore file, and add the entry.
+            plugin_utils.write_file(gitignore_path, ignore_msg)
             plugin_utils.write_output("No .gitignore file found; created .gitignore.")
-            plugin_utils.write_output("Added simple_deploy_logs/ to .gitignore.")
+            plugin_utils.write_output(f"Added {entry} to .gitignore.")
         else:
-            # Append log directory to .gitignore if it's not already there.
-            contents = gitignore_path.read_text()
-            if "simple_deploy_logs/" not in contents:
+            # Append the entry to .gitignore if it's not already there.
+            contents = plugin_utils.read_file(gitignore_path)
+            if entry not in contents:
                 contents += f"\n{ignore_msg}"
-                gitignore_path.write_text(contents)
-                plugin_utils.write_output("Added simple_deploy_logs/ to .gitignore")
+                plugin_utils.write_file(gitignore_path, contents)
+                plugin_utils.write_output(f"Added {entry} to .gitignore")
 
     def _get_dep_man_approach(self):
         """Identify which dependency management approach the project uses.
 
-        Looks for most specific tests first: Pipenv, Poetry, then requirements.txt. For
-        example, if a project uses Poetry and has a requirements.txt file, we'll
+        Looks for most specific tests first: Pipenv, Poetry, uv, then requirements.txt.
+        For example, if a project uses Poetry and has a requirements.txt file, we'll
         prioritize Poetry.
 
         Sets:
             self.pkg_manager
 
         Returns:
-            str: "req_txt" | "poetry" | "pipenv"
+            str: "req_txt" | "poetry" | "pipenv" | "uv"
 
         Raises:
             SimpleDeployCommandError: If a pkg manager can't be identified.
         """
-        if (sd_config.git_path / "Pipfile").exists():
+        if (self.manifest_dir / "Pipfile").exists():
             return "pipenv"
         elif self._check_using_poetry():
             return "poetry"
-        elif (sd_config.git_path / "requirements.txt").exists():
+        elif self._check_using_uv():
+            return "uv"
+        elif (self.manifest_dir / "requirements.txt").exists():
             return "req_txt"
 
         # Exit if we haven't found any requirements.
-        error_msg = f"Couldn't find any specified requirements in {sd_config.git_path}."
+        error_msg = "Couldn't find any specified requirements in"
+        error_msg += f" {self.manifest_dir}."
         raise SimpleDeployCommandError(error_msg)
 
     def _check_using_poetry(self):
@@ -442,13 +860,37 @@ class Command(BaseCommand):
         Returns:
             bool: True if found, False if not found.
         """
-        path = sd_config.git_path / "pyproject.toml"
+        path = self.manifest_dir / "pyproject.toml"
         if not path.exists():
             return False
 
         pptoml_data = toml.load(path)
         return "poetry" in pptoml_data.get("tool", {})
 
+    def _check_using_uv(self):
+        """Check if the project appears to be using uv.
+
+        Check for a uv.lock file, or a pyproject.toml file with a [tool.uv] section.
+        A pyproject.toml file that only lists [project.dependencies] counts as well,
+        unless there's also a requirements.txt file; many projects have PEP 621
+        metadata without using it to install their dependencies.
+
+        Returns:
+            bool: True if found, False if not found.
+        """
+        path = self.manifest_dir / "pyproject.toml"
+        if not path.exists():
+            return False
+        if (self.manifest_dir / "uv.lock").exists():
+            return True
+
+        pptoml_data = toml.load(path)
+        if "uv" in pptoml_data.get("tool", {}):
+            return True
+        if (self.manifest_dir / "requirements.txt").exists():
+            return False
+        return "dependencies" in pptoml_data.get("project", {})
+
     def _get_current_requirements(self):
         """Get current project requirements.
 
@@ -466,14 +908,18 @@ class Command(BaseCommand):
         plugin_utils.write_output(msg)
 
         if sd_config.pkg_manager == "req_txt":
-            sd_config.req_txt_path = sd_config.git_path / "requirements.txt"
+            sd_config.req_txt_path = self.manifest_dir / "requirements.txt"
             requirements = sd_utils.parse_req_txt(sd_config.req_txt_path)
         elif sd_config.pkg_manager == "pipenv":
-            sd_config.pipfile_path = sd_config.git_path / "Pipfile"
+            sd_config.pipfile_path = self.manifest_dir / "Pipfile"
             requirements = sd_utils.parse_pipfile(sd_config.pipfile_path)
         elif sd_config.pkg_manager == "poetry":
-            sd_config.pyprojecttoml_path = sd_config.git_path / "pyproject.toml"
+            sd_config.pyprojecttoml_path = self.manifest_dir / "pyproject.toml"
             requirements = sd_utils.parse_pyproject_toml(sd_config.pyprojecttoml_path)
+        elif sd_config.pkg_manager == "uv":
+            sd_config.pyprojecttoml_path = self.manifest_dir / "pyproject.toml"
+            sd_config.uv_lock_path = self.manifest_dir / "uv.lock"
+            requirements = sd_utils.parse_pep621_pyproject(sd_config.pyprojecttoml_path)
 
         # Report findings.
         msg = "  Found existing dependencies:"
@@ -494,6 +940,60 @@ class Command(BaseCommand):
         plugin_utils.write_output(msg)
         plugin_utils.add_package("django-simple-deploy")
 
+    def _precompress_static(self):
+        """Collect static files into a build dir, and precompress them, if requested.
+
+        The build dir is kept between runs, so unchanged files are skipped. It's
+        ignored by Git; plugins can include it in the files they deploy through
+        sd_config.static_build_dir.
+
+        Returns:
+            None
+
+        Raises:
+            SimpleDeployCommandError: If collectstatic fails.
+        """
+        if not self.precompress_static:
+            return
+
+        if "django.contrib.staticfiles" not in settings.INSTALLED_APPS:
+            plugin_utils.write_output(sd_messages.no_staticfiles_app)
+            return
+
+        plugin_utils.write_output("\nCollecting static files...")
+        build_dir = sd_config.project_root / "simple_deploy_build"
+        static_root = build_dir / "static"
+        try:
+            static_assets.collect_static(static_root)
+        except Exception as e:
+            raise SimpleDeployCommandError(sd_messages.collectstatic_failed(e))
+
+        plugin_utils.write_output("Precompressing static files...")
+        summary = static_assets.precompress(static_root)
+        plugin_utils.write_output(static_assets.format_summary(summary))
+
+        self._add_gitignore_entry("simple_deploy_build/")
+        sd_config.static_build_dir = static_root
+
+    def _build_wheelhouse(self):
+        """Build a wheelhouse of the project's requirements, if requested.
+
+        Plugins that call get_dockerfile_fragments() rebuild the wheelhouse at that
+        point, to pick up any requirements they've added. Cached wheels make that
+        rebuild quick.
+
+        Returns:
+            None
+
+        Raises:
+            SimpleDeployCommandError: If the wheelhouse can't be built.
+        """
+        if not self.build_wheelhouse:
+            return
+
+        plugin_utils.build_wheelhouse()
+        self._add_gitignore_entry("simple_deploy_build/")
+
     def _validate_plugin(self, pm):
         """Check that all required hooks are implemeted by plugin.
 
@@ -524,6 +1024,103 @@ class Command(BaseCommand):
                 msg = "\nThis plugin supports --automate-all, but does not provide a confirmation message."
                 raise SimpleDeployCommandError(msg)
 
+        # The size of the target instance is optional; it's used for sizing workers.
+        sd_config.instance_cpus = getattr(self.plugin_config, "instance_cpus", None)
+        sd_config.instance_memory_mb = getattr(
+            self.plugin_config, "instance_memory_mb", None
+        )
+        sd_config.workload_profile = getattr(
+            self.plugin_config, "workload_profile", None
+        )
+        profile = sd_config.workload_profile
+        if profile and profile not in capacity_planner.PROFILES:
+            msg = f"\nPlugin config has an invalid workload_profile: {profile}"
+            msg += f"\nValid profiles are: {', '.join(capacity_planner.PROFILES)}"
+            raise SimpleDeployCommandError(msg)
+
+    def _watch(self, platform_module):
+        """Show the planned changes, and update them each time a watched file changes.
+
+        Files are polled with os.stat(), which is cheap enough to do a few times a
+        second. When a dependency manifest changes, the package manager and
+        requirements are inspected again; otherwise, the changes core planned before
+        handing off to the plugin are reused. Then the plugin plans its changes again.
+        Output from replanning is logged, but only the changes to the plan are shown.
+
+        Settings have already been loaded by Django. A plugin that reads settings.py
+        sees changes to it, but values from django.conf.settings aren't reloaded.
+        """
+        self._start_phase("watch")
+        plugin_utils.write_output("\nPlanned changes:")
+        plugin_utils.write_output(watch.format_plan(sd_config.plan, sd_config.git_path))
+
+        template_dirs = watch.get_template_dirs(platform_module)
+        paths = watch.get_watched_paths(
+            sd_config.settings_path, self.manifest_dir, template_dirs
+        )
+        mtimes = daemon_protocol.snapshot(paths)
+        plugin_utils.write_output(sd_messages.watching(len(paths)))
+
+        try:
+            while True:
+                time.sleep(watch.POLL_INTERVAL)
+                changed_paths = daemon_protocol.get_changed_paths(mtimes)
+                if not changed_paths:
+                    continue
+
+                # Templates may have been added, so look for watched files again.
+                start = time.perf_counter()
+                paths = watch.get_watched_paths(
+                    sd_config.settings_path, self.manifest_dir, template_dirs
+                )
+                mtimes = daemon_protocol.snapshot(paths)
+
+                names = [path.name for path in changed_paths]
+                plugin_utils.write_output(f"\nChanged: {', '.join(names)}")
+                old_plan = sd_config.plan
+                error = self._update_plan(changed_paths)
+                if error:
+                    sd_config.plan = old_plan
+                    plugin_utils.write_output(f"Could not update the plan:\n{error}")
+                    continue
+
+                diff = watch.get_plan_diff(old_plan, sd_config.plan, sd_config.git_path)
+                plugin_utils.write_output(diff or "No changes to the plan.")
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                plugin_utils.write_output(f"Updated plan in {elapsed_ms:.0f} ms.")
+        except KeyboardInterrupt:
+            plugin_utils.write_output("\nStopped watching.")
+
+    def _update_plan(self, changed_paths):
+        """Plan changes again, redoing only the steps affected by the changed files.
+
+        Returns:
+            str | None: Error message, if the changes couldn't be planned.
+        """
+        manifest_paths = watch.get_manifest_paths(self.manifest_dir)
+        stdout, sd_config.stdout = sd_config.stdout, io.StringIO()
+        try:
+            if any(path in manifest_paths for path in changed_paths):
+                # Only .gitignore entries are kept; everything else core planned
+                # depends on the manifests.
+                sd_config.plan = {
+                    path: contents
+                    for path, contents in self.core_plan.items()
+                    if path not in manifest_paths
+                }
+                sd_config.pkg_manager = self._get_dep_man_approach()
+                sd_config.requirements = self._get_current_requirements()
+                self._add_simple_deploy_req()
+                self.core_plan = dict(sd_config.plan)
+            else:
+                sd_config.plan = dict(self.core_plan)
+            pm.hook.simple_deploy_deploy()
+        except Exception as e:
+            # Files are often invalid partway through editing, so keep watching.
+            return str(e).strip() or repr(e)
+        finally:
+            sd_config.stdout = stdout
+
     def _confirm_automate_all(self, pm):
         """Confirm the user understands what --automate-all does.
 
@@ -0,0 +1,230 @@
+"""Keep Django and the plugin loaded between deploy runs.
+
+Usage:
+    $ python manage.py deploy_daemon
+    $ python -m simple_deploy [deploy options]
+
+The daemon boots Django, finds and imports the plugin, and then serves deploy runs
+over a Unix socket until it's been idle for a while. Each run gets a fresh Command
+instance, a reset sd_config, and a plugin manager with nothing registered, so runs
+don't affect each other.
+
+If any module the daemon has loaded changes, or packages are installed or removed,
+the daemon stops instead of running deploy with stale code or settings. The client
+then runs `manage.py deploy` directly. Configuring a project modifies settings.py, so
+when a run has written to settings.py itself, the daemon reloads the settings and
+keeps serving. It only stops if the run changed INSTALLED_APPS, because apps can't be
+reloaded.
+"""
+
+import importlib
+import logging
+import os
+import socket
+import sys
+import traceback
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.autoreload import iter_all_python_module_files
+from django.utils.functional import empty
+
+from . import sd_messages
+from .deploy import Command as DeployCommand
+from .utils import daemon_protocol, sd_utils
+from .utils.plugin_utils import sd_config
+from simple_deploy.plugins import pm
+
+
+class Command(BaseCommand):
+    help = "Keep Django and the deployment plugin loaded between deploy runs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--idle-timeout",
+            type=float,
+            metavar="MINUTES",
+            default=daemon_protocol.IDLE_TIMEOUT,
+            help="Stop after this many minutes without a deploy run.",
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(socket, "AF_UNIX"):
+            raise CommandError(sd_messages.daemon_unsupported)
+
+        project_root = daemon_protocol.find_project_root(Path.cwd())
+        if project_root is None:
+            raise CommandError(sd_messages.daemon_no_project)
+        self.project_root = project_root
+        self.socket_path = daemon_protocol.get_socket_path(project_root)
+
+        self._warm_up()
+        self.snapshot = daemon_protocol.snapshot(self._get_watched_paths())
+
+        server = self._bind()
+        server.settimeout(options["idle_timeout"] * 60)
+        self.stdout.write(
+            sd_messages.daemon_started(self.socket_path, options["idle_timeout"])
+        )
+
+        try:
+            while True:
+                try:
+                    conn, _addr = server.accept()
+                except socket.timeout:
+                    self.stdout.write("Idle timeout reached; stopping.")
+                    break
+                with conn:
+                    if not self._serve(conn):
+                        break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def _warm_up(self):
+        """Do the work that every deploy run would otherwise repeat."""
+        plugin_name = sd_utils.get_plugin_name()
+        import_module(f"{plugin_name}.deploy")
+        self.stdout.write(f"Loaded plugin: {plugin_name}")
+
+    def _get_watched_paths(self):
+        """Get every file the daemon's loaded code came from, and sys.path dirs.
+
+        Directories on sys.path change when packages are installed or removed. The
+        project root is on sys.path as well, but deploy adds files to it on every run.
+        """
+        paths = {str(path) for path in iter_all_python_module_files()}
+        for path in sys.path:
+            if path and os.path.isdir(path):
+                if Path(path).resolve() != self.project_root:
+                    paths.add(path)
+        return sorted(paths)
+
+    def _bind(self):
+        """Listen on the project's socket, replacing a socket left by a dead daemon.
+
+        Raises:
+            CommandError: If another daemon is already serving this project.
+        """
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                self.socket_path.unlink()
+            else:
+                raise CommandError(sd_messages.daemon_already_running)
+            finally:
+                probe.close()
+
+        # Create the socket with owner-only permissions, so no one else can connect.
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(str(self.socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(1)
+        return server
+
+    def _serve(self, conn):
+        """Serve a single deploy run.
+
+        Returns:
+            bool: True if the daemon can keep serving, False if it should stop.
+        """
+        with conn.makefile("rw", encoding="utf-8") as stream:
+            request = daemon_protocol.read_message(stream)
+            if request is None:
+                return True
+
+            changed_paths = daemon_protocol.get_changed_paths(self.snapshot)
+            if changed_paths:
+                msg = sd_messages.daemon_stale(changed_paths[0])
+                daemon_protocol.send_message(stream, stale=msg)
+                self.stdout.write(msg)
+                return False
+
+            exit_code = self._run_deploy(request["argv"], request["cwd"], stream)
+
+            # Reload settings that the run wrote. Stop if any other loaded code
+            # changed, or the settings can't be reloaded.
+            changed_paths = daemon_protocol.get_changed_paths(self.snapshot)
+            if changed_paths and self._reload_settings(changed_paths):
+                self.snapshot.update(daemon_protocol.snapshot(changed_paths))
+                changed_paths = []
+            if changed_paths:
+                msg = sd_messages.daemon_stopped(changed_paths[0])
+                daemon_protocol.send_message(stream, out=msg)
+                self.stdout.write(msg)
+
+            daemon_protocol.send_message(stream, exit=exit_code)
+
+        return not changed_paths
+
+    def _run_deploy(self, argv, cwd, stream):
+        """Run deploy with the client's args, in the client's working directory.
+
+        Returns:
+            int: Exit code.
+        """
+        writer = daemon_protocol.SocketWriter(stream)
+        reader = daemon_protocol.SocketReader(stream)
+        saved_streams = sys.stdin, sys.stdout, sys.stderr
+        saved_cwd = os.getcwd()
+        sys.stdin, sys.stdout, sys.stderr = reader, writer, writer
+        os.chdir(cwd)
+
+        exit_code = 0
+        try:
+            command = DeployCommand()
+            command.run_from_argv(["manage.py", "deploy", *argv])
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            writer.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            os.chdir(saved_cwd)
+            self.written_paths = {str(path) for path in sd_config.touched_paths}
+            self._reset_state()
+
+        return exit_code
+
+    def _reload_settings(self, changed_paths):
+        """Reload settings.py, if it's the only loaded file that changed.
+
+        Only changes deploy made itself are reloaded; any other change means code
+        the daemon loaded may be out of date.
+
+        Returns:
+            bool: True if the settings were reloaded, False if the daemon should stop.
+        """
+        settings_module = sys.modules[settings.SETTINGS_MODULE]
+        settings_path = str(Path(settings_module.__file__).resolve())
+        if changed_paths != [settings_path] or settings_path not in self.written_paths:
+            return False
+
+        installed_apps = list(settings.INSTALLED_APPS)
+        try:
+            importlib.reload(settings_module)
+        except Exception:
+            return False
+        settings._wrapped = empty
+        return list(settings.INSTALLED_APPS) == installed_apps
+
+    def _reset_state(self):
+        """Reset state that a deploy run leaves behind, before the next run."""
+        sd_config.__init__()
+        for plugin in pm.get_plugins():
+            pm.unregister(plugin)
+
+        # Each run logs to its own file.
+        for handler in logging.root.handlers[:]:
+            logging.root.removeHandler(handler)
+            handler.close()
@@ -0,0 +1,199 @@
+"""Query the logs of past deploy runs.
+
+Usage:
+    $ python manage.py deploy_logs
+    $ python manage.py deploy_logs --outcome failed --phase plugin_deploy --since 7d
+    $ python manage.py deploy_logs --grep "fly deploy"
+    $ python manage.py deploy_logs 2026-10-19 --tail 50
+    $ python manage.py deploy_logs --follow
+
+With no options, lists recent runs: when each started, the plugin it used, how it
+ended, and the phase it ended in. Naming a run shows its phases and errors, with the
+line each one is on. Runs are found through an index that's updated incrementally, so
+only new logs are read; see utils/log_index.py.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from . import sd_messages
+from .utils import log_index
+from .utils import log_retention
+
+
+class Command(BaseCommand):
+    help = "Query the logs of past deploy runs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "run",
+            nargs="?",
+            help="Show one run, by the name of its log or the start of its timestamp.",
+        )
+        parser.add_argument(
+            "--outcome",
+            choices=log_index.OUTCOMES,
+            help="Only include runs that ended this way.",
+        )
+        parser.add_argument(
+            "--phase",
+            choices=log_index.PHASES,
+            help="Only include runs that ended in this phase.",
+        )
+        parser.add_argument(
+            "--plugin", help="Only include runs that used this plugin."
+        )
+        parser.add_argument(
+            "--since",
+            metavar="DAYS_OR_DATE",
+            help="Only include runs since a date (2026-10-12), or in the last N days (7d).",
+        )
+        parser.add_argument(
+            "--grep",
+            metavar="PATTERN",
+            help="Show lines matching this regular expression, in each included run.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Include at most this many of the most recent runs. Use 0 for no limit.",
+        )
+        parser.add_argument(
+            "--tail",
+            type=int,
+            nargs="?",
+            const=20,
+            metavar="N",
+            help="Show the last N lines of the run's log (default 20).",
+        )
+        parser.add_argument(
+            "--follow",
+            "-f",
+            action="store_true",
+            help="Show lines as they're added to the run's log, until the run finishes.",
+        )
+
+    def handle(self, *args, **options):
+        self.log_dir_path = settings.BASE_DIR / "simple_deploy_logs"
+        if not self.log_dir_path.exists():
+            raise CommandError(sd_messages.no_deploy_logs(self.log_dir_path))
+
+        runs = log_index.get_runs(self.log_dir_path)
+        runs = log_index.filter_runs(
+            runs,
+            outcome=options["outcome"],
+            phase=options["phase"],
+            plugin=options["plugin"],
+            since=self._parse_since(options["since"]),
+        )
+        if options["run"]:
+            runs = [run for run in runs if self._matches(run, options["run"])]
+        if options["limit"]:
+            runs = runs[-options["limit"] :]
+
+        if options["grep"]:
+            self._grep(runs, options["grep"])
+        elif options["tail"] is not None or options["follow"]:
+            self._tail(runs, options["tail"], options["follow"])
+        elif options["run"] and len(runs) == 1:
+            self._show_run(runs[0])
+        else:
+            self._list_runs(runs)
+
+    def _parse_since(self, since):
+        """Parse --since, which is a number of days or a date.
+
+        Returns:
+            datetime | None: Start of the time range, if there is one.
+        """
+        if since is None:
+            return None
+
+        m = re.fullmatch(r"(\d+)d", since)
+        if m:
+            return datetime.now() - timedelta(days=int(m.group(1)))
+        try:
+            return datetime.fromisoformat(since)
+        except ValueError:
+            raise CommandError(sd_messages.invalid_since(since))
+
+    def _matches(self, run, name):
+        """Check if a run matches a log name, or the start of a timestamp."""
+        return run["log"] == name or run["started"].startswith(name)
+
+    def _list_runs(self, runs):
+        """Show one line for each run."""
+        if not runs:
+            self.stdout.write("No matching runs.")
+            return
+
+        for run in runs:
+            duration = "" if run["duration"] is None else f"{run['duration']:.1f}s"
+            error = run["errors"][-1][1] if run["errors"] else ""
+            self.stdout.write(
+                f"{run['started']}  {run['plugin'] or '-':<16} "
+                f"{run['outcome']:<12} {run['phase'] or '-':<14} {duration:>8}  "
+                f"{error}".rstrip()
+            )
+
+    def _show_run(self, run):
+        """Show a run's details, with the line each phase and error is on."""
+        self.stdout.write(f"Log: {run['path']}")
+        self.stdout.write(f"Started: {run['started']}")
+        self.stdout.write(f"Plugin: {run['plugin'] or '-'}")
+        self.stdout.write(f"Outcome: {run['outcome']}")
+        if run["duration"] is not None:
+            self.stdout.write(f"Duration: {run['duration']:.1f}s")
+        self.stdout.write(f"Lines: {run['lines']}")
+
+        if run["phases"]:
+            self.stdout.write("Phases:")
+            for phase, line_num in run["phases"]:
+                self.stdout.write(f"  {line_num:>6}  {phase}")
+        if run["errors"]:
+            self.stdout.write("Errors:")
+            for line_num, error in run["errors"]:
+                self.stdout.write(f"  {line_num:>6}  {error}")
+
+    def _grep(self, runs, pattern):
+        """Show matching lines from each run, reading each log one line at a time."""
+        try:
+            pattern = re.compile(pattern)
+        except re.error as e:
+            raise CommandError(sd_messages.invalid_grep_pattern(pattern, e))
+
+        for run in runs:
+            for line_num, line in log_index.grep_log(run["path"], pattern):
+                self.stdout.write(f"{run['log']}:{line_num}: {line}")
+
+    def _tail(self, runs, num_lines, follow):
+        """Show the end of the most recent included run's log, and follow it."""
+        if not runs:
+            raise CommandError(sd_messages.no_matching_runs)
+        run = runs[-1]
+
+        if num_lines is None:
+            num_lines = 20
+        # Following starts where the tail ends.
+        offset = run["path"].stat().st_size
+        for line in log_index.tail_lines(run["path"], num_lines, end=offset):
+            self.stdout.write(line)
+
+        if not follow:
+            return
+        if run["path"].suffix == ".gz":
+            # Only finished runs are compressed.
+            return
+        try:
+            for line in log_index.follow(run["path"], self.log_dir_path, offset):
+                self.stdout.write(line)
+        except KeyboardInterrupt:
+            return
+
+        logs = {record["log"] for record in log_retention.read_runs(self.log_dir_path)}
+        if run["log"] not in logs:
+            self.stdout.write(sd_messages.follow_idle(log_index.FOLLOW_IDLE_TIMEOUT))
@@ -124,3 +124,261 @@ def file_replace_rejected(filename):
     """
     )
     return msg
+
+
+def cold_start_failed(error):
+    """The project could not be booted for cold start analysis."""
+
+    msg = dedent(
+        f"""
+        Could not boot the project in a new process to analyze cold start time.
+        The last lines of output were:
+    """
+    )
+    msg += f"\n{error}\n"
+    return msg
+
+
+def cold_start_report_invalid(error):
+    """The project booted, but the cold start probe's report couldn't be read."""
+
+    msg = dedent(
+        f"""
+        The project booted in a new process, but the cold start report it was
+        supposed to write couldn't be read: {error}
+        This can happen if the project exits early while it's being imported, ie by
+        calling sys.exit().
+    """
+    )
+    return msg
+
+
+def cold_start_budget_exceeded(boot_time, budget):
+    """Booting the project took longer than the cold start budget."""
+
+    msg = dedent(
+        f"""
+        The project took {boot_time:.2f}s to boot, which is more than the cold start
+        budget of {budget:.2f}s. See the slowest imports listed above for places to
+        start reducing boot time.
+    """
+    )
+    return msg
+
+
+def migration_risk_exceeded(risk, max_risk, baseline):
+    """An unapplied migration is riskier than the platform should apply on its own."""
+
+    msg = dedent(
+        f"""
+        At least one unapplied migration is {risk} risk, and --max-migration-risk is
+        {max_risk}. The platform would apply these migrations during deployment, so
+        nothing has been changed. Migrations were compared with {baseline}.
+
+        Review the operations listed above. You can apply risky migrations yourself
+        at a quiet time, or rework them, ie by adding indexes concurrently. Then run
+        the deploy command again.
+    """
+    )
+    return msg
+
+
+daemon_unsupported = """
+The deploy daemon needs Unix domain sockets, which aren't available on this system.
+Run `manage.py deploy` directly instead.
+"""
+
+daemon_no_project = """
+Couldn't find manage.py in this directory or any parent directory. Start the deploy
+daemon from your project's root directory.
+"""
+
+daemon_already_running = """
+A deploy daemon is already running for this project.
+"""
+
+
+def daemon_started(socket_path, idle_timeout):
+    """The deploy daemon is ready for runs."""
+
+    msg = dedent(
+        f"""
+        Deploy daemon listening on {socket_path}.
+        Run deploy through the daemon with:
+            $ python -m simple_deploy [options]
+        The daemon stops after {idle_timeout:g} minutes without a run.
+    """
+    )
+    return msg
+
+
+def daemon_stale(changed_path):
+    """Code the daemon loaded has changed, so it needs to be restarted."""
+
+    msg = dedent(
+        f"""
+        The deploy daemon has stopped, because {changed_path} has changed
+        since it started. Running deploy directly; start the daemon again with
+        `manage.py deploy_daemon` to keep deploy warm.
+    """
+    )
+    return msg
+
+
+def daemon_stopped(changed_path):
+    """A deploy run changed code the daemon loaded, so the daemon has stopped."""
+
+    msg = dedent(
+        f"""
+        The deploy daemon has stopped, because {changed_path} changed
+        during this run. Start it again with `manage.py deploy_daemon` to keep deploy
+        warm.
+    """
+    )
+    return msg
+
+
+no_staticfiles_app = """
+django.contrib.staticfiles is not in INSTALLED_APPS, so there are no static files
+to collect. Skipping precompression of static files.
+"""
+
+
+def collectstatic_failed(error):
+    """Running collectstatic into the build dir failed."""
+
+    msg = dedent(
+        f"""
+        Could not collect static files into simple_deploy_build/. The error was:
+    """
+    )
+    msg += f"\n{error}\n"
+    return msg
+
+
+def wheelhouse_failed(error):
+    """Building the wheelhouse failed."""
+
+    msg = dedent(
+        f"""
+        Could not build a wheelhouse of the project's requirements. This usually
+        means a package doesn't publish a wheel for the platform's Linux image, or
+        that a requirement isn't available on PyPI. The error was:
+    """
+    )
+    msg += f"\n{error}\n"
+    return msg
+
+
+def service_not_found(service, names):
+    """No project in the repository matches the --service name."""
+
+    msg = dedent(
+        f"""
+        Could not find a Django project named {service} in this repository. You can
+        use a project's name, or its path from the root of the repository. Run the
+        deploy command with --list-services to see all the projects that were found.
+    """
+    )
+    if names:
+        msg += f"\nProjects found: {', '.join(names)}\n"
+    return msg
+
+
+def service_venv_not_found(service, service_root):
+    """The service has no virtual environment to run deploy in."""
+
+    msg = dedent(
+        f"""
+        Could not find a virtual environment for {service}. Deploy runs in each project
+        with that project's own environment, so it looks for a directory with a
+        pyvenv.cfg file, from {service_root} up to the root of the repository.
+
+        Create a virtual environment for {service}, or activate its environment and
+        run `manage.py deploy` from its directory instead.
+    """
+    )
+    return msg
+
+
+service_needs_argv = """
+Running deploy in a different project with --service only works from the command line.
+Run `manage.py deploy` from that project's directory instead.
+"""
+
+
+def no_deploy_logs(log_dir_path):
+    """There are no logs to query."""
+
+    msg = dedent(
+        f"""
+        Could not find any deploy logs. Logs are written to {log_dir_path}
+        each time `manage.py deploy` runs, unless --no-logging is used.
+    """
+    )
+    return msg
+
+
+def invalid_since(since):
+    """The --since value isn't a number of days or a date."""
+
+    msg = dedent(
+        f"""
+        Could not understand --since {since}. Use a number of days, such as 7d, or a
+        date, such as 2026-10-12.
+    """
+    )
+    return msg
+
+
+def invalid_grep_pattern(pattern, error):
+    """The --grep value isn't a valid regular expression."""
+
+    msg = dedent(
+        f"""
+        The --grep pattern {pattern} is not a valid regular expression: {error}
+    """
+    )
+    return msg
+
+
+no_matching_runs = """
+No runs match these options, so there's no log to show.
+"""
+
+
+def follow_idle(idle_timeout):
+    """Following stopped because the log stopped changing, without the run ending."""
+
+    msg = dedent(
+        f"""
+        Stopped following: the log hasn't changed in {idle_timeout // 60} minutes,
+        and the run hasn't recorded how it ended. It may have been stopped without a
+        chance to record anything.
+    """
+    )
+    return msg
+
+
+def watch_incompatible(option):
+    """--watch was used with an option that makes changes outside the project."""
+
+    msg = dedent(
+        f"""
+        --watch only shows the changes deploy would make, so it can't be used with
+        {option}. Run deploy without --watch once the plan looks right.
+    """
+    )
+    return msg
+
+
+def watching(num_paths):
+    """Deploy is watching files for changes."""
+
+    msg = dedent(
+        f"""
+        Watching {num_paths} paths for changes. The plan is updated when one of them
+        changes; press Ctrl-C to stop. No files have been changed.
+    """
+    )
+    return msg
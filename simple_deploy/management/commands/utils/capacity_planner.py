@@ -0,0 +1,153 @@
+"""Size app server workers for the instance a project is deployed to.
+
+Plugins usually start gunicorn with a fixed number of workers. That's too many for a
+small instance running a large project, which then runs out of memory, and too few
+for a large instance, where requests queue while CPUs sit idle.
+
+Planning starts from three things:
+- The target instance's CPUs and memory, which come from the plugin config.
+- How much memory one worker uses. This is measured by booting the project's WSGI
+  application in a fresh interpreter, which is what each worker does.
+- Whether the project's requests mostly wait on I/O, mostly use the CPU, or a mix.
+
+Workers are limited by CPUs, and then by memory. Threads are cheap in memory, so
+I/O-bound projects make up for memory-limited workers with more threads.
+"""
+
+import math
+
+from . import cold_start
+
+
+# Run in a fresh interpreter, from the project root, with cold_start.run_probe().
+# Reports peak RSS in MB.
+RSS_PROBE_SCRIPT = """
+import json, os, sys
+from importlib import import_module
+
+from django.conf import settings
+
+wsgi_module, wsgi_attr = settings.WSGI_APPLICATION.rsplit(".", 1)
+getattr(import_module(wsgi_module), wsgi_attr)
+
+try:
+    import resource
+except ImportError:
+    rss_mb = None
+else:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in KB elsewhere.
+    rss_mb = max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+with open(os.environ["SIMPLE_DEPLOY_PROBE_REPORT"], "w") as f:
+    json.dump({"rss_mb": rss_mb}, f)
+"""
+
+# Used when the target instance or a worker's memory use isn't known.
+DEFAULT_CPUS = 1
+DEFAULT_MEMORY_MB = 512
+DEFAULT_WORKER_RSS_MB = 100
+DEFAULT_PROFILE = "mixed"
+
+# Workers per CPU, and threads per worker, before memory is taken into account.
+PROFILES = {
+    "cpu": {"workers_per_cpu": 1, "extra_workers": 1, "threads": 1},
+    "mixed": {"workers_per_cpu": 2, "extra_workers": 1, "threads": 2},
+    "io": {"workers_per_cpu": 2, "extra_workers": 1, "threads": 4},
+}
+MAX_THREADS = 8
+
+# Memory kept free for the OS and the gunicorn master process.
+MIN_HEADROOM_MB = 64
+HEADROOM_FRACTION = 0.2
+
+# Workers grow after they boot, as they fill caches and handle requests.
+RSS_GROWTH_FACTOR = 1.5
+
+# Workers are restarted after this many requests, to release memory they've grown
+# into. Restarts are more frequent when there's little memory to spare.
+MAX_REQUESTS = 1000
+MAX_REQUESTS_TIGHT = 500
+
+
+def measure_worker_rss(project_root, settings_module):
+    """Measure the memory one worker uses after loading the WSGI application.
+
+    Returns:
+        float: Peak RSS in MB, or None if it couldn't be measured.
+    """
+    try:
+        report, _ = cold_start.run_probe(
+            project_root, settings_module, RSS_PROBE_SCRIPT
+        )
+    except RuntimeError:
+        return None
+    return report.get("rss_mb")
+
+
+def plan_workers(cpus=None, memory_mb=None, worker_rss_mb=None, profile=None):
+    """Compute app server settings for the target instance.
+
+    Returns:
+        dict: workers, threads, max_requests, and max_requests_jitter, plus the
+        inputs that were used, so they can be reported and used in templates.
+
+    Raises:
+        ValueError: If profile is not one of PROFILES.
+    """
+    cpus = cpus or DEFAULT_CPUS
+    memory_mb = memory_mb or DEFAULT_MEMORY_MB
+    worker_rss_mb = worker_rss_mb or DEFAULT_WORKER_RSS_MB
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown workload profile: {profile}")
+    profile_config = PROFILES[profile]
+
+    # Workers the CPUs can keep busy.
+    cpu_workers = cpus * profile_config["workers_per_cpu"]
+    cpu_workers += profile_config["extra_workers"]
+
+    # Workers that fit in memory, allowing for growth.
+    headroom_mb = max(MIN_HEADROOM_MB, memory_mb * HEADROOM_FRACTION)
+    usable_mb = max(0, memory_mb - headroom_mb)
+    worker_footprint_mb = worker_rss_mb * RSS_GROWTH_FACTOR
+    memory_workers = int(usable_mb // worker_footprint_mb)
+
+    workers = max(1, min(cpu_workers, memory_workers))
+
+    # Keep the planned concurrency by adding threads, if the workload can use them.
+    threads = profile_config["threads"]
+    if threads > 1 and workers < cpu_workers:
+        target_concurrency = cpu_workers * threads
+        threads = min(MAX_THREADS, math.ceil(target_concurrency / workers))
+
+    memory_limited = memory_workers < cpu_workers
+    max_requests = MAX_REQUESTS_TIGHT if memory_limited else MAX_REQUESTS
+
+    return {
+        "workers": workers,
+        "threads": threads,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "cpus": cpus,
+        "memory_mb": memory_mb,
+        "worker_rss_mb": round(worker_rss_mb),
+        "profile": profile,
+        "memory_limited": memory_limited,
+    }
+
+
+def format_plan(plan):
+    """Summarize a worker plan for output.
+
+    Returns:
+        str
+    """
+    msg = f"  Target instance: {plan['cpus']} CPU(s), {plan['memory_mb']} MB"
+    msg += f"\n  Memory per worker: {plan['worker_rss_mb']} MB"
+    msg += f"\n  Workload profile: {plan['profile']}"
+    msg += f"\n  Workers: {plan['workers']}, threads per worker: {plan['threads']}"
+    msg += f"\n  Restart workers after {plan['max_requests']} requests"
+    if plan["memory_limited"]:
+        msg += "\n  Worker count is limited by memory."
+    return msg
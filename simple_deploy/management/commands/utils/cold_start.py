@@ -0,0 +1,177 @@
+"""Measure how long the project takes to boot from a cold start.
+
+Platforms that scale to zero start a new process for the first request after a period
+of inactivity. That request waits for Python to import the project's settings, every
+app in INSTALLED_APPS, and the WSGI application.
+
+The measurement happens in a fresh interpreter, because the current process has
+already imported most of what the project needs. The interpreter is run with
+`-X importtime`, so every module's import cost is available as well.
+
+Probe scripts write their report to a file named by REPORT_PATH_VAR, rather than to
+stdout, because a project may print while it's being imported.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+# Environment variable that tells a probe script where to write its JSON report.
+REPORT_PATH_VAR = "SIMPLE_DEPLOY_PROBE_REPORT"
+
+# Run in a fresh interpreter, from the project root.
+PROBE_SCRIPT = """
+import json, os, sys, time
+from importlib import import_module
+
+start = time.perf_counter()
+report = {"apps": {}}
+
+def timed_import(name):
+    t0 = time.perf_counter()
+    module = import_module(name)
+    return module, time.perf_counter() - t0
+
+_, report["settings"] = timed_import(os.environ["DJANGO_SETTINGS_MODULE"])
+
+from django.conf import settings
+for entry in settings.INSTALLED_APPS:
+    # Entries may be a module, or the dotted path to an AppConfig class.
+    try:
+        _, elapsed = timed_import(entry)
+    except ImportError:
+        _, elapsed = timed_import(entry.rsplit(".", 1)[0])
+    report["apps"][entry] = elapsed
+
+# Importing the WSGI module runs django.setup(), which populates the app registry.
+t0 = time.perf_counter()
+wsgi_module, wsgi_attr = settings.WSGI_APPLICATION.rsplit(".", 1)
+getattr(import_module(wsgi_module), wsgi_attr)
+report["wsgi_application"] = time.perf_counter() - t0
+
+report["total"] = time.perf_counter() - start
+report["modules"] = sorted(sys.modules)
+with open(os.environ["SIMPLE_DEPLOY_PROBE_REPORT"], "w") as f:
+    json.dump(report, f)
+"""
+
+# Example line: "import time:       241 |       1283 |   django.conf"
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ProbeReportError(RuntimeError):
+    """A probe script exited cleanly, but didn't write a valid report."""
+
+
+def run_boot_probe(project_root, settings_module):
+    """Boot the project in a fresh interpreter, and collect timing information.
+
+    Returns:
+        dict: Report from PROBE_SCRIPT, plus an "imports" list from -X importtime.
+
+    Raises:
+        RuntimeError: If the project couldn't be booted.
+        ProbeReportError: If the probe didn't write a valid report.
+    """
+    report, stderr = run_probe(
+        project_root, settings_module, PROBE_SCRIPT, python_args=["-X", "importtime"]
+    )
+    report["imports"] = parse_importtime(stderr)
+    return report
+
+
+def run_probe(project_root, settings_module, script, python_args=()):
+    """Run a probe script in a fresh interpreter, and read its report.
+
+    Returns:
+        Tuple[dict, str]: The report, and the probe's stderr.
+
+    Raises:
+        RuntimeError: If the probe exited with an error.
+        ProbeReportError: If the probe didn't write a valid report.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = Path(tmp_dir) / "report.json"
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+        env[REPORT_PATH_VAR] = str(report_path)
+        cmd = [sys.executable, *python_args, "-c", script]
+        output = subprocess.run(cmd, cwd=project_root, env=env, capture_output=True)
+
+        stderr = output.stderr.decode(errors="replace")
+        if output.returncode != 0:
+            # Drop importtime lines, so the actual error is visible.
+            error_lines = [
+                l for l in stderr.splitlines() if not IMPORTTIME_RE.match(l)
+            ]
+            raise RuntimeError("\n".join(error_lines[-20:]))
+
+        try:
+            report = json.loads(report_path.read_text())
+        except (OSError, ValueError) as e:
+            raise ProbeReportError(str(e)) from e
+
+    return report, stderr
+
+
+def parse_importtime(importtime_output):
+    """Parse the output of `python -X importtime`.
+
+    Returns:
+        List[dict]: One dict per module with name, self_us, cumulative_us, and
+        depth. Depth 0 is a module imported directly by the probe.
+    """
+    imports = []
+    for line in importtime_output.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+
+        self_us, cumulative_us, indent, name = m.groups()
+        imports.append(
+            {
+                "name": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # Each level of nesting adds two spaces, after one separating space.
+                "depth": max(0, (len(indent) - 1) // 2),
+            }
+        )
+
+    return imports
+
+
+def get_slowest_imports(imports, count=10):
+    """Get the modules that took longest to import, not counting their imports.
+
+    Returns:
+        List[dict]
+    """
+    return sorted(imports, key=lambda i: i["self_us"], reverse=True)[:count]
+
+
+def format_report(report, count=10):
+    """Format a boot probe report for output.
+
+    Returns:
+        str
+    """
+    lines = ["\nCold start analysis:"]
+    lines.append(f"  {report['settings'] * 1000:8.1f} ms  settings module")
+
+    slowest_apps = sorted(report["apps"].items(), key=lambda a: a[1], reverse=True)
+    for app, elapsed in slowest_apps:
+        lines.append(f"  {elapsed * 1000:8.1f} ms  app: {app}")
+
+    lines.append(f"  {report['wsgi_application'] * 1000:8.1f} ms  WSGI application")
+    lines.append(f"  {report['total'] * 1000:8.1f} ms  total boot time")
+
+    lines.append(f"\n  Slowest imports (self time):")
+    for module in get_slowest_imports(report["imports"], count):
+        lines.append(f"    {module['self_us'] / 1000:8.1f} ms  {module['name']}")
+
+    return "\n".join(lines)
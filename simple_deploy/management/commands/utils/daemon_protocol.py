@@ -0,0 +1,170 @@
+"""Protocol and client for the warm deploy daemon.
+
+Each run of `manage.py deploy` boots Django, finds the installed plugin, imports it,
+and sets up template rendering. `manage.py deploy_daemon` does that once, and then
+serves deploy runs over a Unix socket. The client in this module forwards CLI args,
+streams output back, and forwards input for confirmation prompts.
+
+This module only uses the standard library, so the client starts quickly. The client
+is run with `python -m simple_deploy`.
+
+Messages are JSON objects, one per line:
+- Client to daemon: {"argv": [...], "cwd": ...}, then {"line": ...} for each line of
+  input the daemon asks for.
+- Daemon to client: {"out": ...} for output, {"read": true} to ask for a line of
+  input, {"stale": ...} if the daemon needs to be restarted before it can run
+  deploy, and finally {"exit": code}.
+"""
+
+import hashlib
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+
+# Stop the daemon after this many minutes without a request.
+IDLE_TIMEOUT = 30
+
+
+def find_project_root(start):
+    """Find the directory containing manage.py, at or above start.
+
+    Returns:
+        Path | None
+    """
+    start = Path(start).resolve()
+    for path in [start, *start.parents]:
+        if (path / "manage.py").exists():
+            return path
+    return None
+
+
+def get_socket_path(project_root):
+    """Get the socket path for a project's daemon.
+
+    The path is in the temp dir rather than the project, because Unix socket paths are
+    limited to about 100 characters.
+
+    Returns:
+        Path
+    """
+    key = hashlib.sha256(str(Path(project_root).resolve()).encode()).hexdigest()[:16]
+    uid = os.getuid() if hasattr(os, "getuid") else ""
+    return Path(tempfile.gettempdir()) / f"simple_deploy-{uid}-{key}.sock"
+
+
+def send_message(stream, **message):
+    """Write a single message, and flush it."""
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def read_message(stream):
+    """Read a single message.
+
+    Returns:
+        dict | None: None if the other end closed the connection.
+    """
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def snapshot(paths):
+    """Get the modification time of each path, to notice changes later.
+
+    Returns:
+        Dict[str, int]: {path: mtime in ns}, with -1 for paths that don't exist.
+    """
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = -1
+    return mtimes
+
+
+def get_changed_paths(old_snapshot):
+    """Find paths that have changed since a snapshot was taken.
+
+    Returns:
+        List[str]
+    """
+    new_snapshot = snapshot(old_snapshot.keys())
+    return [path for path, mtime in new_snapshot.items() if old_snapshot[path] != mtime]
+
+
+def run_client(argv, cwd=None):
+    """Run deploy through the project's daemon.
+
+    Returns:
+        int | None: Exit code of the deploy run, or None if there's no usable daemon,
+        and deploy should be run directly.
+    """
+    cwd = Path(cwd or Path.cwd())
+    project_root = find_project_root(cwd)
+    if project_root is None or not hasattr(socket, "AF_UNIX"):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(get_socket_path(project_root)))
+    except OSError:
+        sock.close()
+        return None
+
+    with sock, sock.makefile("rw", encoding="utf-8") as stream:
+        send_message(stream, argv=argv, cwd=str(cwd))
+        while True:
+            message = read_message(stream)
+            if message is None:
+                # The daemon stopped partway through a run.
+                return 1
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "read" in message:
+                send_message(stream, line=sys.stdin.readline())
+            elif "stale" in message:
+                sys.stderr.write(message["stale"])
+                return None
+            elif "exit" in message:
+                return message["exit"]
+
+
+class SocketWriter(io.TextIOBase):
+    """Text stream that sends everything written to it to the client."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        if text:
+            send_message(self.stream, out=text)
+        return len(text)
+
+    def isatty(self):
+        return False
+
+
+class SocketReader(io.TextIOBase):
+    """Text stream that asks the client for each line that's read from it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readline(self, size=-1):
+        send_message(self.stream, read=True)
+        message = read_message(self.stream)
+        if message is None:
+            return ""
+        return message["line"]
+
+    def readable(self):
+        return True
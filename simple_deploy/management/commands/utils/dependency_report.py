@@ -0,0 +1,183 @@
+"""Report how much each requirement contributes to the project's footprint.
+
+Image size depends on how much each requirement installs, and memory use and boot
+time depend on what's imported when the app starts. For each requirement, this
+finds the installed distribution with importlib.metadata, and measures:
+- Its size on disk, and how much of that is native extensions.
+- How long its top-level modules took to import when the project booted.
+- Whether it was imported at all while booting the WSGI application.
+
+Import times and imported modules come from the cold start boot probe, so the
+measurements reflect a fresh interpreter.
+"""
+
+from importlib import metadata
+
+from . import sd_utils
+
+
+NATIVE_SUFFIXES = (".so", ".pyd", ".dylib", ".dll")
+
+# Requirements that are normally only imported after boot, ie by the app server
+# process or when the first db connection is made.
+RUNTIME_ONLY = {
+    "gunicorn",
+    "uvicorn",
+    "waitress",
+    "psycopg",
+    "psycopg2",
+    "psycopg2-binary",
+    "psycopg-binary",
+    "mysqlclient",
+    "django-simple-deploy",
+}
+
+# Number of requirements to call out as the heaviest contributors.
+NUM_HEAVIEST = 3
+
+
+def build_report(requirements, boot_report):
+    """Measure each requirement.
+
+    boot_report is the output of cold_start.run_boot_probe().
+
+    Returns:
+        dict: "requirements", a list with one dict per requirement, and "heaviest",
+        "unused", and "not_installed" lists of requirement names.
+    """
+    top_level_modules = _get_top_level_modules()
+    import_times = _get_import_times(boot_report["imports"])
+    booted_modules = {name.split(".")[0] for name in boot_report["modules"]}
+
+    entries, not_installed = [], []
+    for requirement in requirements:
+        try:
+            dist = metadata.distribution(requirement)
+        except metadata.PackageNotFoundError:
+            not_installed.append(requirement)
+            continue
+
+        dist_name = sd_utils.normalize_name(dist.metadata["Name"])
+        modules = top_level_modules.get(dist_name, [])
+        size, native_size = _get_installed_size(dist)
+        imported = any(module in booted_modules for module in modules)
+
+        entries.append(
+            {
+                "name": requirement,
+                "version": dist.version,
+                "size_bytes": size,
+                "native_bytes": native_size,
+                "modules": modules,
+                "import_ms": round(
+                    sum(import_times.get(module, 0) for module in modules) / 1000, 1
+                ),
+                "imported_at_boot": imported,
+                "runtime_only": sd_utils.normalize_name(requirement) in RUNTIME_ONLY,
+            }
+        )
+
+    entries.sort(key=lambda e: e["size_bytes"], reverse=True)
+    heaviest = [e["name"] for e in entries[:NUM_HEAVIEST] if e["size_bytes"]]
+    unused = [
+        e["name"]
+        for e in entries
+        if not e["imported_at_boot"] and not e["runtime_only"]
+    ]
+
+    return {
+        "requirements": entries,
+        "heaviest": heaviest,
+        "unused": unused,
+        "not_installed": not_installed,
+    }
+
+
+def format_report(report):
+    """Format a dependency report for output.
+
+    Returns:
+        str
+    """
+    lines = ["\nDependency footprint:"]
+    header = f"  {'requirement':28} {'on disk':>10} {'native':>10} {'import':>10}"
+    lines += [header, "  " + "-" * (len(header) - 2)]
+
+    for entry in report["requirements"]:
+        flags = ""
+        if entry["name"] in report["heaviest"]:
+            flags += "  heavy"
+        if entry["name"] in report["unused"]:
+            flags += "  not imported at boot"
+        lines.append(
+            f"  {entry['name'][:28]:28}"
+            f" {sd_utils.format_bytes(entry['size_bytes']):>10}"
+            f" {sd_utils.format_bytes(entry['native_bytes']):>10}"
+            f" {entry['import_ms']:>7.1f} ms"
+            f"{flags}"
+        )
+
+    total = sum(e["size_bytes"] for e in report["requirements"])
+    lines.append(f"\n  Total installed size: {sd_utils.format_bytes(total)}")
+
+    if report["unused"]:
+        lines.append("\n  These requirements weren't imported when the project booted:")
+        lines += [f"    {name}" for name in report["unused"]]
+        lines.append("  They may be used later, ie by a management command; if not,")
+        lines.append("  removing them will make the deployed image smaller.")
+
+    if report["not_installed"]:
+        names = ", ".join(report["not_installed"])
+        lines.append(f"\n  Not installed locally, so not measured: {names}")
+
+    return "\n".join(lines)
+
+
+# --- Helper functions ---
+
+
+def _get_top_level_modules():
+    """Map each installed distribution to the top-level modules it provides.
+
+    Returns:
+        dict: {normalized distribution name: [module names]}
+    """
+    modules_by_dist = {}
+    for module, dist_names in metadata.packages_distributions().items():
+        for dist_name in dist_names:
+            dist_name = sd_utils.normalize_name(dist_name)
+            modules_by_dist.setdefault(dist_name, []).append(module)
+    return {dist: sorted(modules) for dist, modules in modules_by_dist.items()}
+
+
+def _get_import_times(imports):
+    """Get the import time of each top-level package, in microseconds.
+
+    Each module's own import time is counted towards its top-level package, at every
+    depth. That includes packages that are only imported by other packages, and
+    doesn't count anything twice. Time spent importing other packages counts towards
+    those packages.
+    """
+    import_times = {}
+    for i in imports:
+        package = i["name"].split(".")[0]
+        import_times[package] = import_times.get(package, 0) + i["self_us"]
+    return import_times
+
+
+def _get_installed_size(dist):
+    """Get the size of a distribution's installed files, and of its native files.
+
+    Returns:
+        Tuple[int, int]: Total bytes, and bytes in native extensions.
+    """
+    size, native_size = 0, 0
+    for file in dist.files or []:
+        try:
+            file_size = file.locate().stat().st_size
+        except OSError:
+            continue
+        size += file_size
+        if file.name.endswith(NATIVE_SUFFIXES) or ".so." in file.name:
+            native_size += file_size
+    return size, native_size
@@ -0,0 +1,287 @@
+"""Keep Docker build contexts small, by generating a .dockerignore file.
+
+When a platform builds an image, everything in the build context is uploaded to the
+builder unless it's listed in .dockerignore. In a typical project that includes .git/,
+a virtual environment, simple_deploy_logs/, and any local media files, which can add
+up to hundreds of megabytes per deploy.
+
+Files that Git tracks are what the project needs, so they're always kept. Untracked
+directories are measured, and are ignored if they're virtual environments, if they're
+known not to be needed in an image, or if they're large. If a pattern for entries that
+aren't needed, ie *.sqlite3, would also match a tracked file, only the untracked
+entries it matches are ignored, by path. Existing .dockerignore
+entries are kept; new entries are appended.
+
+Sizes are projections. Entries are matched against .dockerignore patterns with
+fnmatch, which covers the patterns generated here and most hand-written ones, but
+isn't a full implementation of Docker's matching rules.
+"""
+
+import fnmatch
+import os
+import subprocess
+from pathlib import Path
+
+from . import sd_utils
+
+
+# Untracked entries that never belong in an image.
+ALWAYS_IGNORE = [
+    ".git",
+    "simple_deploy_logs",
+    "**/__pycache__",
+    "**/*.pyc",
+    "*.sqlite3",
+    ".env",
+]
+
+# Untracked entries that are needed in an image, even though Git doesn't track them.
+ALWAYS_KEEP = ["simple_deploy_build", "Dockerfile", ".dockerignore"]
+
+# Untracked directories and files at least this large are ignored.
+HEAVY_THRESHOLD = 1024**2
+
+DOCKERIGNORE_HEADER = "# Added by simple_deploy, to keep the build context small."
+
+
+def analyze_context(context_dir, media_root=None):
+    """Find what should be left out of the build context, and measure the effect.
+
+    Returns:
+        dict: existing_patterns, new_patterns, size_before, size_after, and
+        ignored: a list of (pattern, size) for each new pattern.
+    """
+    context_dir = Path(context_dir)
+    existing_patterns = read_dockerignore(context_dir / ".dockerignore")
+    entries = get_entries(context_dir)
+
+    new_patterns, ignored = [], []
+    for pattern in ALWAYS_IGNORE:
+        if pattern in existing_patterns:
+            continue
+        # Only add patterns that match something, to keep .dockerignore minimal.
+        matched = [e for e in entries if _matches(e["path"], [pattern])]
+        if not any(e["tracked"] for e in matched):
+            size = sum(e["size"] for e in matched)
+            if size:
+                new_patterns.append(pattern)
+                ignored.append((pattern, size))
+            continue
+
+        # Tracked files are kept, so only ignore the untracked entries.
+        for entry in matched:
+            if entry["tracked"] or _matches(entry["path"], new_patterns):
+                continue
+            new_patterns.append(entry["path"])
+            ignored.append((entry["path"], entry["size"]))
+
+    media_pattern = _get_media_pattern(context_dir, media_root)
+    candidates = sorted(
+        (e for e in entries if not e["tracked"]), key=lambda e: e["path"]
+    )
+    for entry in candidates:
+        pattern = entry["path"]
+        if pattern.split("/")[0] in ALWAYS_KEEP:
+            continue
+        if _matches(pattern, existing_patterns + new_patterns):
+            continue
+        heavy = entry["size"] >= HEAVY_THRESHOLD
+        if entry["venv"] or heavy or pattern == media_pattern:
+            new_patterns.append(pattern)
+            ignored.append((pattern, entry["size"]))
+
+    all_patterns = existing_patterns + new_patterns
+    return {
+        "existing_patterns": existing_patterns,
+        "new_patterns": new_patterns,
+        "ignored": ignored,
+        "size_before": _unmatched_size(entries, existing_patterns),
+        "size_after": _unmatched_size(entries, all_patterns),
+    }
+
+
+def get_entries(context_dir):
+    """Walk the build context, grouping untracked directories into single entries.
+
+    Tracked files are listed individually. A directory that contains no tracked
+    files is measured as a whole, and not descended into for matching.
+
+    Returns:
+        List[dict]: path (relative, posix), size, tracked, and venv for each entry.
+    """
+    tracked_files = get_tracked_files(context_dir)
+    tracked_dirs = set()
+    for path in tracked_files:
+        parts = path.split("/")[:-1]
+        for i in range(1, len(parts) + 1):
+            tracked_dirs.add("/".join(parts[:i]))
+
+    entries = []
+    for root, dir_names, file_names in os.walk(context_dir):
+        rel_root = Path(root).relative_to(context_dir).as_posix()
+        rel_root = "" if rel_root == "." else f"{rel_root}/"
+
+        for dir_name in list(dir_names):
+            rel_path = f"{rel_root}{dir_name}"
+            if rel_path in tracked_dirs:
+                continue
+            # Untracked dir; measure it as a single entry.
+            dir_names.remove(dir_name)
+            dir_path = Path(root) / dir_name
+            entries.append(
+                {
+                    "path": rel_path,
+                    "size": get_dir_size(dir_path),
+                    "tracked": False,
+                    "venv": (dir_path / "pyvenv.cfg").exists(),
+                }
+            )
+
+        for file_name in file_names:
+            rel_path = f"{rel_root}{file_name}"
+            try:
+                size = os.lstat(Path(root) / file_name).st_size
+            except OSError:
+                continue
+            entries.append(
+                {
+                    "path": rel_path,
+                    "size": size,
+                    "tracked": rel_path in tracked_files,
+                    "venv": False,
+                }
+            )
+
+    return entries
+
+
+def get_tracked_files(context_dir):
+    """Get the files Git tracks in the context dir, relative to the context dir.
+
+    Returns:
+        Set[str]: Posix-style relative paths. Empty if this isn't a Git repo.
+    """
+    cmd = ["git", "ls-files", "-z"]
+    try:
+        output = subprocess.run(cmd, cwd=context_dir, capture_output=True)
+    except FileNotFoundError:
+        return set()
+    if output.returncode != 0:
+        return set()
+
+    paths = output.stdout.decode(errors="surrogateescape").split("\0")
+    return {path for path in paths if path}
+
+
+def get_dir_size(dir_path):
+    """Get the total size of all files in a directory, without following symlinks.
+
+    Returns:
+        int: Size in bytes.
+    """
+    total = 0
+    stack = [dir_path]
+    while stack:
+        try:
+            scanner = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with scanner:
+            for entry in scanner:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return total
+
+
+def read_dockerignore(path):
+    """Read the patterns from a .dockerignore file.
+
+    Returns:
+        List[str]: Patterns, without comments or blank lines.
+    """
+    if not path.exists():
+        return []
+
+    patterns = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+def merge_dockerignore(contents, new_patterns):
+    """Append new patterns to the contents of a .dockerignore file.
+
+    Returns:
+        str: New contents.
+    """
+    if not new_patterns:
+        return contents
+
+    if contents and not contents.endswith("\n"):
+        contents += "\n"
+    if contents:
+        contents += "\n"
+    contents += DOCKERIGNORE_HEADER + "\n"
+    contents += "\n".join(new_patterns) + "\n"
+    return contents
+
+
+def format_report(analysis):
+    """Summarize the effect of the new .dockerignore entries.
+
+    Returns:
+        str
+    """
+    msg = ""
+    for pattern, size in analysis["ignored"]:
+        msg += f"\n    {sd_utils.format_bytes(size):>10}  {pattern}"
+    size_before = sd_utils.format_bytes(analysis["size_before"])
+    size_after = sd_utils.format_bytes(analysis["size_after"])
+    msg += f"\n  Projected build context: {size_before} -> {size_after}"
+    return msg
+
+
+# --- Helper functions ---
+
+
+def _matches(path, patterns):
+    """Check whether a path, or any of its parents, matches any pattern."""
+    parts = path.split("/")
+    candidates = ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+    for pattern in patterns:
+        if pattern.startswith("!"):
+            continue
+        pattern = pattern.strip("/")
+        if pattern.startswith("**/"):
+            # Match at any depth.
+            sub_pattern = pattern[3:]
+            if any(fnmatch.fnmatch(part, sub_pattern) for part in parts):
+                return True
+            continue
+        if any(fnmatch.fnmatch(candidate, pattern) for candidate in candidates):
+            return True
+    return False
+
+
+def _unmatched_size(entries, patterns):
+    """Total size of entries that don't match any of the patterns."""
+    return sum(e["size"] for e in entries if not _matches(e["path"], patterns))
+
+
+def _get_media_pattern(context_dir, media_root):
+    """Get MEDIA_ROOT as a pattern relative to the context dir, if it's inside it."""
+    if not media_root:
+        return None
+    try:
+        media_path = Path(media_root).resolve().relative_to(context_dir.resolve())
+    except ValueError:
+        return None
+    return media_path.as_posix()
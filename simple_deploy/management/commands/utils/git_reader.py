@@ -0,0 +1,769 @@
+"""Read a Git repository's state without running git.
+
+Before configuring a project, deploy finds the repository and checks that nothing
+other than simple_deploy's own work is uncommitted. Running `git status` and `git diff`
+for that costs two processes, and git scans the whole work tree each time. This module
+answers the same questions in-process, for the common case:
+- The repository is found with an upward search, the way git finds it. A `.git` file,
+  as used by worktrees and submodules, is followed to the real git dir.
+- HEAD and the current branch are read from HEAD, loose refs, and packed-refs.
+- Work tree changes are found by comparing stat data with the index, and hashing only
+  the files whose stat data differs.
+- Staged changes are found by comparing the index with HEAD's tree. Objects are read
+  whether they're loose or packed, since a clone or `git gc` packs them.
+- Untracked files are found by walking the work tree, applying .gitignore rules.
+
+Only that much of git's storage is read. Anything else raises GitReaderError, ie
+index version 4, split or sparse indexes, SHA-256 object names, objects in alternates,
+or content filters that make a file's hash differ from its contents. Callers fall back
+to the git CLI in that case.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import stat
+import struct
+import zlib
+from difflib import unified_diff
+from pathlib import Path
+from typing import NamedTuple
+
+
+class GitReaderError(Exception):
+    """The repository can't be read without the git CLI."""
+
+
+class IndexEntry(NamedTuple):
+    path: str
+    mode: int
+    sha: str
+    size: int
+    mtime_ns: int
+    ino: int
+    stage: int
+    intent_to_add: bool
+    skip_worktree: bool
+
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA, REF_DELTA = 6, 7
+
+MODE_TREE = 0o040000
+MODE_SYMLINK = 0o120000
+MODE_GITLINK = 0o160000
+
+# Read this much compressed pack data at a time.
+INFLATE_CHUNK_SIZE = 16 * 1024
+
+
+def find_repo(start):
+    """Find the repository containing start, searching upwards.
+
+    Returns:
+        GitRepo | None
+    """
+    start = Path(start).resolve()
+    for path in [start, *start.parents]:
+        dot_git = path / ".git"
+        if dot_git.is_dir():
+            return GitRepo(path, dot_git)
+        if dot_git.is_file():
+            return GitRepo(path, _read_gitdir_file(dot_git))
+    return None
+
+
+class GitRepo:
+    """A non-bare repository, and its work tree."""
+
+    def __init__(self, work_tree, git_dir):
+        self.work_tree = Path(work_tree)
+        self.git_dir = Path(git_dir)
+
+        # Worktrees keep HEAD and the index in their own git dir, and share refs,
+        # objects, and config with the main repository.
+        commondir_path = self.git_dir / "commondir"
+        if commondir_path.exists():
+            commondir = commondir_path.read_text().strip()
+            self.common_dir = (self.git_dir / commondir).resolve()
+        else:
+            self.common_dir = self.git_dir
+
+        self.config = _read_config(self._get_config_paths())
+        if self.config.get("extensions.objectformat", "sha1").lower() != "sha1":
+            raise GitReaderError("Only SHA-1 repositories are supported.")
+        self._packs = None
+
+    # --- HEAD and refs ---
+
+    def read_head(self):
+        """Read HEAD.
+
+        Returns:
+            Tuple[str | None, str | None]: Current branch, or None if HEAD is detached;
+            and the commit HEAD points to, or None if there are no commits yet.
+        """
+        head = (self.git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return None, head
+
+        ref = head[5:]
+        branch = ref.removeprefix("refs/heads/")
+        return branch, self.resolve_ref(ref)
+
+    def resolve_ref(self, ref):
+        """Get the commit a ref points to.
+
+        Returns:
+            str | None: None if the ref doesn't exist.
+        """
+        for _ in range(10):
+            ref_path = self.common_dir / ref
+            if ref_path.is_file():
+                value = ref_path.read_text().strip()
+            else:
+                value = self._read_packed_refs().get(ref)
+                if value is None:
+                    return None
+            if not value.startswith("ref: "):
+                return value
+            ref = value[5:]
+        raise GitReaderError(f"Too many levels of symbolic refs at {ref}.")
+
+    # --- Status ---
+
+    def get_status(self):
+        """Compare HEAD, the index, and the work tree.
+
+        Returns:
+            dict: staged and unstaged, each {path: "A" | "M" | "D"}, and untracked: a
+            list of paths, with a trailing slash for untracked directories.
+        """
+        entries = self.read_index()
+        for entry in entries:
+            if entry.stage or entry.intent_to_add or entry.mode == MODE_GITLINK:
+                raise GitReaderError(f"Can't compare {entry.path} without git.")
+
+        return {
+            "staged": self._get_staged_changes(entries),
+            "unstaged": self._get_unstaged_changes(entries),
+            "untracked": self._get_untracked_paths(entries),
+        }
+
+    def get_porcelain_status(self, status=None):
+        """Format status the way `git status --porcelain` does.
+
+        Returns:
+            str
+        """
+        status = status or self.get_status()
+        staged, unstaged = status["staged"], status["unstaged"]
+        lines = []
+        for path in sorted(staged.keys() | unstaged.keys()):
+            lines.append(f"{staged.get(path, ' ')}{unstaged.get(path, ' ')} {path}")
+        lines += [f"?? {path}" for path in status["untracked"]]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def get_diff(self, paths):
+        """Diff work tree files against the index, like `git diff --unified=0`.
+
+        Returns:
+            str
+        """
+        entries = {entry.path: entry for entry in self.read_index()}
+        diffs = []
+        for path in paths:
+            _type, old = self.read_object(entries[path].sha)
+            new = (self.work_tree / path).read_bytes()
+            lines = unified_diff(
+                old.decode(errors="replace").splitlines(),
+                new.decode(errors="replace").splitlines(),
+                f"a/{path}",
+                f"b/{path}",
+                n=0,
+                lineterm="",
+            )
+            diffs.append("\n".join([f"diff --git a/{path} b/{path}", *lines]))
+        return "\n".join(diffs) + "\n" if diffs else ""
+
+    # --- Index ---
+
+    def read_index(self):
+        """Parse the index.
+
+        Returns:
+            List[IndexEntry]: Entries in index order.
+        """
+        index_path = self.git_dir / "index"
+        if not index_path.exists():
+            return []
+        data = index_path.read_bytes()
+
+        signature, version, count = struct.unpack(">4sLL", data[:12])
+        if signature != b"DIRC" or version not in (2, 3):
+            raise GitReaderError(f"Unsupported index version {version}.")
+
+        entries, pos = [], 12
+        for _ in range(count):
+            entry_start = pos
+            fields = struct.unpack(">10L20sH", data[pos : pos + 62])
+            pos += 62
+            mtime_s, mtime_ns, ino, mode, size = (
+                fields[2],
+                fields[3],
+                fields[5],
+                fields[6],
+                fields[9],
+            )
+            flags = fields[11]
+            extended_flags = 0
+            if version >= 3 and flags & 0x4000:
+                (extended_flags,) = struct.unpack(">H", data[pos : pos + 2])
+                pos += 2
+
+            end = data.index(b"\0", pos)
+            path = data[pos:end]
+            # Entries are padded with NULs to a multiple of 8 bytes.
+            pos = entry_start + ((end - entry_start) // 8 + 1) * 8
+
+            entries.append(
+                IndexEntry(
+                    path=path.decode(errors="surrogateescape"),
+                    mode=mode,
+                    sha=fields[10].hex(),
+                    size=size,
+                    mtime_ns=mtime_s * 10**9 + mtime_ns,
+                    ino=ino,
+                    stage=(flags >> 12) & 3,
+                    intent_to_add=bool(extended_flags & 0x2000),
+                    skip_worktree=bool(extended_flags & 0x4000),
+                )
+            )
+
+        # Extensions follow the entries; the last 20 bytes are a checksum.
+        while pos < len(data) - 20:
+            signature, size = struct.unpack(">4sL", data[pos : pos + 8])
+            if signature in (b"link", b"sdir"):
+                raise GitReaderError("Split and sparse indexes aren't supported.")
+            pos += 8 + size
+
+        self._index_mtime_ns = os.stat(index_path).st_mtime_ns
+        return entries
+
+    # --- Objects ---
+
+    def read_object(self, sha):
+        """Read an object from the object database.
+
+        Returns:
+            Tuple[str, bytes]: Object type, and contents.
+
+        Raises:
+            GitReaderError: If the object isn't found, ie it's in an alternate.
+        """
+        loose_path = self.common_dir / "objects" / sha[:2] / sha[2:]
+        if loose_path.exists():
+            raw = zlib.decompress(loose_path.read_bytes())
+            header, _, contents = raw.partition(b"\0")
+            return header.split()[0].decode(), contents
+
+        for pack in self._get_packs():
+            offset = pack.find(bytes.fromhex(sha))
+            if offset is not None:
+                return self._read_pack_object(pack, offset)
+
+        raise GitReaderError(f"Object {sha} not found.")
+
+    def read_tree(self, sha):
+        """Read a tree object.
+
+        Returns:
+            Dict[str, Tuple[int, str]]: {name: (mode, sha)}
+        """
+        _type, data = self.read_object(sha)
+        entries, pos = {}, 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode = int(data[pos:space], 8)
+            name = data[space + 1 : nul].decode(errors="surrogateescape")
+            entries[name] = (mode, data[nul + 1 : nul + 21].hex())
+            pos = nul + 21
+        return entries
+
+    # --- Helper methods ---
+
+    def _get_config_paths(self):
+        """Get config files in increasing order of precedence."""
+        xdg_home = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+        return [
+            Path("/etc/gitconfig"),
+            xdg_home / "git" / "config",
+            Path.home() / ".gitconfig",
+            self.common_dir / "config",
+        ]
+
+    def _read_packed_refs(self):
+        """Read packed-refs, as {ref: sha}."""
+        packed_refs_path = self.common_dir / "packed-refs"
+        if not packed_refs_path.exists():
+            return {}
+        refs = {}
+        for line in packed_refs_path.read_text().splitlines():
+            if line and line[0] not in "#^":
+                sha, ref = line.split(" ", 1)
+                refs[ref] = sha
+        return refs
+
+    def _get_unstaged_changes(self, entries):
+        """Compare the index with the work tree."""
+        filemode = _is_true(self.config.get("core.filemode", "true"))
+        has_filters = self._has_filters(entries)
+        changes = {}
+        for entry in entries:
+            if entry.skip_worktree:
+                continue
+            try:
+                st = os.lstat(self.work_tree / entry.path)
+            except (FileNotFoundError, NotADirectoryError):
+                changes[entry.path] = "D"
+                continue
+
+            if not _same_type(entry.mode, st.st_mode, filemode):
+                changes[entry.path] = "M"
+                continue
+            if entry.size != st.st_size & 0xFFFFFFFF:
+                changes[entry.path] = "M"
+                continue
+
+            # Truncate to the index's 32-bit seconds, as git does.
+            mtime_ns = (st.st_mtime_ns // 10**9 & 0xFFFFFFFF) * 10**9
+            mtime_ns += st.st_mtime_ns % 10**9
+            stat_matches = mtime_ns == entry.mtime_ns and (
+                not entry.ino or entry.ino == st.st_ino & 0xFFFFFFFF
+            )
+            # A file modified in the same instant the index was written may have
+            # matching stat data, but different contents.
+            racy = entry.mtime_ns >= self._index_mtime_ns
+            if stat_matches and not racy:
+                continue
+
+            if self._hash_worktree_file(entry.path, st) != entry.sha:
+                if has_filters:
+                    raise GitReaderError(
+                        f"{entry.path} may be changed by a filter or line ending "
+                        "conversion."
+                    )
+                changes[entry.path] = "M"
+        return changes
+
+    def _get_staged_changes(self, entries):
+        """Compare HEAD's tree with the index."""
+        index_files = {entry.path: (entry.mode, entry.sha) for entry in entries}
+        _branch, head = self.read_head()
+        if head is None:
+            return {path: "A" for path in index_files}
+
+        _type, commit = self.read_object(head)
+        head_tree = commit.split(b"\n", 1)[0].split()[1].decode()
+        head_files = self._read_tree_files(head_tree)
+
+        changes = {}
+        for path in head_files.keys() | index_files.keys():
+            if path not in index_files:
+                changes[path] = "D"
+            elif path not in head_files:
+                changes[path] = "A"
+            elif head_files[path] != index_files[path]:
+                changes[path] = "M"
+        return changes
+
+    def _read_tree_files(self, sha, prefix=""):
+        """List every file in a tree, and its subtrees.
+
+        Returns:
+            Dict[str, Tuple[int, str]]: {path: (mode, sha)}
+        """
+        files = {}
+        for name, (mode, entry_sha) in self.read_tree(sha).items():
+            if mode == MODE_TREE:
+                files.update(self._read_tree_files(entry_sha, f"{prefix}{name}/"))
+            else:
+                files[f"{prefix}{name}"] = (mode, entry_sha)
+        return files
+
+    def _get_untracked_paths(self, entries):
+        """Find untracked files that aren't ignored.
+
+        Like `git status`, a directory with no tracked files is listed once, with a
+        trailing slash, if it contains anything that isn't ignored.
+        """
+        tracked_files = {entry.path for entry in entries}
+        tracked_dirs = set()
+        for path in tracked_files:
+            parts = path.split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                tracked_dirs.add("/".join(parts[:i]))
+
+        rules = self._get_base_ignore_rules()
+        untracked = []
+        self._walk_untracked("", rules, tracked_files, tracked_dirs, untracked)
+        return sorted(untracked)
+
+    def _walk_untracked(self, rel_dir, rules, tracked_files, tracked_dirs, untracked):
+        """Walk one directory that contains tracked files."""
+        dir_path = self.work_tree / rel_dir
+        rules = rules + _read_ignore_file(dir_path / ".gitignore", rel_dir)
+
+        with os.scandir(dir_path) as scanner:
+            dir_entries = sorted(scanner, key=lambda e: e.name)
+
+        for dir_entry in dir_entries:
+            if dir_entry.name == ".git":
+                continue
+            rel_path = f"{rel_dir}{dir_entry.name}"
+            is_dir = dir_entry.is_dir(follow_symlinks=False)
+
+            if is_dir and rel_path in tracked_dirs:
+                self._walk_untracked(
+                    f"{rel_path}/", rules, tracked_files, tracked_dirs, untracked
+                )
+            elif rel_path in tracked_files or _is_ignored(rel_path, is_dir, rules):
+                continue
+            elif not is_dir:
+                untracked.append(rel_path)
+            elif self._has_unignored_files(rel_path, rules):
+                untracked.append(f"{rel_path}/")
+
+    def _has_unignored_files(self, rel_dir, rules):
+        """Check whether an untracked directory contains anything that's not ignored."""
+        dir_path = self.work_tree / rel_dir
+        if (dir_path / ".git").exists():
+            # A nested repository is listed as untracked, whatever it contains.
+            return True
+        rules = rules + _read_ignore_file(dir_path / ".gitignore", f"{rel_dir}/")
+
+        try:
+            scanner = os.scandir(dir_path)
+        except OSError:
+            return False
+        with scanner:
+            for dir_entry in scanner:
+                rel_path = f"{rel_dir}/{dir_entry.name}"
+                is_dir = dir_entry.is_dir(follow_symlinks=False)
+                if _is_ignored(rel_path, is_dir, rules):
+                    continue
+                if not is_dir or self._has_unignored_files(rel_path, rules):
+                    return True
+        return False
+
+    def _get_base_ignore_rules(self):
+        """Get ignore rules that apply before any .gitignore file."""
+        excludes_file = self.config.get("core.excludesfile")
+        if excludes_file:
+            excludes_path = Path(os.path.expanduser(excludes_file))
+        else:
+            xdg_home = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+            excludes_path = xdg_home / "git" / "ignore"
+
+        rules = _read_ignore_file(excludes_path, "")
+        rules += _read_ignore_file(self.common_dir / "info" / "exclude", "")
+        return rules
+
+    def _has_filters(self, entries):
+        """Check whether files may be converted when they're added to the index."""
+        if _is_true(self.config.get("core.autocrlf", "false")):
+            return True
+        if self.config.get("core.autocrlf", "").lower() == "input":
+            return True
+        if (self.common_dir / "info" / "attributes").exists():
+            return True
+        return any(Path(entry.path).name == ".gitattributes" for entry in entries)
+
+    def _hash_worktree_file(self, path, st):
+        """Hash a work tree file the way `git hash-object` would, without filters."""
+        full_path = self.work_tree / path
+        if stat.S_ISLNK(st.st_mode):
+            contents = os.fsencode(os.readlink(full_path))
+        else:
+            contents = full_path.read_bytes()
+        header = f"blob {len(contents)}\0".encode()
+        return hashlib.sha1(header + contents).hexdigest()
+
+    def _get_packs(self):
+        """Open every pack's index, once."""
+        if self._packs is None:
+            pack_dir = self.common_dir / "objects" / "pack"
+            self._packs = [Pack(path) for path in sorted(pack_dir.glob("*.idx"))]
+        return self._packs
+
+    def _read_pack_object(self, pack, offset):
+        """Read an object from a pack, applying deltas."""
+        data = pack.data
+        byte = data[offset]
+        obj_type = (byte >> 4) & 7
+        pos = offset + 1
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+
+        if obj_type == OFS_DELTA:
+            base_distance, pos = _read_offset_varint(data, pos)
+            base_type, base = self._read_pack_object(pack, offset - base_distance)
+            return base_type, _apply_delta(base, _inflate(data, pos))
+        if obj_type == REF_DELTA:
+            base_type, base = self.read_object(data[pos : pos + 20].hex())
+            return base_type, _apply_delta(base, _inflate(data, pos + 20))
+        return OBJECT_TYPES[obj_type], _inflate(data, pos)
+
+
+class Pack:
+    """A pack file, and its version 2 index."""
+
+    def __init__(self, idx_path):
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.idx[:8] != b"\377tOc\0\0\0\2":
+            raise GitReaderError(f"Unsupported pack index {idx_path.name}.")
+        with open(idx_path.with_suffix(".pack"), "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = self._read_fanout(255)
+
+    def find(self, sha):
+        """Find an object's offset in the pack.
+
+        Returns:
+            int | None
+        """
+        # The fanout table holds the number of objects whose first byte is <= i.
+        first = sha[0]
+        low = self._read_fanout(first - 1) if first else 0
+        high = self._read_fanout(first)
+
+        names_start = 8 + 256 * 4
+        while low < high:
+            mid = (low + high) // 2
+            name = self.idx[names_start + mid * 20 : names_start + mid * 20 + 20]
+            if name < sha:
+                low = mid + 1
+            elif name > sha:
+                high = mid
+            else:
+                return self._get_offset(mid)
+        return None
+
+    def _read_fanout(self, i):
+        """Read one entry from the fanout table."""
+        return struct.unpack(">L", self.idx[8 + i * 4 : 12 + i * 4])[0]
+
+    def _get_offset(self, position):
+        """Get the pack offset of the object at a position in the index."""
+        offsets_start = 8 + 256 * 4 + self.count * 24
+        start = offsets_start + position * 4
+        (offset,) = struct.unpack(">L", self.idx[start : start + 4])
+        if offset & 0x80000000:
+            # Offsets past 2 GB are stored in a separate table.
+            large_start = offsets_start + self.count * 4 + (offset & 0x7FFFFFFF) * 8
+            (offset,) = struct.unpack(">Q", self.idx[large_start : large_start + 8])
+        return offset
+
+
+# --- Helper functions ---
+
+
+def _read_gitdir_file(path):
+    """Follow a .git file to the git dir it points to."""
+    contents = path.read_text().strip()
+    if not contents.startswith("gitdir: "):
+        raise GitReaderError(f"Can't read {path}.")
+    return (path.parent / contents[8:]).resolve()
+
+
+def _read_config(paths):
+    """Read git config files into a flat dict, ie {"core.autocrlf": "false"}.
+
+    Includes and conditional includes aren't followed.
+    """
+    config, section = {}, ""
+    for path in paths:
+        try:
+            lines = path.read_text().splitlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for line in lines:
+            line = line.strip()
+            if not line or line[0] in "#;":
+                continue
+            m = re.fullmatch(r'\[\s*([\w.-]+)(?:\s+"(.*)")?\s*\]', line)
+            if m:
+                section = m.group(1).lower()
+                if m.group(2) is not None:
+                    section += f".{m.group(2)}"
+                continue
+            key, _, value = line.partition("=")
+            value = value.split(" #")[0].split(" ;")[0].strip().strip('"')
+            config[f"{section}.{key.strip().lower()}"] = value or "true"
+    return config
+
+
+def _is_true(value):
+    """Interpret a git config boolean."""
+    return value.lower() in ("true", "yes", "on", "1")
+
+
+def _read_offset_varint(data, pos):
+    """Read the variable-length integer used for offset deltas in packs."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def _inflate(data, pos):
+    """Decompress a zlib stream that starts at pos, without reading past its end."""
+    decompressor = zlib.decompressobj()
+    chunks = []
+    while not decompressor.eof:
+        chunk = data[pos : pos + INFLATE_CHUNK_SIZE]
+        if not chunk:
+            raise GitReaderError("Truncated pack file.")
+        chunks.append(decompressor.decompress(chunk))
+        pos += INFLATE_CHUNK_SIZE
+    return b"".join(chunks)
+
+
+def _apply_delta(base, delta):
+    """Rebuild an object from its base, and a delta."""
+
+    def read_size(pos):
+        size, shift = 0, 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return size, pos
+
+    _base_size, pos = read_size(0)
+    _result_size, pos = read_size(pos)
+    result = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            # Copy a range from the base.
+            offset, size = 0, 0
+            for i in range(4):
+                if opcode & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if opcode & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            result += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            # Insert new data.
+            result += delta[pos : pos + opcode]
+            pos += opcode
+        else:
+            raise GitReaderError("Invalid delta.")
+    return bytes(result)
+
+
+def _same_type(index_mode, st_mode, filemode):
+    """Check whether a work tree file still has the type the index records."""
+    if index_mode == MODE_SYMLINK:
+        return stat.S_ISLNK(st_mode)
+    if not stat.S_ISREG(st_mode):
+        return False
+    if not filemode:
+        return True
+    return bool(index_mode & 0o100) == bool(st_mode & 0o100)
+
+
+def _read_ignore_file(path, base):
+    """Read ignore rules from a .gitignore or exclude file.
+
+    Returns:
+        List[Tuple[re.Pattern, bool, bool]]: (regex, negated, dir_only) for each rule.
+        Each regex matches paths relative to the work tree.
+    """
+    try:
+        lines = path.read_text(errors="surrogateescape").splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        line = re.sub(r"(?<!\\)\s+$", "", line)
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        if line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        anchored = "/" in line
+        pattern = _translate_glob(line.lstrip("/"))
+        if not anchored:
+            pattern = f"(?:.*/)?{pattern}"
+        regex = re.compile(f"{re.escape(base)}{pattern}", re.DOTALL)
+        rules.append((regex, negated, dir_only))
+    return rules
+
+
+def _translate_glob(pattern):
+    """Translate a gitignore glob to a regex, with gitignore's rules for `**`."""
+    regex, i = "", 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == len(pattern) and (
+            i == 0 or pattern[i - 1] == "/"
+        ):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            char_class = pattern[i + 1 : end].replace("\\", "\\\\")
+            if char_class.startswith("!"):
+                char_class = "^" + char_class[1:]
+            regex += f"[{char_class}]"
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+def _is_ignored(rel_path, is_dir, rules):
+    """Check a path against ignore rules; the last rule that matches wins."""
+    ignored = False
+    for regex, negated, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if regex.fullmatch(rel_path):
+            ignored = not negated
+    return ignored
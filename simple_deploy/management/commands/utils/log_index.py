@@ -0,0 +1,367 @@
+"""Index the logs in simple_deploy_logs/, so past runs can be queried quickly.
+
+The index records each run's phases and errors, with the line they're on. It's kept
+in log_index.json in the log dir, and brought up to date each time it's read:
+- Logs whose size and mtime haven't changed are skipped.
+- A log that's grown, ie the log of a run in progress, is parsed from where parsing
+  last stopped.
+- A log that's been compressed since it was indexed keeps its entry, if the size
+  recorded in the gzip trailer matches the number of bytes that were parsed.
+- Entries for logs that have been removed are dropped.
+
+So after the first query, a query only reads logs that are new or still being
+written. How each run ended comes from runs.jsonl; see log_retention.
+
+Compressed logs are decompressed as they're read, so no log is held in memory in
+full.
+"""
+
+import gzip
+import json
+import os
+import re
+import struct
+import time
+from collections import deque
+from pathlib import Path
+
+from . import log_retention
+
+
+INDEX_NAME = "log_index.json"
+INDEX_VERSION = 1
+
+# Phases of a deploy run, in the order they happen. Each one is marked in the log by
+# a line starting with PHASE_MARKER.
+PHASE_MARKER = "Phase: "
+PHASES = [
+    "load_plugin",
+    "inspect",
+    "analyze",
+    "prepare",
+    "confirm",
+    "plugin_deploy",
+    "watch",
+]
+
+# How a run can end, as recorded in runs.jsonl. Runs with no record in runs.jsonl
+# are still running, or stopped without a chance to record anything.
+OUTCOMES = ["succeeded", "failed", "cancelled", "interrupted", "unfinished"]
+
+ERROR_MARKER = "SimpleDeployCommandError:"
+
+# Errors are shortened to this many characters in the index.
+MAX_ERROR_LENGTH = 200
+
+# Block size for reading a log backwards, when tailing it.
+TAIL_BLOCK_SIZE = 8192
+
+# Seconds a followed log can go without changing before following stops. A run that's
+# killed never records how it ended, so this is how following it ends.
+FOLLOW_IDLE_TIMEOUT = 600
+
+# Strip the timestamp and level from each log line.
+_prefix_re = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} [A-Z]+: ?")
+
+
+def get_runs(log_dir):
+    """Get every run in the log dir, with how it ended, its phases, and errors.
+
+    Returns:
+        List[dict]: Runs, oldest first.
+    """
+    entries = update_index(log_dir)
+    records = {run["log"]: run for run in log_retention.read_runs(log_dir)}
+
+    runs = []
+    for name, entry in entries.items():
+        record = records.get(name, {})
+        phases = [phase for phase, _line in entry["phases"]]
+        runs.append(
+            {
+                "log": name,
+                "path": Path(log_dir) / entry["file"],
+                "started": entry["started"],
+                "plugin": record.get("plugin"),
+                "outcome": record.get("outcome", "unfinished"),
+                "phase": record.get("phase") or (phases[-1] if phases else None),
+                "duration": record.get("duration"),
+                "lines": entry["lines"],
+                "phases": entry["phases"],
+                "errors": entry["errors"],
+            }
+        )
+    return sorted(runs, key=lambda run: run["started"])
+
+
+def filter_runs(runs, outcome=None, phase=None, plugin=None, since=None):
+    """Get the runs that match every filter that's set.
+
+    A run's phase is the phase it was in when it ended.
+    """
+    if outcome:
+        runs = [run for run in runs if run["outcome"] == outcome]
+    if phase:
+        runs = [run for run in runs if run["phase"] == phase]
+    if plugin:
+        runs = [run for run in runs if run["plugin"] == plugin]
+    if since:
+        since = since.isoformat(timespec="seconds")
+        runs = [run for run in runs if run["started"] >= since]
+    return runs
+
+
+def update_index(log_dir):
+    """Bring the index up to date with the logs in the log dir.
+
+    Returns:
+        dict: Index entry for each run, by the name of its uncompressed log.
+    """
+    index = _load_index(log_dir)
+    entries = {}
+
+    for timestamp, path in log_retention.get_logs(log_dir):
+        name = log_retention.get_run_name(path)
+        if name in entries:
+            # A log that was compressed while the dir was listed; the .log is used.
+            continue
+        try:
+            entry = _update_entry(path, timestamp, index.get(name))
+        except (OSError, EOFError):
+            # The log was removed or compressed after the dir was listed. A compressed
+            # copy is listed after the .log, so it's picked up below.
+            continue
+        entries[name] = entry
+
+    if entries != index:
+        _write_index(log_dir, entries)
+    return entries
+
+
+def open_log(path):
+    """Open a log for reading as text, whether compressed or not."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def grep_log(path, pattern):
+    """Find lines in a log that match a compiled pattern, reading one line at a time.
+
+    Yields:
+        Tuple[int, str]: Line number and line, for each matching line.
+    """
+    with open_log(path) as f:
+        for line_num, line in enumerate(f, start=1):
+            if pattern.search(line):
+                yield line_num, line.rstrip("\n")
+
+
+def tail_lines(path, num_lines, end=None):
+    """Get the last lines of a log.
+
+    Uncompressed logs are read backwards from end, a block at a time; end defaults to
+    the current size of the log. A caller that follows the log from end won't see any
+    line twice. Compressed logs have to be decompressed from the start, but only
+    num_lines are kept.
+
+    Returns:
+        List[str]: The last num_lines lines, without newlines.
+    """
+    if num_lines <= 0:
+        return []
+
+    if path.suffix == ".gz":
+        with open_log(path) as f:
+            return [line.rstrip("\n") for line in deque(f, maxlen=num_lines)]
+
+    with open(path, "rb") as f:
+        if end is None:
+            end = f.seek(0, os.SEEK_END)
+        pos, data = end, b""
+        # One extra newline is needed to find the start of the first line kept.
+        while pos > 0 and data.count(b"\n") <= num_lines:
+            read_size = min(TAIL_BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-num_lines:]
+
+
+def follow(
+    path, log_dir, offset, poll_interval=0.5, idle_timeout=FOLLOW_IDLE_TIMEOUT
+):
+    """Yield lines added to a log after offset, until its run finishes.
+
+    The offset is taken by the caller, so lines written before the generator starts
+    running aren't missed. A run has finished once it's recorded in runs.jsonl. A run
+    that was killed is never recorded, so following also stops once the log hasn't
+    changed for idle_timeout seconds. Only complete lines are yielded; a partial line
+    is held until the rest of it is written.
+
+    Yields:
+        str: Each new line, without its newline.
+    """
+    runs_path = Path(log_dir) / log_retention.INDEX_NAME
+    runs_mtime = None
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pending = b""
+        last_change = time.monotonic()
+        while True:
+            data = f.read()
+            if data:
+                last_change = time.monotonic()
+                pending += data
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    yield line.decode("utf-8", errors="replace")
+                continue
+
+            # Only read runs.jsonl when it's changed.
+            try:
+                mtime = runs_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != runs_mtime:
+                runs_mtime = mtime
+                logs = {run["log"] for run in log_retention.read_runs(log_dir)}
+                if path.name in logs:
+                    break
+            if time.monotonic() - last_change >= idle_timeout:
+                break
+
+            time.sleep(poll_interval)
+
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def get_message(line):
+    """Get the message from a log line, without its timestamp and level."""
+    return _prefix_re.sub("", line, count=1)
+
+
+# --- Helper functions ---
+
+
+def _update_entry(path, timestamp, entry):
+    """Get an up-to-date index entry for one log, parsing as little as possible.
+
+    Returns:
+        dict: Index entry for the log.
+    """
+    stat = path.stat()
+    if entry and _is_unchanged(entry, path, stat):
+        return entry
+
+    if entry and path.suffix == ".gz" and entry["file"] != path.name:
+        # The log has been compressed since it was indexed.
+        if _get_gzip_size(path) == entry["size"] % 2**32:
+            return {
+                **entry,
+                "file": path.name,
+                "file_size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        entry = None
+
+    # Only an uncompressed log that's grown can be parsed from where parsing stopped.
+    can_resume = (
+        entry
+        and path.suffix == ".log"
+        and entry["file"] == path.name
+        and stat.st_size >= entry["size"]
+    )
+    if not can_resume:
+        entry = {
+            "file": path.name,
+            "started": timestamp.isoformat(timespec="seconds"),
+            "size": 0,
+            "lines": 0,
+            "phases": [],
+            "errors": [],
+            "error_line": None,
+        }
+    else:
+        entry = {
+            **entry,
+            "phases": list(entry["phases"]),
+            "errors": list(entry["errors"]),
+        }
+
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            _parse(f, entry, complete=True)
+    else:
+        with open(path, "rb") as f:
+            f.seek(entry["size"])
+            _parse(f, entry, complete=False)
+
+    entry["file_size"] = stat.st_size
+    entry["mtime_ns"] = stat.st_mtime_ns
+    return entry
+
+
+def _is_unchanged(entry, path, stat):
+    """Check if a log is the same as when it was indexed."""
+    return (
+        entry["file"] == path.name
+        and entry.get("file_size") == stat.st_size
+        and entry.get("mtime_ns") == stat.st_mtime_ns
+    )
+
+
+def _parse(f, entry, complete):
+    """Parse log lines from a binary stream, updating the entry in place.
+
+    If the log may still be growing, a final line without a newline is left for the
+    next update.
+    """
+    for raw_line in f:
+        if not complete and not raw_line.endswith(b"\n"):
+            break
+        entry["size"] += len(raw_line)
+        entry["lines"] += 1
+        line_num = entry["lines"]
+        message = get_message(raw_line.decode("utf-8", errors="replace")).strip()
+
+        if entry["error_line"] is not None:
+            # The error message is the first non-empty line after the marker.
+            if message:
+                entry["errors"].append([line_num, message[:MAX_ERROR_LENGTH]])
+                entry["error_line"] = None
+        elif message == ERROR_MARKER:
+            entry["error_line"] = line_num
+        elif message.startswith(PHASE_MARKER):
+            entry["phases"].append([message.removeprefix(PHASE_MARKER), line_num])
+
+
+def _get_gzip_size(path):
+    """Get the uncompressed size from a gzip file's trailer, modulo 2**32."""
+    with open(path, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return struct.unpack("<I", f.read(4))[0]
+
+
+def _load_index(log_dir):
+    """Load the index, or return an empty one if it's missing or out of date."""
+    index_path = Path(log_dir) / INDEX_NAME
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("runs", {})
+
+
+def _write_index(log_dir, entries):
+    """Write the index, replacing it in one step."""
+    index_path = Path(log_dir) / INDEX_NAME
+    tmp_path = index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+    index = {"version": INDEX_VERSION, "runs": entries}
+    tmp_path.write_text(json.dumps(index, separators=(",", ":")))
+    os.replace(tmp_path, index_path)
@@ -0,0 +1,196 @@
+"""Keep simple_deploy_logs/ from growing without bound.
+
+Each run of deploy writes a new log file. When a run starts, logs beyond the retention
+limits are removed: the oldest logs beyond a maximum count, logs older than a maximum
+age, and the oldest logs until the total size fits a maximum. The current run's log is
+always kept. A limit of 0 turns that limit off.
+
+Older logs are then compressed with gzip in a background thread, so the run doesn't
+wait on them. Each file is written to a temp file and renamed, so an interrupted
+compression never leaves a partial archive in place of a log.
+
+When a run finishes, a line describing it is added to runs.jsonl in the log dir, so
+questions about past runs can be answered without opening every log.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+MAX_COUNT = 100
+MAX_AGE_DAYS = 90
+MAX_SIZE_MB = 100
+
+INDEX_NAME = "runs.jsonl"
+TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M%S"
+LOG_NAME_RE = re.compile(r"^simple_deploy_(\d{4}-\d{2}-\d{2}-\d{6})\.log(\.gz)?$")
+
+
+def get_log_name(timestamp):
+    """Get the filename for a run's log."""
+    return f"simple_deploy_{timestamp.strftime(TIMESTAMP_FORMAT)}.log"
+
+
+def get_run_name(path):
+    """Get the name a run's log is recorded under, whether compressed or not."""
+    return path.name.removesuffix(".gz")
+
+
+def get_logs(log_dir):
+    """Get every run log in the log dir, compressed or not.
+
+    Returns:
+        List[Tuple[datetime, Path]]: Timestamp and path of each log, oldest first.
+    """
+    logs = []
+    for path in Path(log_dir).iterdir():
+        m = LOG_NAME_RE.match(path.name)
+        if m:
+            logs.append((datetime.strptime(m.group(1), TIMESTAMP_FORMAT), path))
+    return sorted(logs)
+
+
+def get_expired_logs(
+    logs, sizes, current_log, max_count, max_age_days, max_size_mb, now=None
+):
+    """Choose which logs to remove, to satisfy all the limits.
+
+    Returns:
+        List[Path]: Logs to remove, oldest first.
+    """
+    now = now or datetime.now()
+    kept = [(timestamp, path) for timestamp, path in logs if path != current_log]
+    expired = []
+
+    if max_age_days:
+        cutoff = now - timedelta(days=max_age_days)
+        expired += [path for timestamp, path in kept if timestamp < cutoff]
+        kept = [(timestamp, path) for timestamp, path in kept if timestamp >= cutoff]
+
+    # The current log counts toward the limits.
+    if max_count and len(kept) + 1 > max_count:
+        num_removed = len(kept) + 1 - max_count
+        expired += [path for _timestamp, path in kept[:num_removed]]
+        kept = kept[num_removed:]
+
+    if max_size_mb:
+        max_bytes = max_size_mb * 1024 * 1024
+        total = sizes.get(current_log, 0) + sum(sizes[path] for _, path in kept)
+        while kept and total > max_bytes:
+            _timestamp, path = kept.pop(0)
+            expired.append(path)
+            total -= sizes[path]
+
+    return expired
+
+
+def apply_retention(
+    log_dir,
+    current_log,
+    max_count=MAX_COUNT,
+    max_age_days=MAX_AGE_DAYS,
+    max_size_mb=MAX_SIZE_MB,
+):
+    """Remove logs beyond the retention limits, and their entries in the index.
+
+    Returns:
+        List[Path]: Logs that were removed.
+    """
+    logs = get_logs(log_dir)
+    sizes = {path: path.stat().st_size for _timestamp, path in logs}
+    expired = get_expired_logs(
+        logs, sizes, current_log, max_count, max_age_days, max_size_mb
+    )
+    for path in expired:
+        path.unlink(missing_ok=True)
+
+    if expired:
+        expired_names = {get_run_name(path) for path in expired}
+        runs = [run for run in read_runs(log_dir) if run["log"] not in expired_names]
+        _write_runs(log_dir, runs)
+
+    return expired
+
+
+def start_compression(log_dir, current_log):
+    """Compress every uncompressed log except the current one, in the background.
+
+    The thread isn't a daemon thread, so the interpreter waits for it to finish
+    before exiting.
+
+    Returns:
+        threading.Thread | None: The compression thread, or None if there's nothing
+        to compress.
+    """
+    paths = [
+        path
+        for _timestamp, path in get_logs(log_dir)
+        if path.suffix == ".log" and path != current_log
+    ]
+    if not paths:
+        return None
+
+    thread = threading.Thread(
+        target=compress_logs, args=(paths,), name="simple_deploy-log-compression"
+    )
+    thread.start()
+    return thread
+
+
+def compress_logs(paths):
+    """Replace each log with a gzipped copy."""
+    for path in paths:
+        gz_path = path.with_name(f"{path.name}.gz")
+        tmp_path = path.with_name(f"{path.name}.gz.{os.getpid()}.tmp")
+        try:
+            with open(path, "rb") as f_in, gzip.open(tmp_path, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            shutil.copystat(path, tmp_path)
+            os.replace(tmp_path, gz_path)
+            path.unlink()
+        except OSError:
+            # Another run may have compressed or removed this log already.
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def record_run(log_dir, run):
+    """Add a finished run to the index."""
+    with open(Path(log_dir) / INDEX_NAME, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+
+
+def read_runs(log_dir):
+    """Read the index of runs, skipping any lines that can't be parsed.
+
+    Returns:
+        List[dict]: Runs, in the order they finished.
+    """
+    index_path = Path(log_dir) / INDEX_NAME
+    if not index_path.exists():
+        return []
+
+    runs = []
+    with open(index_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+    return runs
+
+
+# --- Helper functions ---
+
+
+def _write_runs(log_dir, runs):
+    """Rewrite the index, replacing it in one step."""
+    index_path = Path(log_dir) / INDEX_NAME
+    tmp_path = index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+    tmp_path.write_text("".join(json.dumps(run) + "\n" for run in runs))
+    os.replace(tmp_path, index_path)
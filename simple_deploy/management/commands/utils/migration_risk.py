@@ -0,0 +1,361 @@
+"""Find migrations that are likely to lock or rewrite tables when they're applied.
+
+With --automate-all, the platform applies migrations as part of the deployment. Most
+migrations are quick, but some hold locks for as long as it takes to rewrite or scan
+an entire table, and on a large table that's an outage.
+
+The local database says nothing about what's been applied on the platform, so it's not
+used as the baseline. When a deployment with --automate-all succeeds, the migrations in
+the project are recorded with the run, in the index of runs. The plan starts from the
+migrations recorded by the last such run. If there isn't one, the plan starts from an
+empty database, so every migration is analyzed. The plan itself is built with Django's
+migration loader and executor, just as `migrate --plan` does.
+
+The local database is only used to render each migration's SQL. Nothing here creates a
+database; if a SQLite file doesn't exist yet, the SQL isn't shown.
+
+Each operation is classified by how it's likely to behave on a table that already has
+data. Operations on a model created earlier in the same plan are low risk, because the
+table is still empty when they run.
+"""
+
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations import operations
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.state import ProjectState
+from django.db.models import NOT_PROVIDED, CheckConstraint, ForeignKey, UniqueConstraint
+
+
+RISK_LEVELS = ["low", "medium", "high"]
+
+# Operations that only change Django's model state, not the database.
+STATE_ONLY_OPERATIONS = (
+    operations.AlterModelOptions,
+    operations.AlterModelManagers,
+)
+
+
+def scan(deployment=None, alias=DEFAULT_DB_ALIAS):
+    """Classify every operation in every migration that hasn't been deployed.
+
+    deployment is the last run that recorded deployed migrations, from
+    get_last_deployment(). If it's None, every migration is classified.
+
+    Returns:
+        dict: baseline ("deployed" or "empty"), deployed_at, vendor, and migrations:
+        one dict per unapplied migration, with app_label, name, risk, operations,
+        and sql.
+    """
+    connection = get_connection(alias)
+    executor = MigrationExecutor(connection)
+    graph = executor.loader.graph
+
+    # Plan from the deployed migrations, not the ones applied locally.
+    deployed = set()
+    if deployment:
+        deployed = {tuple(name.split(".", 1)) for name in deployment["migrations"]}
+    executor.loader.applied_migrations = {
+        key: graph.nodes[key] for key in deployed if key in graph.nodes
+    }
+    plan = executor.migration_plan(graph.leaf_nodes())
+
+    state = _get_applied_state(executor)
+    created_models = set()
+    migrations = []
+    for migration, _backwards in plan:
+        ops = []
+        for operation in migration.operations:
+            risk, reason = classify_operation(
+                operation, migration.app_label, state, created_models
+            )
+            ops.append(
+                {"description": operation.describe(), "risk": risk, "reason": reason}
+            )
+            _track_created_models(operation, migration.app_label, created_models)
+            operation.state_forwards(migration.app_label, state)
+
+        risk = _max_level([op["risk"] for op in ops])
+        sql = None
+        if connection and risk != "low":
+            sql = _collect_sql(executor, migration)
+
+        migrations.append(
+            {
+                "app_label": migration.app_label,
+                "name": migration.name,
+                "risk": risk,
+                "operations": ops,
+                "sql": sql,
+            }
+        )
+
+    return {
+        "baseline": "deployed" if deployment else "empty",
+        "deployed_at": deployment["timestamp"] if deployment else None,
+        "vendor": connections[alias].vendor,
+        "migrations": migrations,
+    }
+
+
+def get_migration_names():
+    """Get the name of every migration in the project, ie "blog.0001_initial".
+
+    This is what's recorded with a successful deployment.
+
+    Returns:
+        List[str]
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return sorted(f"{app_label}.{name}" for app_label, name in loader.graph.nodes)
+
+
+def get_last_deployment(runs):
+    """Get the last run that recorded the migrations it deployed.
+
+    Returns:
+        dict | None: The run, from the index of runs.
+    """
+    for run in reversed(runs):
+        if run.get("migrations") is not None:
+            return run
+    return None
+
+
+def describe_baseline(report):
+    """Describe which migrations the plan starts from.
+
+    Returns:
+        str
+    """
+    if report["baseline"] == "deployed":
+        return f"the migrations recorded as deployed on {report['deployed_at']}"
+    return "an empty database, because no deployment has been recorded"
+
+
+def get_connection(alias=DEFAULT_DB_ALIAS):
+    """Get a connection to the local database, for rendering SQL, without creating one.
+
+    Returns:
+        DatabaseWrapper | None: None if the database doesn't exist or can't be reached.
+    """
+    connection = connections[alias]
+    if connection.vendor == "sqlite":
+        name = str(connection.settings_dict["NAME"])
+        if name == ":memory:" or "mode=memory" in name or not Path(name).exists():
+            return None
+
+    try:
+        connection.ensure_connection()
+    except DatabaseError:
+        return None
+    return connection
+
+
+def classify_operation(operation, app_label, state, created_models):
+    """Classify a single operation, given the model state before it runs.
+
+    Returns:
+        Tuple[str, str]: Risk level, and the reason for it.
+    """
+    if isinstance(operation, operations.SeparateDatabaseAndState):
+        results = [
+            classify_operation(op, app_label, state, created_models)
+            for op in operation.database_operations
+        ]
+        if not results:
+            return "low", "Only changes model state."
+        return max(results, key=lambda r: RISK_LEVELS.index(r[0]))
+
+    if isinstance(operation, operations.RunPython):
+        return "high", "Runs arbitrary code, which may scan or update whole tables."
+    if isinstance(operation, operations.RunSQL):
+        return "high", "Runs raw SQL, which can't be analyzed."
+
+    if isinstance(operation, operations.CreateModel):
+        return "low", "Creates a new table."
+    if isinstance(operation, STATE_ONLY_OPERATIONS):
+        return "low", "Only changes model state."
+    if isinstance(operation, operations.DeleteModel):
+        return "medium", "Drops a table; code that's still running may use it."
+
+    model_name = getattr(operation, "model_name", None) or getattr(
+        operation, "name", None
+    )
+    if model_name and (app_label, model_name.lower()) in created_models:
+        return "low", "The table is created earlier in this plan, so it's empty."
+
+    if isinstance(operation, operations.AddField):
+        return _classify_add_field(operation.field)
+    if isinstance(operation, operations.AlterField):
+        old_field = _get_field(state, app_label, operation.model_name, operation.name)
+        return _classify_alter_field(old_field, operation.field)
+    if isinstance(operation, operations.RemoveField):
+        return "medium", "Drops a column; code that's still running may use it."
+    if isinstance(operation, (operations.RenameField, operations.RenameModel)):
+        return (
+            "medium",
+            "Renames in place; code that's still running uses the old name.",
+        )
+
+    if isinstance(operation, operations.AddIndex):
+        if type(operation).__name__ == "AddIndexConcurrently":
+            return "low", "Builds an index without blocking writes."
+        return "high", "Builds an index, blocking writes to the table until it's done."
+    if isinstance(
+        operation, (operations.AlterUniqueTogether, operations.AlterIndexTogether)
+    ):
+        return "high", "Builds an index, blocking writes to the table until it's done."
+    if isinstance(operation, operations.AddConstraint):
+        if isinstance(operation.constraint, UniqueConstraint):
+            return "high", "Builds a unique index, blocking writes until it's done."
+        if isinstance(operation.constraint, CheckConstraint):
+            return "medium", "Checks every existing row while holding a lock."
+        return "medium", "Adds a constraint that may need to check every row."
+    if isinstance(operation, (operations.RemoveIndex, operations.RemoveConstraint)):
+        return "low", "Drops an index or constraint."
+    if isinstance(operation, operations.AlterModelTable):
+        return (
+            "medium",
+            "Renames a table; code that's still running uses the old name.",
+        )
+
+    return "medium", f"{type(operation).__name__} isn't recognized."
+
+
+def get_max_risk(report):
+    """Get the highest risk level of any unapplied migration.
+
+    Returns:
+        str | None: None if there are no unapplied migrations.
+    """
+    if not report["migrations"]:
+        return None
+    return _max_level([m["risk"] for m in report["migrations"]])
+
+
+def exceeds(risk, max_risk):
+    """Check whether a risk level is above the allowed level."""
+    if risk is None:
+        return False
+    return RISK_LEVELS.index(risk) > RISK_LEVELS.index(max_risk)
+
+
+def format_report(report):
+    """Format a migration risk report for output.
+
+    Returns:
+        str
+    """
+    lines = [f"\n  Compared with {describe_baseline(report)}."]
+    if not report["migrations"]:
+        lines.append("  No unapplied migrations.")
+        return "\n".join(lines)
+
+    for migration in report["migrations"]:
+        label = f"{migration['app_label']}.{migration['name']}"
+        lines.append(f"\n  {label}: {migration['risk']} risk")
+        for op in migration["operations"]:
+            lines.append(f"    [{op['risk']:>6}] {op['description']}")
+            if op["risk"] != "low":
+                lines.append(f"             {op['reason']}")
+        if migration["sql"]:
+            lines.append(f"    SQL ({report['vendor']}):")
+            lines += [f"      {line}" for line in migration["sql"]]
+
+    return "\n".join(lines)
+
+
+# --- Helper functions ---
+
+
+def _classify_add_field(field):
+    """Classify adding a field to a table that may already have rows."""
+    if field.unique or field.db_index or isinstance(field, ForeignKey):
+        return (
+            "high",
+            "Adds an indexed column, blocking writes until the index is built.",
+        )
+
+    has_default = field.has_default() or (
+        getattr(field, "db_default", NOT_PROVIDED) is not NOT_PROVIDED
+    )
+    if not field.null and has_default:
+        return (
+            "medium",
+            "Adds a column with a default, which rewrites the table on some databases.",
+        )
+    return "low", "Adds a nullable column."
+
+
+def _classify_alter_field(old_field, new_field):
+    """Classify changing a field, by comparing it to the field it replaces."""
+    if old_field is None:
+        return "medium", "Alters a field that couldn't be found in the model state."
+
+    if type(old_field) is not type(new_field):
+        return "high", "Changes the column type, which rewrites the table."
+    for attr in ("max_length", "max_digits", "decimal_places"):
+        if getattr(old_field, attr, None) != getattr(new_field, attr, None):
+            return "high", "Changes the column type, which may rewrite the table."
+    if new_field.unique and not old_field.unique:
+        return "high", "Adds a unique index, blocking writes until it's built."
+    if new_field.db_index and not old_field.db_index:
+        return "high", "Builds an index, blocking writes to the table until it's done."
+    if old_field.null and not new_field.null:
+        return "medium", "Adds NOT NULL, which checks every row while holding a lock."
+    return "low", "Doesn't change the column's storage."
+
+
+def _get_applied_state(executor):
+    """Build the model state after all applied migrations, as the executor does."""
+    state = ProjectState(real_apps=executor.loader.unmigrated_apps)
+    applied = executor.loader.applied_migrations
+    if not applied:
+        return state
+
+    full_plan = executor.migration_plan(
+        executor.loader.graph.leaf_nodes(), clean_start=True
+    )
+    for migration, _backwards in full_plan:
+        if (migration.app_label, migration.name) in applied:
+            state = migration.mutate_state(state, preserve=False)
+    return state
+
+
+def _get_field(state, app_label, model_name, field_name):
+    """Get a field from the model state, or None if it's not there."""
+    try:
+        return state.models[app_label, model_name.lower()].fields[field_name]
+    except KeyError:
+        return None
+
+
+def _track_created_models(operation, app_label, created_models):
+    """Record models whose tables are created by this plan."""
+    if isinstance(operation, operations.CreateModel):
+        created_models.add((app_label, operation.name_lower))
+    elif isinstance(operation, operations.RenameModel):
+        if (app_label, operation.old_name_lower) in created_models:
+            created_models.add((app_label, operation.new_name_lower))
+
+
+def _collect_sql(executor, migration):
+    """Get the SQL for a migration, as `sqlmigrate` shows it.
+
+    Returns:
+        List[str] | None: None if the SQL can't be generated.
+    """
+    try:
+        return executor.loader.collect_sql([(migration, False)])
+    except Exception:
+        # Some operations can't be rendered as SQL without running earlier
+        # migrations, ie RunPython that's needed by a later operation.
+        return None
+
+
+def _max_level(levels):
+    """Get the highest of several risk levels."""
+    return max(levels, key=RISK_LEVELS.index, default="low")
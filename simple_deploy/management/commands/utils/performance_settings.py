@@ -0,0 +1,196 @@
+"""Generate performance-related settings for a production deployment.
+
+Plugins write their own platform-specific settings block, but the settings that
+affect performance are mostly the same on every platform. This module is core's
+default implementation of the simple_deploy_get_performance_settings() hook. It's
+registered with trylast=True, so a plugin can provide its own implementation, and
+fall back to this one by returning None.
+
+The block is built from what inspecting the project discovered: the current
+requirements, and the project's current settings. Settings the project already
+configures are left alone. The block is meant to go at the end of a plugin's
+settings block, after DATABASES and MIDDLEWARE have been configured for production.
+
+Values from the project's settings are written with repr(), so the block is valid
+Python whatever types they hold.
+"""
+
+from django.conf import settings
+
+from simple_deploy import hookimpl
+from .plugin_utils import sd_config
+
+
+GZIP_MIDDLEWARE = "django.middleware.gzip.GZipMiddleware"
+SECURITY_MIDDLEWARE = "django.middleware.security.SecurityMiddleware"
+WHITENOISE_MIDDLEWARE = "whitenoise.middleware.WhiteNoiseMiddleware"
+
+CACHED_LOADER = "django.template.loaders.cached.Loader"
+DEFAULT_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+# Packages that mean the project has a Redis client available.
+REDIS_PACKAGES = ("redis", "django-redis", "hiredis")
+
+
+@hookimpl(trylast=True)
+def simple_deploy_get_performance_settings():
+    """Core's default performance settings block."""
+    return build_settings_block(sd_config.requirements, settings)
+
+
+def build_settings_block(requirements, project_settings):
+    """Build a block of performance settings for settings.py.
+
+    project_settings is the project's current settings, usually django.conf.settings.
+
+    Returns:
+        str: Settings block, starting with a comment line.
+    """
+    requirements = [r.lower() for r in requirements or []]
+
+    sections = [
+        _get_db_connection_settings(),
+        _get_template_loader_settings(project_settings),
+        _get_storage_settings(requirements, project_settings),
+        _get_gzip_settings(requirements, project_settings),
+        _get_cache_settings(requirements, project_settings),
+    ]
+    sections = [section for section in sections if section]
+
+    lines = ["# Performance settings, added by simple_deploy."]
+    lines.append("import os")
+    for section in sections:
+        lines.append("")
+        lines += section
+
+    return "\n".join(lines) + "\n"
+
+
+# --- Helper functions ---
+
+
+def _get_db_connection_settings():
+    """Keep db connections open between requests, and check them before reuse.
+
+    Connection settings are set per database. They're set at runtime, so they apply
+    to the DATABASES setting the plugin's block defines. SQLite connections are
+    cheap to open, so they're left alone.
+    """
+    return [
+        "# Reuse db connections across requests, and check them before reuse.",
+        "for _db in DATABASES.values():",
+        '    if not _db.get("ENGINE", "").endswith("sqlite3"):',
+        '        _db["CONN_MAX_AGE"] = 600',
+        '        _db["CONN_HEALTH_CHECKS"] = True',
+    ]
+
+
+def _get_template_loader_settings(project_settings):
+    """Wrap any explicitly configured template loaders in the cached loader.
+
+    Django uses the cached loader automatically when no loaders are specified, so
+    this only matters for projects that set their own loaders.
+    """
+    lines = []
+    for index, backend in enumerate(project_settings.TEMPLATES):
+        loaders = backend.get("OPTIONS", {}).get("loaders")
+        if not loaders or _uses_cached_loader(loaders):
+            continue
+
+        if not lines:
+            lines.append("# Cache compiled templates.")
+        lines.append(
+            f'TEMPLATES[{index}]["OPTIONS"]["loaders"] = '
+            f"[[{CACHED_LOADER!r}, {list(loaders)!r}]]"
+        )
+
+    return lines
+
+
+def _uses_cached_loader(loaders):
+    """Check whether a loaders option already uses the cached loader."""
+    for loader in loaders:
+        name = loader[0] if isinstance(loader, (list, tuple)) else loader
+        if name == CACHED_LOADER:
+            return True
+    return False
+
+
+def _get_storage_settings(requirements, project_settings):
+    """Serve static files with hashed names, so they can be cached indefinitely.
+
+    Only the staticfiles alias is set. Any other storages the settings define are
+    kept, ie the default storage for user-uploaded files. If the settings don't
+    define STORAGES at all, the project's default storage is used.
+    """
+    storages = getattr(project_settings, "STORAGES", {})
+    staticfiles_backend = storages.get("staticfiles", {}).get("BACKEND", "")
+    if "Manifest" in staticfiles_backend:
+        return []
+
+    if "whitenoise" in requirements:
+        backend = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    else:
+        backend = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+
+    default_storage = storages.get(
+        "default", {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+    )
+
+    return [
+        "# Add a content hash to static filenames, so browsers can cache them.",
+        f'STORAGES = globals().get("STORAGES", {{"default": {default_storage!r}}})',
+        f'STORAGES["staticfiles"] = {{"BACKEND": "{backend}"}}',
+    ]
+
+
+def _get_gzip_settings(requirements, project_settings):
+    """Compress responses.
+
+    GZipMiddleware needs to run after any middleware that modifies the response
+    body, so it's placed just after SecurityMiddleware, or after WhiteNoise if the
+    project uses it. WhiteNoise compresses static files itself.
+    """
+    if GZIP_MIDDLEWARE in project_settings.MIDDLEWARE:
+        return []
+
+    lines = ["# Compress responses."]
+    if "whitenoise" in requirements:
+        anchor = WHITENOISE_MIDDLEWARE
+    elif SECURITY_MIDDLEWARE in project_settings.MIDDLEWARE:
+        anchor = SECURITY_MIDDLEWARE
+    else:
+        lines.append(f'MIDDLEWARE.insert(0, "{GZIP_MIDDLEWARE}")')
+        return lines
+
+    lines.append(f'if "{anchor}" in MIDDLEWARE:')
+    lines.append(f'    _index = MIDDLEWARE.index("{anchor}") + 1')
+    lines.append(f'    MIDDLEWARE.insert(_index, "{GZIP_MIDDLEWARE}")')
+    lines.append("else:")
+    lines.append(f'    MIDDLEWARE.insert(0, "{GZIP_MIDDLEWARE}")')
+    return lines
+
+
+def _get_cache_settings(requirements, project_settings):
+    """Use Redis as the cache backend, if the project has a Redis client.
+
+    The default local-memory cache is per-process, so it's only replaced when a
+    shared cache is available. A cache the project has configured is left alone.
+    """
+    default_cache = project_settings.CACHES.get("default", {})
+    if default_cache.get("BACKEND", DEFAULT_CACHE_BACKEND) != DEFAULT_CACHE_BACKEND:
+        return []
+
+    if not any(package in requirements for package in REDIS_PACKAGES):
+        return []
+
+    return [
+        "# Use a shared cache, when the platform provides Redis.",
+        'if os.environ.get("REDIS_URL"):',
+        "    CACHES = {",
+        '        "default": {',
+        '            "BACKEND": "django.core.cache.backends.redis.RedisCache",',
+        '            "LOCATION": os.environ["REDIS_URL"],',
+        "        }",
+        "    }",
+    ]
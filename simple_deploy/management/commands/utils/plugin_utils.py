@@ -3,11 +3,17 @@
 Note: Some of these utilities are also used in core simple_deploy.
 """
 
+import json
 import logging
 import re
+import sys
 import subprocess
 import shlex
+import shutil
+import time
 import toml
+import requests
+from functools import cache
 from pathlib import Path
 
 from django.template.engine import Engine, Context
@@ -16,6 +22,13 @@ from django.utils.safestring import mark_safe
 from .. import sd_messages
 from .sd_config import SDConfig
 from .command_errors import SimpleDeployCommandError
+from . import capacity_planner
+from . import docker_context
+from . import redaction
+from . import sd_utils
+from . import toml_edit
+from . import wheelhouse
+from simple_deploy.plugins import pm
 
 
 # Create sd_config once right here. The attributes are set by simple_deploy,
@@ -23,6 +36,12 @@ from .command_errors import SimpleDeployCommandError
 # instance between core, plugins, and these utility functions.
 sd_config = SDConfig()
 
+# Dockerfile fragments for uv projects copy uv from this version of its image.
+UV_VERSION = "0.5"
+
+# The name at the start of a PEP 508 requirement, ie psycopg in "psycopg[binary]>=3".
+_requirement_name_re = re.compile(r"[A-Za-z0-9._-]+")
+
 
 def add_file(path, contents):
     """Add a new file to the project.
@@ -32,7 +51,8 @@ def add_file(path, contents):
     Dockerfile. See the `add_dockerfile()` method in Fly.io's deployer module.
 
     If the file does not exist, it is written to the project. If the file already
-    exists, the user is prompted for permission to overwrite the file.
+    exists, the user is prompted for permission to overwrite the file. With --watch,
+    nothing is overwritten, so there's no prompt.
 
     Returns:
     - None
@@ -44,15 +64,15 @@ def add_file(path, contents):
 
     write_output(f"\n  Looking in {path.parent} for {path.name}...")
 
-    if path.exists():
+    if not path_exists(path):
+        write_output(f"    File {path.name} not found. Generating file...")
+    elif sd_config.plan is None:
         proceed = get_confirmation(sd_messages.file_found(path.name))
         if not proceed:
             raise SimpleDeployCommandError(sd_messages.file_replace_rejected(path.name))
-    else:
-        write_output(f"    File {path.name} not found. Generating file...")
 
     # File does not exist, or we are free to overwrite it.
-    path.write_text(contents)
+    write_file(path, contents)
 
     msg = f"\n    Wrote {path.name} to {path}"
     write_output(msg)
@@ -72,12 +92,12 @@ def modify_file(path, contents):
     - SimpleDeployCommandError: If file does not exist.
     """
     # Make sure file exists.
-    if not path.exists():
+    if not path_exists(path):
         msg = f"File {path.as_posix()} does not exist."
         raise SimpleDeployCommandError(msg)
 
     # Rewrite file with new contents.
-    path.write_text(contents)
+    write_file(path, contents)
     msg = f"  Modified file: {path.as_posix()}"
     write_output(msg)
 
@@ -91,7 +111,7 @@ def modify_settings_file(template_path, context=None):
     if context is None:
         context = {}
     # Add current settings to context.
-    settings_string = sd_config.settings_path.read_text()
+    settings_string = read_file(sd_config.settings_path)
     safe_settings_string = mark_safe(settings_string)
     context["current_settings"] = safe_settings_string
 
@@ -101,6 +121,224 @@ def modify_settings_file(template_path, context=None):
     modify_file(sd_config.settings_path, modified_settings_string)
 
 
+def get_performance_settings():
+    """Get a block of performance-related settings for production.
+
+    Plugins can include this in their settings block, ie by passing it to
+    modify_settings_file() in the context. It should go after DATABASES and
+    MIDDLEWARE have been configured for production. Core provides a default
+    block; plugins can customize it by implementing
+    simple_deploy_get_performance_settings().
+
+    Returns:
+    - Str: Settings block, or an empty string if no implementation provides one.
+    """
+    settings_block = pm.hook.simple_deploy_get_performance_settings()
+    return mark_safe(settings_block or "")
+
+
+def get_worker_settings(cpus=None, memory_mb=None, profile=None):
+    """Size app server workers for the target instance.
+
+    The instance size and workload profile default to the values from the plugin
+    config. Memory per worker is measured by booting the project's WSGI application
+    in a new process. With --watch, it's only measured the first time the changes are
+    planned.
+
+    The result can be added to the context passed to get_template_string(), ie for a
+    Procfile or Dockerfile:
+        gunicorn blog.wsgi --workers {{ workers }} --threads {{ threads }}
+            --max-requests {{ max_requests }}
+            --max-requests-jitter {{ max_requests_jitter }}
+
+    Returns:
+    - Dict: workers, threads, max_requests, and max_requests_jitter, plus the
+      values they were based on.
+    """
+    from django.conf import settings
+
+    write_output("\nSizing app server workers...")
+    if sd_config.plan is None or sd_config.worker_rss_mb is None:
+        sd_config.worker_rss_mb = capacity_planner.measure_worker_rss(
+            sd_config.project_root, settings.SETTINGS_MODULE
+        )
+    worker_rss_mb = sd_config.worker_rss_mb
+    if worker_rss_mb is None:
+        write_output("  Could not measure memory per worker; using a default value.")
+
+    plan = capacity_planner.plan_workers(
+        cpus=cpus or sd_config.instance_cpus,
+        memory_mb=memory_mb or sd_config.instance_memory_mb,
+        worker_rss_mb=worker_rss_mb,
+        profile=profile or sd_config.workload_profile,
+    )
+    write_output(capacity_planner.format_plan(plan))
+    return plan
+
+
+def add_dockerignore(context_dir=None):
+    """Add or update .dockerignore, to keep the Docker build context small.
+
+    Files tracked by Git are always kept in the build context. Untracked virtual
+    environments, local media, simple_deploy_logs/, .git/, and other large untracked
+    directories are left out. Entries in an existing .dockerignore file are kept.
+
+    The build context defaults to the project root, which is where plugins usually
+    write the Dockerfile.
+
+    Returns:
+    - Dict: Analysis of the build context, including projected sizes before and
+      after the new entries.
+    """
+    from django.conf import settings
+
+    if context_dir is None:
+        context_dir = sd_config.project_root
+    path = context_dir / ".dockerignore"
+
+    write_output(f"\n  Looking in {context_dir} for .dockerignore...")
+    analysis = docker_context.analyze_context(
+        context_dir, media_root=getattr(settings, "MEDIA_ROOT", None)
+    )
+
+    if not analysis["new_patterns"]:
+        write_output("    No new entries needed in .dockerignore.")
+    else:
+        contents = read_file(path) if path_exists(path) else ""
+        write_file(
+            path, docker_context.merge_dockerignore(contents, analysis["new_patterns"])
+        )
+        if contents:
+            write_output(f"    Added entries to {path.as_posix()}:")
+        else:
+            write_output(f"    Wrote .dockerignore to {path.as_posix()}, ignoring:")
+
+    write_output(docker_context.format_report(analysis))
+    return analysis
+
+
+def get_dockerfile_fragments(context=None):
+    """Get Dockerfile fragments that make good use of Docker's layer cache.
+
+    The builder fragment copies only the dependency manifests for the package manager
+    in use, and builds wheels with a BuildKit cache mount for pip. The runtime
+    fragment installs those wheels into a slim image, and then copies the project. A
+    code change only rebuilds the final layer.
+
+    Plugins can include these in their own Dockerfile templates, ie:
+        {{ builder }}
+
+        {{ runtime }}
+        CMD gunicorn ...
+
+    Context values are passed to the fragment templates. python_version defaults to
+    the local Python version.
+
+    For uv projects, the builder fragment runs `uv sync` into a virtual environment
+    instead, with --frozen when uv.lock includes every requirement, and the runtime
+    fragment copies that environment.
+
+    Projects that use a lock file install from it. Requirements that aren't in the
+    lock file yet, such as packages deploy has added, are resolved during the build
+    without changing any locked version; the project's lock file isn't changed. If
+    there's no lock file, the builder fragment locks dependencies from the manifest
+    during the build.
+
+    If a wheelhouse has been built, ie with --build-wheelhouse, the builder fragment
+    copies the wheelhouse instead, and nothing is resolved or downloaded remotely.
+    The runtime fragment then leaves the wheelhouse out of the runtime image.
+
+    Returns:
+    - Dict: builder, runtime, and dockerfile, which is both fragments joined.
+    """
+    unlocked_requirements = _get_unlocked_requirements()
+    fragment_context = {
+        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "poetry_deploy_group": _check_poetry_deploy_group_exists(),
+        "uv_deploy_group": _check_uv_deploy_group_exists(),
+        "uv_version": UV_VERSION,
+        "locked": _check_lock_file_exists(),
+        # Shell-quoted, and marked safe so specifiers such as < aren't escaped.
+        "unlocked_requirements": mark_safe(shlex.join(unlocked_requirements)),
+    }
+    fragment_context.update(context or {})
+
+    fragments_dir = Path(__file__).parents[3] / "templates" / "dockerfile_fragments"
+    builder_path = fragments_dir / f"builder_{sd_config.pkg_manager}.dockerfile"
+    runtime_path = fragments_dir / "runtime.dockerfile"
+
+    # With a wheelhouse, the builder stage copies wheels instead of downloading them.
+    # Rebuild it first, in case the plugin has added requirements since it was built.
+    if sd_config.wheelhouse_path:
+        build_wheelhouse(python_version=fragment_context["python_version"])
+        wheelhouse_dir = sd_config.wheelhouse_path.relative_to(sd_config.project_root)
+        fragment_context["wheelhouse_dir"] = wheelhouse_dir.as_posix()
+        builder_path = fragments_dir / "builder_wheelhouse.dockerfile"
+    elif sd_config.pkg_manager == "uv":
+        # uv installs into a virtual environment, which the runtime stage copies.
+        runtime_path = fragments_dir / "runtime_uv.dockerfile"
+
+    builder = get_template_string(builder_path, fragment_context)
+    runtime = get_template_string(runtime_path, fragment_context)
+    return {
+        "builder": mark_safe(builder),
+        "runtime": mark_safe(runtime),
+        "dockerfile": mark_safe(f"{builder}\n{runtime}"),
+    }
+
+
+def build_wheelhouse(python_version=None, platforms=None):
+    """Build a wheelhouse of the project's current requirements.
+
+    Requirements are read from the project's requirements file, so packages the
+    plugin has added are included. They're resolved for the target platform, and
+    downloaded into a cache shared across projects. If nothing has changed since
+    the last build, the existing wheelhouse is kept.
+
+    Returns:
+    - Path: The wheelhouse directory.
+
+    Raises:
+    - SimpleDeployCommandError: If the requirements can't be resolved or downloaded.
+    """
+    if python_version is None:
+        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    platforms = platforms or wheelhouse.DEFAULT_PLATFORMS
+    if sd_config.wheelhouse_path is None:
+        sd_config.wheelhouse_path = (
+            sd_config.project_root / "simple_deploy_build" / "wheelhouse"
+        )
+    wheelhouse_dir = sd_config.wheelhouse_path
+
+    specs = wheelhouse.pin_requirements(_read_requirements(), _get_locked_versions())
+    fingerprint_path = wheelhouse_dir / ".fingerprint"
+    fingerprint = json.dumps([specs, python_version, platforms])
+    if fingerprint_path.exists() and fingerprint_path.read_text() == fingerprint:
+        write_output("\n  Wheelhouse is up to date.")
+        return wheelhouse_dir
+
+    write_output("\nBuilding wheelhouse...")
+    try:
+        wheels = wheelhouse.resolve(specs, python_version, platforms)
+        write_output(f"  Resolved {len(wheels)} packages for Python {python_version}.")
+
+        cache_dir = wheelhouse.get_cache_dir() / f"py{python_version}-{platforms[0]}"
+        results = wheelhouse.fetch_wheels(wheels, cache_dir)
+    except (RuntimeError, requests.RequestException) as e:
+        raise SimpleDeployCommandError(sd_messages.wheelhouse_failed(e))
+
+    cached_paths = [path for path, _ in results]
+    num_cached = sum(1 for _, was_cached in results if was_cached)
+    wheelhouse.populate_wheelhouse(wheelhouse_dir, cached_paths, wheels)
+    fingerprint_path.write_text(fingerprint)
+
+    msg = f"  Downloaded {len(results) - num_cached} wheel(s),"
+    msg += f" reused {num_cached} cached wheel(s)."
+    msg += f"\n  Wrote wheelhouse to {wheelhouse_dir.as_posix()}"
+    write_output(msg)
+    return wheelhouse_dir
+
+
 def add_dir(path):
     """Write a new directory to the file.
 
@@ -115,11 +353,15 @@ def add_dir(path):
     """
     write_output(f"\n  Looking for {path.as_posix()}...")
 
-    if path.exists():
+    if path_exists(path):
         write_output(f"    Found {path.as_posix()}")
+    elif sd_config.plan is not None:
+        sd_config.plan[path] = None
+        write_output(f"    Planned new directory: {path.as_posix()}")
     else:
         path.mkdir()
         write_output(f"    Added new directory: {path.as_posix()}")
+    track_path(path)
 
 
 def get_numbered_choice(prompt, valid_choices, quit_message):
@@ -157,9 +399,12 @@ def get_numbered_choice(prompt, valid_choices, quit_message):
         return selection
 
 
-def run_quick_command(cmd, check=False, skip_logging=False):
+def run_quick_command(cmd, check=False, skip_logging=False, cwd=None):
     """Run a command that should finish quickly.
 
+    The command can be a string, or a list of arguments. Pass a list when arguments
+    may contain spaces, ie file paths. The command runs in cwd, if it's passed.
+
     Commands that should finish quickly can be run more simply than commands that
     will take a long time. For quick commands, we can capture output and then deal
     with it however we like, and the user won't notice that we first captured
@@ -178,13 +423,14 @@ def run_quick_command(cmd, check=False, skip_logging=False):
         instead of returning a CompletedProcess instance with an error code set.
     """
     if not skip_logging:
-        log_info(f"\n{cmd}")
+        cmd_str = cmd if isinstance(cmd, str) else shlex.join(cmd)
+        log_info(f"\n{cmd_str}")
 
     if sd_config.on_windows:
-        output = subprocess.run(cmd, shell=True, capture_output=True)
+        output = subprocess.run(cmd, shell=True, capture_output=True, cwd=cwd)
     else:
-        cmd_parts = shlex.split(cmd)
-        output = subprocess.run(cmd_parts, capture_output=True, check=check)
+        cmd_parts = shlex.split(cmd) if isinstance(cmd, str) else cmd
+        output = subprocess.run(cmd_parts, capture_output=True, check=check, cwd=cwd)
 
     return output
 
@@ -194,6 +440,10 @@ def run_slow_command(cmd, skip_logging=False):
 
     For commands that may take a while, we need to stream output to the user, rather
     than just capturing it. Otherwise, the command will appear to hang.
+
+    Secrets are redacted from the streamed output, unless skip_logging is passed. The
+    output is redacted as one stream, so a private key that spans several lines is
+    still hidden.
     """
 
     # DEV: This only captures stderr right now.
@@ -208,6 +458,7 @@ def run_slow_command(cmd, skip_logging=False):
         log_info(f"\n{cmd}")
 
     cmd_parts = cmd.split()
+    redactor = None if skip_logging else redaction.Redactor()
     with subprocess.Popen(
         cmd_parts,
         stderr=subprocess.PIPE,
@@ -216,7 +467,12 @@ def run_slow_command(cmd, skip_logging=False):
         shell=sd_config.use_shell,
     ) as p:
         for line in p.stderr:
-            write_output(line, skip_logging=skip_logging)
+            if redactor:
+                line = redactor.feed(line)
+            if line:
+                write_output(line, skip_logging=skip_logging)
+    if redactor and (rest := redactor.flush()):
+        write_output(rest)
 
     if p.returncode != 0:
         raise subprocess.CalledProcessError(p.returncode, p.args)
@@ -276,7 +532,7 @@ def check_settings(platform_name, start_line, msg_found, msg_cant_overwrite):
         SimpleDeployCommandError: If we can't overwrite existing platform-specific
         settings block.
     """
-    settings_text = sd_config.settings_path.read_text()
+    settings_text = read_file(sd_config.settings_path)
 
     re_platform_settings = f"(.*)({start_line})(.*)"
     m = re.match(re_platform_settings, settings_text, re.DOTALL)
@@ -285,12 +541,13 @@ def check_settings(platform_name, start_line, msg_found, msg_cant_overwrite):
         log_info(f"No {platform_name}-specific settings block found.")
         return
 
-    # A platform-specific settings block exists. Get permission to overwrite it.
-    if not get_confirmation(msg_found):
+    # A platform-specific settings block exists. Get permission to overwrite it, unless
+    # only planning changes.
+    if sd_config.plan is None and not get_confirmation(msg_found):
         raise SimpleDeployCommandError(msg_cant_overwrite)
 
     # Platform-specific settings exist, but we can remove them and start fresh.
-    sd_config.settings_path.write_text(m.group(1))
+    write_file(sd_config.settings_path, m.group(1))
 
     msg = f"  Removed existing {platform_name}-specific settings block."
     write_output(msg)
@@ -307,13 +564,20 @@ def write_output(output, write_to_console=True, skip_logging=False):
     skip_logging has been passed. This is useful, for example, when writing
     sensitive information to the console.
 
+    Secrets are redacted from output on the console as well as in the log. Output
+    passed with skip_logging is written to the console as it is, because the caller
+    has chosen to show it to the user.
+
     Returns:
         None
     """
     output_str = get_string_from_output(output)
 
     if write_to_console:
-        sd_config.stdout.write(output_str)
+        if skip_logging:
+            sd_config.stdout.write(output_str)
+        else:
+            sd_config.stdout.write(redaction.redact_output(output_str))
 
     if not skip_logging:
         log_info(output_str)
@@ -329,6 +593,11 @@ def log_info(output):
 def commit_changes():
     """Commit changes that have been made to the project.
 
+    Only paths written through these utility functions are staged, so unrelated
+    changes elsewhere in the repository stay out of the commit. Paths that are
+    gitignored, such as build output, are left out. Plugins that create or modify
+    files any other way should call track_path() for each of them.
+
     This should only be called when automate_all is being used.
     """
     if not sd_config.automate_all:
@@ -336,15 +605,66 @@ def commit_changes():
 
     write_output("  Committing changes...")
 
-    cmd = "git add ."
-    output = run_quick_command(cmd)
-    write_output(output)
+    paths = _drop_ignored_paths(_get_paths_to_stage())
+    if paths:
+        start = time.perf_counter()
+        cmd = ["git", "add", "--", *[path.as_posix() for path in paths]]
+        output = run_quick_command(cmd)
+        write_output(output)
+        elapsed = time.perf_counter() - start
+
+        staged_size = sd_utils.format_bytes(_get_size(paths))
+        msg = f"  Staged {len(paths)} path(s), {staged_size}, in {elapsed:.2f}s."
+        write_output(msg)
 
     cmd = 'git commit -m "Configured project for deployment."'
     output = run_quick_command(cmd)
     write_output(output)
 
 
+def track_path(path):
+    """Record a path that's been added or modified, so it's included in the commit.
+
+    Paths are tracked automatically when they're written through add_file(),
+    modify_file(), write_file(), add_dir(), modify_settings_file(), and add_package().
+    Directories are staged with everything in them.
+
+    Returns:
+    - None
+    """
+    sd_config.touched_paths.add(Path(path).resolve())
+
+
+def write_file(path, contents):
+    """Write a file, or add it to the plan if only planning changes.
+
+    With --watch, files aren't written. Their contents are kept in sd_config.plan, so
+    the changes can be shown, and shown again as the project changes. Plugins that
+    write files without add_file() or modify_file() should use this, and read_file(),
+    so their changes are included in the plan.
+
+    Returns:
+    - None
+    """
+    if sd_config.plan is not None:
+        sd_config.plan[path] = contents
+    else:
+        path.write_text(contents)
+    track_path(path)
+
+
+def read_file(path):
+    """Read a file, including any changes to it that have been planned."""
+    if sd_config.plan and sd_config.plan.get(path) is not None:
+        return sd_config.plan[path]
+    return path.read_text()
+
+
+def path_exists(path):
+    """Check if a path exists, or would exist once planned changes are made."""
+    return (sd_config.plan is not None and path in sd_config.plan) or path.exists()
+
+
 def add_packages(package_list):
     """Add a set of packages to the project's requirements.
 
@@ -367,6 +687,9 @@ def add_package(package_name, version=""):
     The utility helpers handle this version information correctly for the dependency
     management system in use.
 
+    The project's lock file isn't changed. Packages that aren't in the lock file yet
+    are added to it during the build; see get_dockerfile_fragments().
+
     Returns:
         None
     """
@@ -381,6 +704,8 @@ def add_package(package_name, version=""):
     elif sd_config.pkg_manager == "poetry":
         _check_poetry_deploy_group()
         add_poetry_pkg(sd_config.pyprojecttoml_path, package_name, version)
+    elif sd_config.pkg_manager == "uv":
+        add_uv_pkg(sd_config.pyprojecttoml_path, package_name, version)
     else:
         add_req_txt_pkg(sd_config.req_txt_path, package_name, version)
 
@@ -395,8 +720,7 @@ def get_template_string(template_path, context):
     Returns:
     - Str: single string representing contents of the rendered template.
     """
-    my_engine = Engine()
-    template = my_engine.from_string(template_path.read_text())
+    template = _get_template_engine().from_string(template_path.read_text())
     return template.render(Context(context))
 
 
@@ -413,6 +737,43 @@ def read_log():
 # --- Helper functions ---
 
 
+@cache
+def _get_template_engine():
+    """Get a template engine, shared by everything rendered in this process."""
+    return Engine()
+
+
+def _get_paths_to_stage():
+    """Get tracked paths that exist in the repository, in a stable order."""
+    git_root = sd_config.git_path.resolve()
+    paths = []
+    for path in sorted(sd_config.touched_paths):
+        if path.exists() and (path == git_root or git_root in path.parents):
+            paths.append(path)
+    return paths
+
+
+def _drop_ignored_paths(paths):
+    """Leave out paths that git ignores; `git add` refuses to stage them."""
+    if not paths:
+        return paths
+    cmd = ["git", "check-ignore", "--", *[path.as_posix() for path in paths]]
+    output = run_quick_command(cmd, cwd=sd_config.git_path)
+    ignored = set(output.stdout.decode().splitlines())
+    return [path for path in paths if path.as_posix() not in ignored]
+
+
+def _get_size(paths):
+    """Get the total size of files and directories, in bytes."""
+    total = 0
+    for path in paths:
+        if path.is_dir():
+            total += docker_context.get_dir_size(path)
+        else:
+            total += path.stat().st_size
+    return total
+
+
 def get_string_from_output(output):
     """Convert output to string.
 
@@ -443,19 +804,15 @@ def log_output_string(output):
     Returns:
         None
     """
+    # Each call is complete output, so nothing is carried over to the next call.
+    output = redaction.redact_output(output)
     for line in output.splitlines():
-        line = _strip_secret_key(line)
         logging.info(line)
 
 
 def _strip_secret_key(line):
-    """Strip secret key value from log file lines."""
-    if "SECRET_KEY =" in line:
-        new_line = line.split("SECRET_KEY")[0]
-        new_line += "SECRET_KEY = *value hidden*"
-        return new_line
-    else:
-        return line
+    """Strip secret key value, and any other secrets, from log file lines."""
+    return redaction.redact(line)
 
 
 def add_pipenv_pkg(pipfile_path, package, version):
@@ -465,15 +822,14 @@ def add_pipenv_pkg(pipfile_path, package, version):
     if not version:
         version = "*"
 
-    data = toml.load(pipfile_path)
-    data["packages"][package] = version
-    data_str = toml.dumps(data)
-    pipfile_path.write_text(data_str)
+    contents = read_file(pipfile_path)
+    contents = toml_edit.set_key(contents, "packages", package, version)
+    write_file(pipfile_path, contents)
 
 
 def _check_poetry_deploy_group():
     """Make sure a deploy group exists in pyproject.toml."""
-    pptoml_data = toml.load(sd_config.pyprojecttoml_path)
+    pptoml_data = toml.loads(read_file(sd_config.pyprojecttoml_path))
     try:
         deploy_group = pptoml_data["tool"]["poetry"]["group"]["deploy"]
     except KeyError:
@@ -482,20 +838,145 @@ def _check_poetry_deploy_group():
         write_output(msg)
 
 
+def _read_requirements():
+    """Read the project's requirements from its requirements file.
+
+    sd_config.requirements is set before the plugin runs; this picks up any
+    packages that have been added since. Lines in requirements.txt are kept whole,
+    so any versions they specify are used.
+    """
+    if sd_config.pkg_manager == "pipenv":
+        return list(sd_utils.parse_pipfile(sd_config.pipfile_path))
+    elif sd_config.pkg_manager == "poetry":
+        return sd_utils.parse_pyproject_toml(sd_config.pyprojecttoml_path)
+    elif sd_config.pkg_manager == "uv":
+        # Dev groups aren't deployed, so only the deploy group is included.
+        return sd_utils.get_pep621_specs(sd_config.pyprojecttoml_path, ["deploy"])
+
+    lines = read_file(sd_config.req_txt_path).splitlines()
+    lines = [line.split("#")[0].strip() for line in lines]
+    # Skip blank lines, and options such as --index-url.
+    return [line for line in lines if line and not line.startswith("-")]
+
+
+def _get_locked_versions():
+    """Get the versions pinned in the project's lock file, if it has one uv reads.
+
+    Returns:
+        Dict[str, str]: Version of each package, by its normalized name.
+    """
+    if sd_config.pkg_manager != "uv" or not sd_config.uv_lock_path.exists():
+        return {}
+    return sd_utils.parse_uv_lock(sd_config.uv_lock_path)
+
+
+def _get_lock_path():
+    """Get the path to the project's lock file, whether it exists or not.
+
+    Returns:
+        Path | None: None for requirements.txt, which has no lock file.
+    """
+    if sd_config.pkg_manager == "pipenv":
+        return sd_config.pipfile_path.parent / "Pipfile.lock"
+    elif sd_config.pkg_manager == "poetry":
+        return sd_config.pyprojecttoml_path.parent / "poetry.lock"
+    elif sd_config.pkg_manager == "uv":
+        return sd_config.uv_lock_path
+    return None
+
+
+def _check_lock_file_exists():
+    """Check whether the project has a lock file that builds can install from."""
+    lock_path = _get_lock_path()
+    return lock_path is not None and path_exists(lock_path)
+
+
+def _get_unlocked_requirements():
+    """Get requirements in the manifest that aren't in the lock file yet.
+
+    Packages that deploy has added, or that were added without locking again, aren't
+    in the lock file. The builder fragment adds them during the build, without
+    changing any version that's already locked.
+
+    Returns:
+        List[str]: Requirements, ie "gunicorn" or "psycopg2<2.9". Empty if there's
+        no lock file.
+    """
+    if not _check_lock_file_exists():
+        return []
+    lock_path = _get_lock_path()
+
+    if sd_config.pkg_manager == "pipenv":
+        packages = toml.loads(read_file(sd_config.pipfile_path)).get("packages", {})
+        requirements = {
+            name: _get_pipfile_requirement(name, spec)
+            for name, spec in packages.items()
+        }
+        try:
+            locked = json.loads(read_file(lock_path)).get("default", {})
+        except ValueError:
+            locked = {}
+    elif sd_config.pkg_manager == "poetry":
+        pptoml_data = toml.loads(read_file(sd_config.pyprojecttoml_path))
+        poetry_data = pptoml_data["tool"]["poetry"]
+        dependencies = poetry_data.get("dependencies", {})
+        names = [name for name in dependencies if name != "python"]
+        for group in poetry_data.get("group", {}).values():
+            names += group.get("dependencies", {}).keys()
+        requirements = {name: name for name in names}
+        lock_data = toml.loads(read_file(lock_path))
+        locked = [package["name"] for package in lock_data.get("package", [])]
+    else:
+        pptoml_data = toml.loads(read_file(sd_config.pyprojecttoml_path))
+        reqs = pptoml_data.get("project", {}).get("dependencies", [])
+        reqs += pptoml_data.get("dependency-groups", {}).get("deploy", [])
+        requirements = {_requirement_name_re.match(req).group(): req for req in reqs}
+        locked = sd_utils.parse_uv_lock(lock_path)
+
+    locked = {sd_utils.normalize_name(name) for name in locked}
+    return [
+        requirement
+        for name, requirement in requirements.items()
+        if sd_utils.normalize_name(name) not in locked
+    ]
+
+
+def _get_pipfile_requirement(name, spec):
+    """Get a pip requirement from an entry in a Pipfile, ie psycopg2 = "<2.9"."""
+    if isinstance(spec, dict):
+        spec = spec.get("version", "*")
+    return name if spec == "*" else f"{name}{spec}"
+
+
+def _check_uv_deploy_group_exists():
+    """Check whether a uv project has a deploy dependency group."""
+    if sd_config.pkg_manager != "uv":
+        return False
+    pptoml_data = toml.loads(read_file(sd_config.pyprojecttoml_path))
+    return "deploy" in pptoml_data.get("dependency-groups", {})
+
+
+def _check_poetry_deploy_group_exists():
+    """Check whether a Poetry project has a deploy group."""
+    if sd_config.pkg_manager != "poetry":
+        return False
+    pptoml_data = toml.loads(read_file(sd_config.pyprojecttoml_path))
+    return "deploy" in pptoml_data["tool"]["poetry"].get("group", {})
+
+
 def create_poetry_deploy_group(pptoml_path):
-    """Create a deploy group for Poetry in pyproject.toml."""
-    pptoml_data = toml.load(pptoml_path)
+    """Create a deploy group for Poetry in pyproject.toml.
 
-    # Create Poetry group if needed.
-    if "group" not in pptoml_data["tool"]["poetry"]:
-        pptoml_data["tool"]["poetry"]["group"] = {}
+    The group is added after the project's other Poetry tables; the rest of the file
+    is left as it is.
+    """
+    contents = read_file(pptoml_path)
 
     # Create optional deploy group, and deploy group dependencies.
-    pptoml_data["tool"]["poetry"]["group"]["deploy"] = {"optional": True}
-    pptoml_data["tool"]["poetry"]["group"]["deploy"]["dependencies"] = {}
+    contents = toml_edit.set_key(contents, "tool.poetry.group.deploy", "optional", True)
+    contents = toml_edit.add_table(contents, "tool.poetry.group.deploy.dependencies")
 
-    pptoml_data_str = toml.dumps(pptoml_data)
-    pptoml_path.write_text(pptoml_data_str)
+    write_file(pptoml_path, contents)
 
 
 def add_poetry_pkg(pptoml_path, package, version):
@@ -506,15 +987,28 @@ def add_poetry_pkg(pptoml_path, package, version):
     if not version:
         version = "*"
 
-    pptoml_data = toml.load(pptoml_path)
-    pptoml_data["tool"]["poetry"]["group"]["deploy"]["dependencies"][package] = version
+    contents = read_file(pptoml_path)
+    table = "tool.poetry.group.deploy.dependencies"
+    contents = toml_edit.set_key(contents, table, package, version)
 
-    pptoml_data_str = toml.dumps(pptoml_data)
-    pptoml_path.write_text(pptoml_data_str)
+    write_file(pptoml_path, contents)
+
+
+def add_uv_pkg(pptoml_path, package, version):
+    """Add a package to the deploy dependency group of pyproject.toml, for uv.
+
+    The group is defined in [dependency-groups], as described in PEP 735. uv.lock
+    isn't changed; the builder fragment adds the package to the lock during the build.
+    """
+    contents = read_file(pptoml_path)
+    contents = toml_edit.add_to_array(
+        contents, "dependency-groups", "deploy", f"{package}{version}"
+    )
+    write_file(pptoml_path, contents)
 
 
 def add_req_txt_pkg(req_txt_path, package, version):
     """Add a package to requirements.txt."""
-    contents = req_txt_path.read_text()
+    contents = read_file(req_txt_path)
     pkg_string = f"\n{package + version}"
-    req_txt_path.write_text(contents + pkg_string)
+    write_file(req_txt_path, contents + pkg_string)
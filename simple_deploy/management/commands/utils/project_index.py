@@ -0,0 +1,316 @@
+"""Find the Django projects in a repository, and keep an index of them.
+
+A repository can hold many Django projects, or services, each with its own manage.py,
+settings module, and dependency manifest. The repository is walked once, and what's
+found is written to simple_deploy_logs/project_index.json at the root of the
+repository. That lets later runs target a service by name without walking the
+repository again.
+
+The index also records the mtime of every directory that was walked, and of every
+manage.py. Adding, removing, or renaming a file changes the mtime of its directory, so
+if none of those have changed, the index is still accurate. Checking them takes a stat()
+call per directory, which is much cheaper than listing every directory.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import toml
+
+
+INDEX_VERSION = 1
+
+# Directories that never hold a project we'd deploy, and can be large.
+PRUNED_DIRS = {
+    "node_modules",
+    "__pycache__",
+    "site-packages",
+    "simple_deploy_logs",
+    "simple_deploy_build",
+}
+
+# Dependency manifests, in the order deploy prefers them.
+MANIFESTS = ("Pipfile", "pyproject.toml", "requirements.txt")
+
+# Sections that make a pyproject.toml file a dependency manifest. Many pyproject.toml
+# files only configure tools, ie black or pytest.
+PYPROJECT_MANIFEST_KEYS = [
+    ("tool", "poetry"),
+    ("project", "dependencies"),
+    ("tool", "uv"),
+    ("dependency-groups",),
+]
+
+# The settings module manage.py points to, ie:
+#   os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog.settings")
+SETTINGS_MODULE_RE = re.compile(
+    r"""DJANGO_SETTINGS_MODULE['"]\s*,\s*['"]([\w.]+)['"]"""
+)
+
+
+def get_index_path(repo_root):
+    """Get the path to the index file for a repository."""
+    return Path(repo_root) / "simple_deploy_logs" / "project_index.json"
+
+
+def get_services(repo_root, rescan=False):
+    """Get every Django project in the repository.
+
+    The saved index is used if it's still accurate. Otherwise the repository is walked,
+    and the index is rewritten.
+
+    Returns:
+        Tuple[List[dict], bool]: Services, and whether the repository was walked.
+    """
+    repo_root = Path(repo_root)
+    index_path = get_index_path(repo_root)
+    if not rescan:
+        services = load_index(index_path, repo_root)
+        if services is not None:
+            return services, False
+
+    # Make the log dir before walking, so making it doesn't change the root's mtime.
+    index_path.parent.mkdir(exist_ok=True)
+    services, stamps = discover(repo_root)
+    index = {"version": INDEX_VERSION, "services": services, "stamps": stamps}
+    index_path.write_text(json.dumps(index, indent=2))
+    return services, True
+
+
+def load_index(index_path, repo_root):
+    """Load the saved index, if it's still accurate.
+
+    Returns:
+        List[dict] | None: Services, or None if the repository needs to be walked.
+    """
+    try:
+        index = json.loads(Path(index_path).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return None
+
+    for rel_path, mtime_ns in index["stamps"].items():
+        try:
+            if os.stat(Path(repo_root) / rel_path).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    return index["services"]
+
+
+def discover(repo_root):
+    """Walk the repository, and find every manage.py and its settings module.
+
+    Hidden directories, virtual environments, and the directories in PRUNED_DIRS are
+    skipped.
+
+    Returns:
+        Tuple[List[dict], Dict[str, int]]: Services, sorted by path, and the mtime of
+        each directory that was walked, and each manage.py.
+    """
+    repo_root = Path(repo_root)
+    services, stamps = [], {}
+    for dir_path, dir_names, file_names in os.walk(repo_root):
+        dir_path = Path(dir_path)
+        stamps[_get_rel_path(dir_path, repo_root)] = os.stat(dir_path).st_mtime_ns
+        dir_names[:] = sorted(
+            name for name in dir_names if not _is_pruned(dir_path / name)
+        )
+
+        if "manage.py" in file_names:
+            manage_path = dir_path / "manage.py"
+            stamps[_get_rel_path(manage_path, repo_root)] = os.stat(
+                manage_path
+            ).st_mtime_ns
+            service = _get_service(manage_path, repo_root)
+            if service:
+                services.append(service)
+
+    _assign_names(services)
+    return services, stamps
+
+
+def find_manifest_dir(project_root, repo_root):
+    """Find the nearest dir with a dependency manifest, from project_root up.
+
+    A pyproject.toml file that doesn't list dependencies is skipped. The search stops
+    at the root of the repository.
+
+    Returns:
+        Path | None: Directory holding the manifest, or None if there isn't one.
+    """
+    project_root, repo_root = Path(project_root), Path(repo_root)
+    for path in [project_root, *project_root.parents]:
+        if any(_is_manifest(path / name) for name in MANIFESTS):
+            return path
+        if path == repo_root:
+            break
+    return None
+
+
+def find_venv_python(service_root, repo_root):
+    """Find the python of the virtual environment a service runs in.
+
+    The nearest virtual environment from service_root up is used. The search stops at
+    the root of the repository.
+
+    Returns:
+        Path | None: None if there's no virtual environment.
+    """
+    service_root, repo_root = Path(service_root), Path(repo_root)
+    if os.name == "nt":
+        python_path = Path("Scripts") / "python.exe"
+    else:
+        python_path = Path("bin") / "python"
+
+    for path in [service_root, *service_root.parents]:
+        for child in sorted(path.iterdir()):
+            if (child / "pyvenv.cfg").exists() and (child / python_path).exists():
+                return child / python_path
+        if path == repo_root:
+            break
+    return None
+
+
+def find_service(services, name):
+    """Find a service by its name, or by its path in the repository.
+
+    Returns:
+        dict | None
+    """
+    name = name.strip("/") or "."
+    for service in services:
+        if name in (service["name"], service["path"]):
+            return service
+    return None
+
+
+def format_services(services):
+    """Format the services for the console."""
+    if not services:
+        return "  No Django projects found."
+
+    rows = [("Service", "Path", "Settings", "Dependencies")]
+    for service in services:
+        manifest = service["manifest"] or "(none found)"
+        rows.append(
+            (service["name"], service["path"], service["settings_module"], manifest)
+        )
+
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    lines = []
+    for row in rows:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        lines.append("  " + "  ".join([*cells, row[3]]))
+    return "\n".join(lines)
+
+
+def remove_option(argv, option):
+    """Remove an option that takes a value from a list of CLI args.
+
+    Handles both `--option value` and `--option=value`.
+    """
+    remaining = []
+    args = iter(argv)
+    for arg in args:
+        if arg == option:
+            next(args, None)
+        elif not arg.startswith(f"{option}="):
+            remaining.append(arg)
+    return remaining
+
+
+# --- Helper functions ---
+
+
+def _is_pruned(path):
+    """Check if a directory should be skipped while walking."""
+    if path.name.startswith(".") or path.name in PRUNED_DIRS:
+        return True
+    # Virtual environments, including ones with unusual names.
+    return (path / "pyvenv.cfg").exists()
+
+
+def _is_manifest(path):
+    """Check if a file lists a project's dependencies."""
+    if not path.exists():
+        return False
+    if path.name != "pyproject.toml":
+        return True
+
+    try:
+        data = toml.load(path)
+    except (OSError, toml.TomlDecodeError):
+        return False
+    for keys in PYPROJECT_MANIFEST_KEYS:
+        section = data
+        for key in keys:
+            section = section.get(key) if isinstance(section, dict) else None
+        if section is not None:
+            return True
+    return False
+
+
+def _get_service(manage_path, repo_root):
+    """Describe the project that a manage.py belongs to.
+
+    Returns:
+        dict | None: The service, or None if its settings module can't be found.
+    """
+    try:
+        m = SETTINGS_MODULE_RE.search(manage_path.read_text(errors="replace"))
+    except OSError:
+        return None
+    if not m:
+        return None
+
+    project_root = manage_path.parent
+    settings_module = m.group(1)
+    module_path = project_root.joinpath(*settings_module.split("."))
+    for settings_path in (
+        module_path.with_suffix(".py"),
+        module_path / "__init__.py",
+    ):
+        if settings_path.exists():
+            break
+    else:
+        return None
+
+    manifest = None
+    manifest_dir = find_manifest_dir(project_root, repo_root)
+    if manifest_dir:
+        name = next(name for name in MANIFESTS if _is_manifest(manifest_dir / name))
+        manifest = _get_rel_path(manifest_dir / name, repo_root)
+
+    return {
+        "name": "",
+        "path": _get_rel_path(project_root, repo_root),
+        "settings_module": settings_module,
+        "settings_path": _get_rel_path(settings_path, repo_root),
+        "manifest": manifest,
+    }
+
+
+def _assign_names(services):
+    """Name each service after its directory, or its path if that's ambiguous.
+
+    A project at the root of the repository is named after its settings package.
+    """
+    for service in services:
+        if service["path"] == ".":
+            service["name"] = service["settings_module"].split(".")[0]
+        else:
+            service["name"] = Path(service["path"]).name
+
+    names = [service["name"] for service in services]
+    for service in services:
+        if names.count(service["name"]) > 1:
+            service["name"] = service["path"]
+
+
+def _get_rel_path(path, repo_root):
+    """Get a path relative to the repository root, in posix form."""
+    return Path(os.path.relpath(path, repo_root)).as_posix()
@@ -32,16 +32,26 @@ class SDConfig:
         # Paths in user's local project.
         self.project_root = None
         self.git_path = None
+        # Where the project is in the repository, ie "." or "services/blog".
+        self.project_rel_path = None
         self.settings_path = None
         self.pipfile_path = None
         self.pyprojecttoml_path = None
+        self.uv_lock_path = None
         self.req_txt_path = None
+        self.static_build_dir = None
+        self.wheelhouse_path = None
+        self.touched_paths = set()
 
         # Aspects of user's deployment.
         self.deployed_project_name = ""
         self.log_output = None
         self.automate_all = None
         self.region = None
+        self.instance_cpus = None
+        self.instance_memory_mb = None
+        self.workload_profile = None
+        self.worker_rss_mb = None
 
         # Attributes needed by plugin utility functions.
         self.use_shell = None
@@ -49,6 +59,10 @@ class SDConfig:
         self.unit_testing = None
         self.stdout = None
 
+        # With --watch, files aren't written. Planned contents are kept here instead,
+        # by path, with None for directories. See plugin_utils.write_file().
+        self.plan = None
+
     def validate(self):
         """Make sure all required attributes have been defined."""
         if not self.pkg_manager:
@@ -5,6 +5,7 @@ Any utility used by plugins should be moved to plugin_utils.py.
 """
 
 from pathlib import Path
+from functools import cache
 import inspect, re, sys, subprocess, logging
 from importlib.metadata import packages_distributions
 
@@ -16,6 +17,13 @@ from .command_errors import SimpleDeployCommandError
 import toml
 
 
+_uv_lock_field_re = re.compile(r'^(name|version) = "([^"]*)"')
+
+# Entries deploy adds to .gitignore: the log dir, and the dir for build output from
+# --precompress-static and --build-wheelhouse.
+GITIGNORE_ENTRIES = ["simple_deploy_logs/", "simple_deploy_build/"]
+
+
 def validate_choice(choice, valid_choices):
     """Validate a choice made by the user."""
     if choice in valid_choices:
@@ -23,12 +31,32 @@ def validate_choice(choice, valid_choices):
     return False
 
 
+@cache
 def get_plugin_name():
-    """Get the name of the installed plugin."""
+    """Get the name of the installed plugin.
+
+    Finding the plugin means scanning every installed distribution, so the result is
+    cached for the life of the process.
+    """
     available_packages = packages_distributions().keys()
     return _get_plugin_name_from_packages(available_packages)
 
 
+def format_bytes(num_bytes):
+    """Format a byte count for people to read.
+
+    Returns:
+        str: ie "512 B", "1.5 KB", "230.2 MB"
+    """
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            if unit == "B":
+                return f"{num_bytes} {unit}"
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
 def parse_req_txt(path):
     """Get a list of requirements from a requirements.txt file.
 
@@ -102,6 +130,88 @@ def parse_pyproject_toml(path):
     return requirements
 
 
+def parse_pep621_pyproject(path):
+    """Get a list of requirements from a PEP 621 pyproject.toml, as used by uv.
+
+    Includes [project.dependencies], and every group in [dependency-groups], so a
+    package that's already in any group isn't added again. Groups that include other
+    groups are skipped, because those groups are listed on their own.
+
+    Returns:
+        List[str]: List of strings representing each requirement, without versions
+        or extras.
+    """
+    requirements = []
+    for spec in get_pep621_specs(path):
+        name = get_requirement_name(spec)
+        if name and name not in requirements:
+            requirements.append(name)
+    return requirements
+
+
+def get_pep621_specs(path, groups=None):
+    """Get the requirement specifiers from a PEP 621 pyproject.toml.
+
+    Args:
+        groups (List[str] | None): Dependency groups to include; None for all groups.
+
+    Returns:
+        List[str]: Specifiers from [project.dependencies], then from each group.
+    """
+    parsed_toml = toml.load(path)
+
+    specs = list(parsed_toml.get("project", {}).get("dependencies", []))
+    for name, group in parsed_toml.get("dependency-groups", {}).items():
+        if groups is None or name in groups:
+            specs += [spec for spec in group if isinstance(spec, str)]
+    return specs
+
+
+def get_requirement_name(spec):
+    """Get the package name from a PEP 508 specifier, ie "psycopg[binary]>=3.2"."""
+    m = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", spec)
+    return m.group(1) if m else None
+
+
+def normalize_name(name):
+    """Normalize a distribution name, as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_uv_lock(path):
+    """Get the locked version of each package in uv.lock.
+
+    Lock files for large projects can run to many thousands of lines, mostly wheel
+    URLs and hashes. Only the name and version lines at the top of each [[package]]
+    table are needed, so the file is read one line at a time, without parsing it as
+    TOML.
+
+    Returns:
+        Dict[str, str]: Version of each package, by its normalized name.
+    """
+    versions = {}
+    name = version = None
+    in_package = False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("[[package]]"):
+                name = version = None
+                in_package = True
+            elif line.startswith("["):
+                # Tables within a package, ie [package.metadata].
+                in_package = False
+            elif in_package:
+                m = _uv_lock_field_re.match(line)
+                if m and m.group(1) == "name":
+                    name = m.group(2)
+                elif m:
+                    version = m.group(2)
+                if name and version:
+                    versions[normalize_name(name)] = version
+                    in_package = False
+    return versions
+
+
 def check_status_output(status_output, diff_output):
     """Check output of `git status --porcelain` for uncommitted changes.
 
@@ -119,12 +229,8 @@ def check_status_output(status_output, diff_output):
     # Process untracked changes first.
     untracked_changes = [line for line in lines if line[0:2] == "??"]
 
-    if len(untracked_changes) > 1:
-        return False
-    if (
-        len(untracked_changes) == 1
-        and "simple_deploy_logs/" not in untracked_changes[0]
-    ):
+    # In a repository with several projects, there may be more than one log dir.
+    if any("simple_deploy_logs/" not in line for line in untracked_changes):
         return False
 
     # Process modified files.
@@ -190,13 +296,11 @@ def _check_gitignore_diff(diff_lines):
     if not lines:
         return True
 
-    # If there's more than one change to .gitignore, don't proceed.
-    if len(lines) > 1:
-        return False
-
-    # If the change is not adding simple_deploy, don't proceed.
-    if "simple_deploy_logs" not in lines[0]:
-        return False
+    # Only proceed if every change adds an entry that deploy adds itself.
+    entries = [entry.rstrip("/") for entry in GITIGNORE_ENTRIES]
+    for line in lines:
+        if line[0] != "+" or line[1:].strip().rstrip("/") not in entries:
+            return False
 
     return True
 
@@ -0,0 +1,218 @@
+"""Collect static files into a build dir, and precompress them.
+
+Servers such as WhiteNoise and nginx serve a precompressed file.css.gz or file.css.br
+alongside file.css, if the client accepts that encoding. Compressing ahead of time
+means the maximum compression level can be used, which would be too slow to do on
+every request.
+
+The build dir is kept between runs. collectstatic only copies files that have been
+modified, and a manifest of content hashes lets unchanged files skip compression.
+Compression runs in a process pool, because it's CPU-bound.
+
+Brotli output is only written if the brotli package is installed. Otherwise files are
+only gzipped, which every client supports.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from . import sd_utils
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Text-based formats compress well; images and fonts are already compressed.
+COMPRESSIBLE_EXTENSIONS = {
+    ".css",
+    ".js",
+    ".mjs",
+    ".map",
+    ".svg",
+    ".html",
+    ".txt",
+    ".json",
+    ".xml",
+    ".ico",
+    ".eot",
+    ".otf",
+    ".ttf",
+}
+
+# Small files aren't worth compressing; the headers cost more than they save.
+MIN_SIZE = 256
+
+# Only keep a compressed file if it's meaningfully smaller than the original.
+MIN_RATIO = 0.95
+
+MANIFEST_NAME = "precompress_manifest.json"
+
+
+def collect_static(static_root, verbosity=0):
+    """Run collectstatic, with STATIC_ROOT set to the build dir.
+
+    Returns:
+        None
+    """
+    static_root.mkdir(parents=True, exist_ok=True)
+    with override_settings(STATIC_ROOT=static_root):
+        call_command("collectstatic", interactive=False, verbosity=verbosity)
+
+
+def precompress(static_root, max_workers=None):
+    """Compress all compressible files in static_root.
+
+    Files whose content hash matches the manifest from the previous run, and whose
+    compressed versions still exist, are skipped.
+
+    Returns:
+        dict: Counts of compressed and skipped files, and total original and
+        compressed sizes of the files that were compressed.
+    """
+    manifest_path = static_root / MANIFEST_NAME
+    manifest = _load_manifest(manifest_path)
+
+    paths = [
+        path
+        for path in static_root.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in COMPRESSIBLE_EXTENSIONS
+        and path != manifest_path
+    ]
+    rel_paths = [path.relative_to(static_root).as_posix() for path in paths]
+    tasks = [(str(p), manifest.get(rel_p)) for p, rel_p in zip(paths, rel_paths)]
+
+    results = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(compress_file, tasks, chunksize=16))
+
+    summary = {
+        "compressed": 0,
+        "skipped": 0,
+        "original_bytes": 0,
+        "compressed_bytes": 0,
+    }
+    new_manifest = {}
+    for rel_path, result in zip(rel_paths, results):
+        new_manifest[rel_path] = result["entry"]
+
+        if result["skipped"]:
+            summary["skipped"] += 1
+            continue
+
+        summary["compressed"] += 1
+        summary["original_bytes"] += result["size"]
+        summary["compressed_bytes"] += result["gzip_size"]
+
+    manifest_path.write_text(json.dumps(new_manifest, indent=2, sort_keys=True))
+    return summary
+
+
+def compress_file(task):
+    """Write .gz and, if available, .br versions of a single file.
+
+    Runs in a worker process, so it takes a single picklable argument: the path,
+    and the file's manifest entry from the previous run.
+
+    Returns:
+        dict: The file's new manifest entry, whether it was skipped, and sizes.
+    """
+    path, previous_entry = task
+    path = Path(path)
+    data = path.read_bytes()
+
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "brotli": brotli is not None,
+        "outputs": [],
+    }
+    result = {"entry": entry, "skipped": False, "size": len(data), "gzip_size": 0}
+
+    if _is_unchanged(path, entry, previous_entry):
+        result["entry"] = previous_entry
+        result["skipped"] = True
+        return result
+
+    result["gzip_size"] = len(data)
+    if len(data) < MIN_SIZE:
+        return result
+
+    # mtime=0 makes the output depend only on the content.
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    if _write_if_smaller(path.with_name(f"{path.name}.gz"), gz_data, len(data)):
+        entry["outputs"].append(".gz")
+        result["gzip_size"] = len(gz_data)
+
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=11)
+        if _write_if_smaller(path.with_name(f"{path.name}.br"), br_data, len(data)):
+            entry["outputs"].append(".br")
+
+    return result
+
+
+def format_summary(summary):
+    """Summarize a precompression run for output.
+
+    Returns:
+        str
+    """
+    saved = summary["original_bytes"] - summary["compressed_bytes"]
+    msg = f"  Compressed {summary['compressed']} file(s)"
+    msg += f", skipped {summary['skipped']} unchanged file(s)."
+    if summary["compressed"]:
+        msg += f"\n  {sd_utils.format_bytes(summary['original_bytes'])} ->"
+        msg += f" {sd_utils.format_bytes(summary['compressed_bytes'])} gzipped"
+        msg += f" ({sd_utils.format_bytes(saved)} saved)."
+    if brotli is None:
+        msg += "\n  Install brotli to write .br files as well."
+    return msg
+
+
+# --- Helper functions ---
+
+
+def _load_manifest(manifest_path):
+    """Load the manifest from a previous run, if there is one."""
+    try:
+        return json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _is_unchanged(path, entry, previous_entry):
+    """Check whether a file and its compressed versions are the same as last run."""
+    if not previous_entry:
+        return False
+    if previous_entry.get("sha256") != entry["sha256"]:
+        return False
+    if previous_entry.get("brotli") != entry["brotli"]:
+        return False
+
+    outputs = previous_entry.get("outputs", [])
+    return all(path.with_name(f"{path.name}{suffix}").exists() for suffix in outputs)
+
+
+def _write_if_smaller(path, data, original_size):
+    """Write compressed data, if it saves enough to be worth serving.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    if len(data) >= original_size * MIN_RATIO:
+        if path.exists():
+            os.unlink(path)
+        return False
+
+    path.write_bytes(data)
+    return True
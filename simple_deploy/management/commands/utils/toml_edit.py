@@ -0,0 +1,428 @@
+"""Edit TOML files in place, keeping their comments, ordering, and formatting.
+
+Loading a whole manifest and dumping it back rewrites every line of it: comments are
+dropped, tables are reordered, and arrays are reformatted. Here, the file is scanned
+one statement at a time, just far enough to find the table being edited, and only
+the lines that change are written. Everything else in the file is left byte for
+byte as it was.
+
+Statements are found with a single regular expression that matches only the tokens
+that matter for where a statement ends: strings, comments, brackets, and newlines.
+So a newline inside a multiline array or string doesn't end a statement, and a line
+starting with [ inside a string isn't mistaken for a table header.
+
+Tables can also be defined with dotted keys or inline tables, ie
+`group.deploy.dependencies = {}` under [tool.poetry]. A new [header] can't be added
+for a table that's defined that way, so those files are loaded and dumped as a
+whole, as before.
+
+Files that use CRLF line endings are edited as if they used LF, and CRLF is restored
+afterwards, so new lines match the rest of the file.
+"""
+
+import functools
+import json
+import re
+
+import toml
+
+
+# Tokens that affect where a statement ends. Multiline strings are matched by their
+# opening quotes, and skipped as a whole.
+_token_re = re.compile(
+    r'"""|\'\'\'|"(?:\\.|[^"\\\n])*"|\'[^\'\n]*\'|#[^\n]*|[\[\]{}]|\n'
+)
+_key_part_re = re.compile(r'\s*([A-Za-z0-9_-]+|"(?:\\.|[^"\\\n])*"|\'[^\'\n]*\')\s*')
+_bare_key_re = re.compile(r"[A-Za-z0-9_-]+")
+_array_start_re = re.compile(r"\s*=\s*\[")
+
+
+def _keep_newlines(edit):
+    """Run an edit on LF text, and give the result the newline style of the input.
+
+    Only files that use CRLF throughout are converted. A file that mixes line endings
+    is edited as it is, so no existing line is changed.
+    """
+
+    @functools.wraps(edit)
+    def wrapper(text, *args):
+        crlf_count = text.count("\r\n")
+        if not crlf_count or crlf_count != text.count("\n"):
+            return edit(text, *args)
+        return edit(text.replace("\r\n", "\n"), *args).replace("\n", "\r\n")
+
+    return wrapper
+
+
+@_keep_newlines
+def set_key(text, table, key, value):
+    """Set a key in a table, adding the table if it's not there yet.
+
+    An existing key is replaced where it is. A new key goes after the last key in
+    the table, so comments and blank lines that follow the table stay where they
+    are.
+
+    Args:
+        text (str): Contents of a TOML file.
+        table (str): Dotted name of the table, ie "tool.poetry.group.deploy".
+        key (str): Key to set in the table.
+        value: str, bool, int, float, list, or dict.
+
+    Returns:
+        str: The edited contents.
+    """
+    table_parts = tuple(table.split("."))
+    layout = _find_table(text, table_parts, key)
+    if layout is None:
+        return _rewrite(text, table_parts, key, value)
+
+    line = f"{_format_key(key)} = {_format_value(value)}\n"
+    if layout["header"] is None:
+        return _insert_table(text, layout, table_parts, line)
+
+    if layout["key"] is not None:
+        start, end = layout["key"]
+        statement = text[start:end]
+        indent = statement[: len(statement) - len(statement.lstrip(" \t"))]
+        if not statement.endswith("\n"):
+            line = line.rstrip("\n")
+        return f"{text[:start]}{indent}{line}{text[end:]}"
+
+    position = layout["last_key"] or layout["header"]
+    return _insert(text, position, line)
+
+
+@_keep_newlines
+def add_table(text, table):
+    """Add an empty table, if it's not there yet.
+
+    A new table goes after the last table that shares the longest part of its
+    name, ie [tool.poetry.group.deploy] goes after the last [tool.poetry...] table.
+
+    Returns:
+        str: The edited contents.
+    """
+    table_parts = tuple(table.split("."))
+    layout = _find_table(text, table_parts)
+    if layout is None:
+        data = toml.loads(text)
+        _get_table(data, table_parts)
+        return toml.dumps(data)
+    if layout["header"] is not None:
+        return text
+    return _insert_table(text, layout, table_parts, "")
+
+
+@_keep_newlines
+def add_to_array(text, table, key, item):
+    """Add an item to the end of an array, adding the array if it's not there yet.
+
+    The array keeps its layout: in a multiline array, the item goes on its own line
+    with the same indentation as the item before it.
+
+    Returns:
+        str: The edited contents.
+    """
+    table_parts = tuple(table.split("."))
+    layout = _find_table(text, table_parts, key)
+    if layout is None or layout["key"] is None:
+        if layout is None or layout["header"] is None:
+            existing = _get_table(toml.loads(text), table_parts).get(key)
+            if existing is not None:
+                return _rewrite(text, table_parts, key, [*existing, item])
+        return set_key(text, table, key, [item])
+
+    start, end = layout["key"]
+    statement = text[start:end]
+    _kind, _name, offset = parse_statement(statement)
+    close = _find_array_end(statement, offset)
+    if close is None:
+        # The value isn't an array that can be edited in place.
+        existing = _get_table(toml.loads(text), table_parts)[key]
+        return _rewrite(text, table_parts, key, [*existing, item])
+
+    # Work out where items end, ignoring comments.
+    body_start = statement.index("[", offset) + 1
+    body = statement[body_start:close]
+    code = _blank_comments(body).rstrip()
+    item = _format_value(item)
+
+    if not code.strip():
+        body = item if "\n" not in body else f"{body.rstrip()}\n    {item},\n"
+    elif "\n" in code:
+        # Multiline: add a line after the last item, after any comment on its line.
+        comma = "" if code.endswith(",") else ","
+        last_line = code[code.rfind("\n") + 1 :]
+        indent = last_line[: len(last_line) - len(last_line.lstrip())]
+        line_end = body.find("\n", len(code))
+        line_end = len(body) if line_end == -1 else line_end
+        body = (
+            f"{body[:len(code)]}{comma}{body[len(code):line_end]}"
+            f"\n{indent}{item},{body[line_end:]}"
+        )
+    else:
+        separator = " " if code.endswith(",") else ", "
+        body = f"{body[:len(code)]}{separator}{item}{body[len(code):]}"
+
+    statement = f"{statement[:body_start]}{body}{statement[close:]}"
+    return f"{text[:start]}{statement}{text[end:]}"
+
+
+def iter_statements(text):
+    """Split TOML text into statements, ie headers, key/value pairs, and comments.
+
+    A statement ends at a newline that's outside any string, array, or inline table.
+    Scanning stops when the caller stops asking for statements.
+
+    Yields:
+        Tuple[int, int]: Start and end of each statement, including its newline.
+    """
+    pos = start = depth = 0
+    while True:
+        m = _token_re.search(text, pos)
+        if m is None:
+            if text[start:].strip():
+                yield start, len(text)
+            return
+
+        token = m.group()
+        pos = m.end()
+        if token in ('"""', "'''"):
+            close = text.find(token, pos)
+            pos = len(text) if close == -1 else close + 3
+        elif token in "[{":
+            depth += 1
+        elif token in "]}":
+            depth = max(depth - 1, 0)
+        elif token == "\n" and depth == 0:
+            yield start, pos
+            start = pos
+
+
+def parse_statement(statement):
+    """Get the kind of a statement, and the dotted key or table name in it.
+
+    Returns:
+        Tuple[str, tuple | None, int]: Kind ("table", "array_table", "key", or
+        "other"), the parts of the name, and where the name ends in the statement.
+    """
+    stripped = statement.lstrip()
+    offset = len(statement) - len(stripped)
+    if not stripped or stripped.startswith("#"):
+        return "other", None, 0
+
+    kind = "key"
+    if stripped.startswith("[["):
+        kind, offset = "array_table", offset + 2
+    elif stripped.startswith("["):
+        kind, offset = "table", offset + 1
+
+    parts = []
+    while True:
+        m = _key_part_re.match(statement, offset)
+        if m is None:
+            return "other", None, 0
+        parts.append(_unquote(m.group(1)))
+        offset = m.end()
+        if not statement.startswith(".", offset):
+            break
+        offset += 1
+    return kind, tuple(parts), offset
+
+
+# --- Helper functions ---
+
+
+def _find_table(text, table_parts, key=None):
+    """Find a table's header, and where keys in it are.
+
+    The scan stops at the first header after the table. If the table isn't there,
+    the whole file is scanned, to find where it should go.
+
+    Returns:
+        dict | None: Spans of the header, the last key in the table, and the key
+        being looked for, and the statement a new table should follow. None if the
+        table is defined with dotted keys or an inline table.
+    """
+    layout = {"header": None, "last_key": None, "key": None, "insert_after": None}
+    current, best_prefix, in_best = (), 0, False
+
+    for start, end in iter_statements(text):
+        statement = text[start:end]
+        first_char = statement.lstrip()[:1]
+        if first_char in ("", "#"):
+            continue
+        if first_char != "[" and not _needs_key(layout, current, table_parts):
+            # Only where a key ends matters here, not what the key is.
+            if in_best:
+                layout["insert_after"] = (start, end)
+            continue
+
+        kind, name, _offset = parse_statement(statement)
+        if kind == "array_table":
+            if layout["header"] is not None:
+                break
+            current, in_best = None, False
+
+        elif kind == "table":
+            if layout["header"] is not None:
+                break
+            current = name
+            if name == table_parts:
+                layout["header"] = (start, end)
+                continue
+
+            # A new table goes after the last table sharing the longest prefix.
+            prefix = _get_common_prefix(name, table_parts)
+            in_best = bool(prefix) and prefix >= best_prefix
+            if in_best:
+                best_prefix = prefix
+                layout["insert_after"] = (start, end)
+
+        elif kind == "key" and current is not None:
+            if layout["header"] is not None:
+                layout["last_key"] = (start, end)
+                if name == (key,):
+                    layout["key"] = (start, end)
+                continue
+
+            full_name = current + name
+            if len(current) < len(table_parts) <= len(full_name):
+                if full_name[: len(table_parts)] == table_parts:
+                    return None
+            if in_best:
+                layout["insert_after"] = (start, end)
+
+    return layout
+
+
+def _needs_key(layout, current, table_parts):
+    """Check if the name of a key in the current table is needed.
+
+    Names are needed in the table being edited, and in tables that could define it
+    with dotted keys.
+    """
+    if layout["header"] is not None:
+        return True
+    return current is not None and current == table_parts[: len(current)]
+
+
+def _find_array_end(statement, offset):
+    """Find the bracket that closes the array value of a key/value statement.
+
+    Returns:
+        int | None: Index of the closing bracket, or None if the value isn't an
+        array.
+    """
+    m = _array_start_re.match(statement, offset)
+    if m is None:
+        return None
+
+    pos, depth = m.end(), 1
+    while True:
+        m = _token_re.search(statement, pos)
+        if m is None:
+            return None
+        token = m.group()
+        pos = m.end()
+        if token in ('"""', "'''"):
+            close = statement.find(token, pos)
+            if close == -1:
+                return None
+            pos = close + 3
+        elif token in "[{":
+            depth += 1
+        elif token in "]}":
+            depth -= 1
+            if depth == 0:
+                return m.start()
+
+
+def _blank_comments(text):
+    """Replace comments with spaces, so positions in the text don't change."""
+
+    def blank(m):
+        token = m.group()
+        return " " * len(token) if token.startswith("#") else token
+
+    return _token_re.sub(blank, text)
+
+
+def _insert_table(text, layout, table_parts, line):
+    """Add a new table, with an optional first line."""
+    header = f"[{'.'.join(_format_key(part) for part in table_parts)}]\n"
+    if layout["insert_after"] is None:
+        if not text.strip():
+            return f"{header}{line}"
+        return _insert(text, (len(text), len(text)), f"\n{header}{line}")
+    return _insert(text, layout["insert_after"], f"\n{header}{line}")
+
+
+def _insert(text, span, new_text):
+    """Insert text after a statement, making sure the statement ends its line."""
+    end = span[1]
+    if end and not text[:end].endswith("\n"):
+        new_text = f"\n{new_text}"
+    return f"{text[:end]}{new_text}{text[end:]}"
+
+
+def _rewrite(text, table_parts, key, value):
+    """Set a key by loading and dumping the whole file.
+
+    This is only used for tables defined with dotted keys or inline tables.
+    """
+    data = toml.loads(text)
+    _get_table(data, table_parts)[key] = value
+    return toml.dumps(data)
+
+
+def _get_table(data, table_parts):
+    """Get a table from parsed TOML, creating it if needed."""
+    for part in table_parts:
+        data = data.setdefault(part, {})
+    return data
+
+
+def _get_common_prefix(name, table_parts):
+    """Get how many leading parts two names share."""
+    count = 0
+    for part, table_part in zip(name, table_parts):
+        if part != table_part:
+            break
+        count += 1
+    return count
+
+
+def _format_key(key):
+    """Format a key, quoting it only if needed."""
+    if _bare_key_re.fullmatch(key):
+        return key
+    return json.dumps(key)
+
+
+def _format_value(value):
+    """Format a value as TOML.
+
+    JSON strings are valid TOML basic strings, so strings are formatted as JSON.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return f"[{', '.join(_format_value(item) for item in value)}]"
+    if isinstance(value, dict):
+        items = [f"{_format_key(k)} = {_format_value(v)}" for k, v in value.items()]
+        return f"{{ {', '.join(items)} }}" if items else "{}"
+    raise TypeError(f"Can't format {value!r} as TOML.")
+
+
+def _unquote(key):
+    """Get the value of a key, which may be quoted."""
+    if key.startswith('"'):
+        return json.loads(key)
+    if key.startswith("'"):
+        return key[1:-1]
+    return key
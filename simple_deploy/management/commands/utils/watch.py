@@ -0,0 +1,141 @@
+"""Show the changes deploy would make, and update them as the project changes.
+
+With --watch, deploy doesn't write any files. The contents it would write are kept in
+sd_config.plan, and shown as a diff against the project. The files the plan depends
+on are then polled: settings.py, the dependency manifests, and the templates in core
+and in the plugin. Polling only stats each file, so it's cheap enough to do a few
+times a second. When a file changes, only the steps it affects are done again, and
+only the changes to the plan are shown.
+"""
+
+import difflib
+import os
+from pathlib import Path
+
+
+# Seconds between polls of the watched files.
+POLL_INTERVAL = 0.25
+
+# Files that can hold a project's dependencies, in the dir where deploy looks for them.
+# Lock files are included because the Dockerfile depends on whether they exist.
+MANIFEST_NAMES = [
+    "requirements.txt",
+    "Pipfile",
+    "Pipfile.lock",
+    "pyproject.toml",
+    "poetry.lock",
+    "uv.lock",
+]
+
+
+def get_manifest_paths(manifest_dir):
+    """Get the paths of all the manifests deploy could read, whether they exist or not.
+
+    Returns:
+        List[Path]
+    """
+    return [manifest_dir / name for name in MANIFEST_NAMES]
+
+
+def get_template_dirs(plugin_module):
+    """Get core's templates dir, and the plugin's templates dir.
+
+    Returns:
+        List[Path]
+    """
+    return [
+        Path(__file__).parents[3] / "templates",
+        Path(plugin_module.__file__).parent / "templates",
+    ]
+
+
+def get_watched_paths(settings_path, manifest_dir, template_dirs):
+    """Get every file the plan depends on.
+
+    Manifests that don't exist are included, so they're noticed if they're added.
+    Template dirs are included as well; a dir's mtime changes when a template is added
+    to it or removed.
+
+    Returns:
+        List[Path]
+    """
+    paths = [settings_path, *get_manifest_paths(manifest_dir)]
+    for template_dir in template_dirs:
+        for dirpath, _dirnames, filenames in os.walk(template_dir):
+            paths.append(Path(dirpath))
+            paths += [Path(dirpath) / name for name in sorted(filenames)]
+    return paths
+
+
+def format_plan(plan, root):
+    """Show each planned change as a diff against the project.
+
+    Returns:
+        str
+    """
+    if not plan:
+        return "No changes planned."
+
+    sections = []
+    for path in sorted(plan):
+        if plan[path] is None:
+            sections.append(f"New directory: {_get_name(path, root)}/\n")
+        else:
+            sections.append(_diff(_read(path), plan[path], _get_name(path, root)))
+    return "".join(sections).rstrip("\n")
+
+
+def get_plan_diff(old_plan, new_plan, root):
+    """Show how the planned changes have changed.
+
+    A file that's only in one plan is compared with the file in the project.
+
+    Returns:
+        str: A diff, which is empty if nothing has changed.
+    """
+    sections = []
+    for path in sorted(old_plan.keys() | new_plan.keys()):
+        in_old, in_new = path in old_plan, path in new_plan
+        if in_old and in_new and old_plan[path] == new_plan[path]:
+            continue
+
+        name = _get_name(path, root)
+        if in_new and new_plan[path] is None:
+            sections.append(f"New directory: {name}/\n")
+        elif in_old and old_plan[path] is None:
+            sections.append(f"No longer adding directory: {name}/\n")
+        else:
+            old = old_plan[path] if in_old else _read(path)
+            new = new_plan[path] if in_new else _read(path)
+            sections.append(_diff(old, new, name))
+    return "".join(sections).rstrip("\n")
+
+
+# --- Helper functions ---
+
+
+def _read(path):
+    """Read a file in the project, or return None if it doesn't exist."""
+    try:
+        return path.read_text()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+def _diff(old, new, name):
+    """Get a unified diff between two versions of a file; either may be None."""
+    old_lines = [] if old is None else old.splitlines(keepends=True)
+    new_lines = [] if new is None else new.splitlines(keepends=True)
+    fromfile = "/dev/null" if old is None else f"a/{name}"
+    tofile = "/dev/null" if new is None else f"b/{name}"
+
+    lines = difflib.unified_diff(old_lines, new_lines, fromfile, tofile)
+    return "".join(line if line.endswith("\n") else f"{line}\n" for line in lines)
+
+
+def _get_name(path, root):
+    """Get a path relative to the root of the project, for showing in a diff."""
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
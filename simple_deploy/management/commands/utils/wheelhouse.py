@@ -0,0 +1,204 @@
+"""Build a wheelhouse of the project's dependencies, for offline installs on the platform.
+
+Without a wheelhouse, every remote build resolves the project's requirements again,
+and downloads every package. With one, the build installs from local files with
+`pip install --no-index --find-links`, so it doesn't need to resolve or download
+anything.
+
+Requirements are resolved once, locally, with `pip install --dry-run --report` for
+the target platform, so the wheels match the platform's image rather than the local
+OS. Packages that are pinned in a lock file, ie uv.lock, are pinned to the locked
+version; other packages that are installed locally are pinned to the installed
+version.
+
+Each resolved wheel is downloaded into a local cache, keyed by its pin and the target
+platform. Later builds, in this project or any other, reuse cached wheels. Downloads
+run in parallel.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+
+from . import sd_utils
+
+
+# Platforms that the official slim Python images can install wheels for.
+DEFAULT_PLATFORMS = ["manylinux_2_28_x86_64", "manylinux2014_x86_64"]
+
+MAX_WORKERS = 8
+
+# A requirement specifier: name, extras, version constraints, and markers.
+_spec_re = re.compile(
+    r"\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?P<extras>\[[^\]]*\])?"
+    r"[^;]*(?P<markers>;.*)?$"
+)
+
+
+def get_cache_dir():
+    """Get the root of the local wheel cache.
+
+    Returns:
+        Path
+    """
+    if sys.platform == "win32":
+        cache_root = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData"))
+    else:
+        cache_root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache_root / "simple_deploy" / "wheels"
+
+
+def pin_requirements(requirements, locked_versions=None):
+    """Pin requirements to their locked versions, or their locally installed versions.
+
+    A lock file is the best source of versions, so any requirement that's locked is
+    pinned to its locked version, keeping its extras and markers. Otherwise,
+    requirements that already specify a version, or that aren't installed locally,
+    are left as they are.
+
+    Returns:
+        List[str]: Requirement specifiers, ie ["django==5.1.3", "gunicorn"].
+    """
+    locked_versions = locked_versions or {}
+    specs = []
+    for requirement in requirements:
+        m = _spec_re.match(requirement)
+        if m and sd_utils.normalize_name(m.group("name")) in locked_versions:
+            name, extras = m.group("name"), m.group("extras") or ""
+            version = locked_versions[sd_utils.normalize_name(name)]
+            specs.append(f"{name}{extras}=={version}{m.group('markers') or ''}")
+            continue
+
+        if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9._-]*", requirement):
+            specs.append(requirement)
+            continue
+        try:
+            version = metadata.version(requirement)
+        except metadata.PackageNotFoundError:
+            specs.append(requirement)
+        else:
+            specs.append(f"{requirement}=={version}")
+    return specs
+
+
+def resolve(specs, python_version, platforms=None):
+    """Resolve requirement specifiers for the target platform, without installing.
+
+    Returns:
+        List[dict]: name, version, url, and sha256 (if known) for each wheel.
+
+    Raises:
+        RuntimeError: If pip can't resolve the requirements, ie when a package has
+        no wheel for the target platform.
+    """
+    platforms = platforms or DEFAULT_PLATFORMS
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_path = Path(tmp_dir) / "report.json"
+        cmd = [sys.executable, "-m", "pip", "install", "--dry-run", "--quiet"]
+        cmd += ["--ignore-installed", "--only-binary=:all:"]
+        cmd += ["--python-version", python_version, "--implementation", "cp"]
+        for platform in platforms:
+            cmd += ["--platform", platform]
+        cmd += ["--target", str(Path(tmp_dir) / "target")]
+        cmd += ["--report", str(report_path), *specs]
+
+        output = subprocess.run(cmd, capture_output=True)
+        if output.returncode != 0:
+            raise RuntimeError(output.stderr.decode(errors="replace").strip())
+
+        report = json.loads(report_path.read_text())
+
+    wheels = []
+    for item in report["install"]:
+        download_info = item["download_info"]
+        hashes = download_info.get("archive_info", {}).get("hashes", {})
+        wheels.append(
+            {
+                "name": sd_utils.normalize_name(item["metadata"]["name"]),
+                "version": item["metadata"]["version"],
+                "url": download_info["url"],
+                "sha256": hashes.get("sha256"),
+            }
+        )
+    return sorted(wheels, key=lambda w: w["name"])
+
+
+def fetch_wheels(wheels, cache_dir, max_workers=MAX_WORKERS):
+    """Make sure every wheel is in the cache, downloading any that aren't.
+
+    Returns:
+        List[Tuple[Path, bool]]: Cached path for each wheel, and whether it was
+        already in the cache.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda w: fetch_wheel(w, cache_dir), wheels))
+
+
+def fetch_wheel(wheel, cache_dir):
+    """Get a single wheel from the cache, or download it into the cache.
+
+    Returns:
+        Tuple[Path, bool]: Path to the cached wheel, and whether it was cached.
+
+    Raises:
+        RuntimeError: If the downloaded file doesn't match its expected hash.
+    """
+    filename = wheel["url"].rsplit("/", 1)[-1].split("#")[0]
+    pin_dir = cache_dir / f"{wheel['name']}=={wheel['version']}"
+    path = pin_dir / filename
+    if path.exists():
+        return path, True
+
+    pin_dir.mkdir(parents=True, exist_ok=True)
+    parsed_url = urlparse(wheel["url"])
+    if parsed_url.scheme == "file":
+        # pip may be configured to find packages in a local directory.
+        content = Path(url2pathname(parsed_url.path)).read_bytes()
+    else:
+        r = requests.get(wheel["url"], timeout=60)
+        r.raise_for_status()
+        content = r.content
+
+    if wheel["sha256"] and hashlib.sha256(content).hexdigest() != wheel["sha256"]:
+        raise RuntimeError(f"Hash mismatch for {filename}.")
+
+    # Write to a temp file and rename, so a partial download is never cached.
+    tmp_path = pin_dir / f".{filename}.{os.getpid()}.tmp"
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    return path, False
+
+
+def populate_wheelhouse(wheelhouse_dir, cached_paths, wheels):
+    """Link cached wheels into the wheelhouse, and write a pinned requirements file.
+
+    Wheels from previous builds that are no longer needed are removed.
+
+    Returns:
+        None
+    """
+    wheelhouse_dir.mkdir(parents=True, exist_ok=True)
+    for old_wheel in wheelhouse_dir.glob("*.whl"):
+        old_wheel.unlink()
+
+    for cached_path in cached_paths:
+        dest = wheelhouse_dir / cached_path.name
+        try:
+            os.link(cached_path, dest)
+        except OSError:
+            shutil.copy2(cached_path, dest)
+
+    pins = [f"{w['name']}=={w['version']}" for w in wheels]
+    (wheelhouse_dir / "requirements.txt").write_text("\n".join(pins) + "\n")
@@ -0,0 +1,103 @@
+"""Measure how fast packages are added to large pyproject.toml files.
+
+Usage:
+    $ python -m tests.benchmarks.bench_toml_edit
+    $ python -m tests.benchmarks.bench_toml_edit --num-deps 5000 --repeat 20
+
+Generates a Poetry pyproject.toml with many dependencies, comments, and tool tables
+after the Poetry tables, and times adding a package to the deploy group in two ways:
+editing the file in place with toml_edit, and loading and dumping the whole file with
+toml, which is what the pipenv and Poetry helpers used to do.
+
+The edited file must be identical to the original apart from the added line, and
+must parse to the same data as the loaded-and-dumped file.
+"""
+
+import argparse
+import sys
+import time
+
+import toml
+
+from simple_deploy.management.commands.utils import toml_edit
+
+
+DEPLOY_TABLE = "tool.poetry.group.deploy.dependencies"
+
+
+def make_pyproject(num_deps):
+    """Make a pyproject.toml with roughly num_deps dependencies in several tables."""
+    lines = [
+        "# Generated for benchmarking.",
+        "[tool.poetry]",
+        'name = "bench"',
+        'version = "0.1.0"',
+        'description = """',
+        "A project with many dependencies.",
+        "[not.a.table]",
+        '"""',
+        "",
+        "[tool.poetry.dependencies]",
+        'python = "^3.10"',
+    ]
+    for i in range(num_deps):
+        lines.append(f'package-{i} = "^{i % 7}.{i % 13}"  # Pinned for #{i}.')
+    lines += ["", "[tool.poetry.group.deploy]", "optional = true", ""]
+    lines += ["[tool.poetry.group.deploy.dependencies]", 'gunicorn = "*"', ""]
+
+    # Tool tables after the Poetry tables have to be scanned past, but not parsed.
+    for i in range(num_deps // 10):
+        lines += [f"[tool.linter.rule-{i}]", "enabled = true", f'paths = ["{i}"]', ""]
+    return "\n".join(lines) + "\n"
+
+
+def edit_in_place(text):
+    """Add a package with toml_edit."""
+    return toml_edit.set_key(text, DEPLOY_TABLE, "django-simple-deploy", "*")
+
+
+def load_and_dump(text):
+    """Add a package by loading and dumping the whole file."""
+    data = toml.loads(text)
+    deploy_group = data["tool"]["poetry"]["group"]["deploy"]
+    deploy_group["dependencies"]["django-simple-deploy"] = "*"
+    return toml.dumps(data)
+
+
+def time_it(func, text, repeat):
+    """Run func repeat times, and return its result and the best time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-deps", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_pyproject(args.num_deps)
+    size_kb = len(text.encode()) / 1024
+    print(f"Synthetic pyproject.toml: {size_kb:.0f} KB, {text.count(chr(10))} lines")
+
+    edited, edit_time = time_it(edit_in_place, text, args.repeat)
+    dumped, dump_time = time_it(load_and_dump, text, args.repeat)
+    for label, elapsed in [("Edit in place", edit_time), ("Load and dump", dump_time)]:
+        print(f"  {label:16} {elapsed * 1000:8.2f} ms")
+
+    added_line = 'django-simple-deploy = "*"\n'
+    if edited.replace(added_line, "", 1) != text:
+        print("Editing in place changed more than the added line.")
+        sys.exit(1)
+    if toml.loads(edited) != toml.loads(dumped):
+        print("Edited file doesn't match the loaded-and-dumped file.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
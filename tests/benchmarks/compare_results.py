@@ -0,0 +1,100 @@
+"""Compare benchmark results against a baseline, and flag regressions.
+
+Usage:
+    $ python -m tests.benchmarks.compare_results
+    $ python -m tests.benchmarks.compare_results baseline.json latest.json --threshold 0.2
+
+With no paths, compares results/latest.json against results/baseline.json. Exits
+with a status of 1 if any metric regressed by more than the threshold.
+
+Timing metrics also need to regress by more than --min-seconds to be flagged, so
+tiny phases don't trigger false alarms from ordinary noise.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Metrics that are counts or sizes, rather than times.
+NON_TIMING_METRICS = ("subprocess_count", "file_writes", "peak_rss_kb")
+
+
+def flatten_metrics(result):
+    """Flatten one benchmark result into a dict of metric name: value."""
+    metrics = {"wall_time": result["wall_time"]}
+    for phase, seconds in result["phases"].items():
+        metrics[f"phase.{phase}"] = seconds
+    for name in NON_TIMING_METRICS:
+        if result.get(name) is not None:
+            metrics[name] = result[name]
+    return metrics
+
+
+def compare(baseline, current, threshold=0.2, min_seconds=0.05):
+    """Compare two sets of benchmark results.
+
+    Returns:
+        List[tuple]: (benchmark, metric, baseline value, current value, change) for
+        each metric that regressed beyond the threshold.
+    """
+    regressions = []
+    for bench_name, current_result in current.items():
+        if bench_name not in baseline:
+            continue
+
+        baseline_metrics = flatten_metrics(baseline[bench_name])
+        current_metrics = flatten_metrics(current_result)
+        for metric, current_value in current_metrics.items():
+            baseline_value = baseline_metrics.get(metric)
+            if not baseline_value:
+                continue
+
+            change = (current_value - baseline_value) / baseline_value
+            if change <= threshold:
+                continue
+            is_timing = metric not in NON_TIMING_METRICS
+            if is_timing and current_value - baseline_value <= min_seconds:
+                continue
+
+            regressions.append(
+                (bench_name, metric, baseline_value, current_value, change)
+            )
+
+    return regressions
+
+
+def format_report(regressions, threshold):
+    """Format regressions as a short, readable report."""
+    if not regressions:
+        return f"No regressions beyond {threshold:.0%}."
+
+    lines = [f"Regressions beyond {threshold:.0%}:"]
+    for bench_name, metric, baseline_value, current_value, change in regressions:
+        lines.append(
+            f"  {bench_name:28} {metric:36} {baseline_value:12.3f} -> {current_value:12.3f}  (+{change:.0%})"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", nargs="?", default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("current", nargs="?", default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+
+    regressions = compare(baseline, current, args.threshold, args.min_seconds)
+    print(format_report(regressions, args.threshold))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
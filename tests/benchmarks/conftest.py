@@ -0,0 +1,110 @@
+"""Configuration for benchmarks.
+
+Benchmarks are not collected by a bare `pytest` call. Run them explicitly:
+    $ pytest tests/benchmarks -s
+
+Results are written to tests/benchmarks/results/latest.json. Use --save-baseline to
+also save them as the baseline that later runs are compared against.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from time import sleep
+
+import pytest
+
+from tests.integration_tests.utils import manage_sample_project as msp
+from tests.integration_tests.utils import it_helper_functions as ihf
+from .compare_results import RESULTS_DIR, compare, format_report
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-runs",
+        action="store",
+        type=int,
+        default=3,
+        help="Number of times to run each benchmark; the median of each metric is kept.",
+    )
+    parser.addoption(
+        "--save-baseline",
+        action="store_true",
+        help="Save this run's results as the baseline for future comparisons.",
+    )
+    parser.addoption(
+        "--bench-threshold",
+        action="store",
+        type=float,
+        default=0.2,
+        help="Flag metrics that regress by more than this fraction of the baseline.",
+    )
+
+
+# Results for each benchmark in this session, keyed by benchmark name.
+bench_results = {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write results, and save them as the baseline if requested."""
+    if not bench_results:
+        return
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    results_json = json.dumps(bench_results, indent=2)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+    (RESULTS_DIR / f"results_{timestamp}.json").write_text(results_json)
+    (RESULTS_DIR / "latest.json").write_text(results_json)
+
+    if session.config.getoption("--save-baseline"):
+        (RESULTS_DIR / "baseline.json").write_text(results_json)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Summarize results, and compare them against the baseline if there is one."""
+    if not bench_results:
+        return
+
+    terminalreporter.section("Deploy benchmarks")
+    for bench_name, result in bench_results.items():
+        rss = result["peak_rss_kb"]
+        rss_msg = f"{rss / 1024:7.1f} MB" if rss else "    n/a"
+        terminalreporter.write_line(
+            f"{bench_name:28} {result['wall_time']:7.3f}s  "
+            f"{result['subprocess_count']:3} subprocesses  "
+            f"{result['file_writes']:3} file writes  {rss_msg}"
+        )
+
+    baseline_path = RESULTS_DIR / "baseline.json"
+    if config.getoption("--save-baseline") or not baseline_path.exists():
+        return
+
+    threshold = config.getoption("--bench-threshold")
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare(baseline, bench_results, threshold)
+    terminalreporter.write_line("")
+    terminalreporter.write_line(format_report(regressions, threshold))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def check_prerequisites(pytestconfig):
+    """Make sure dev environment supports running deploy against sample projects."""
+    ihf.check_plugin_available(pytestconfig)
+    ihf.check_package_manager_available("poetry")
+    ihf.check_package_manager_available("pipenv")
+
+
+@pytest.fixture(scope="session", params=["blog_project", "blog_project_nested"])
+def bench_project(request, tmp_path_factory, pytestconfig):
+    """Set up a copy of a sample project, with its own virtual environment.
+
+    Returns:
+    - (str, Path): Name of the sample project, and path to the temp copy.
+    """
+    sleep(0.2)
+    sd_root_dir = Path(__file__).parents[2]
+    tmp_proj_dir = tmp_path_factory.mktemp(request.param)
+    msp.setup_project(tmp_proj_dir, sd_root_dir, pytestconfig, request.param)
+
+    return request.param, tmp_proj_dir
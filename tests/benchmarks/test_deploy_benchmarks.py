@@ -0,0 +1,89 @@
+"""Benchmark configuration-only runs of `manage.py deploy` on the sample projects.
+
+Each benchmark runs deploy --bench-runs times, resetting the project before each run,
+and keeps the median of each metric.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.integration_tests.utils import manage_sample_project as msp
+from .conftest import bench_results
+
+
+BENCH_SCRIPT = Path(__file__).parent / "utils" / "bench_deploy.py"
+
+
+# --- Helper functions ---
+
+
+def run_deploy_once(tmp_proj_dir, output_path):
+    """Run the instrumented deploy command once against the test project.
+
+    Returns:
+    - dict: Metrics recorded by bench_deploy.py.
+    """
+    if sys.platform == "win32":
+        python_exe = tmp_proj_dir / "b_env" / "Scripts" / "python.exe"
+    else:
+        python_exe = tmp_proj_dir / "b_env" / "bin" / "python"
+
+    # manage.py is one level down in the nested sample project.
+    manage_dir = msp.get_settings_path(tmp_proj_dir).parents[1]
+
+    cmd = [
+        python_exe,
+        BENCH_SCRIPT,
+        "--output",
+        output_path,
+        "--",
+        "deploy",
+        "--unit-testing",
+        "--deployed-project-name",
+        "my_blog_project",
+    ]
+    subprocess.run(cmd, cwd=manage_dir, capture_output=True)
+
+    return json.loads(Path(output_path).read_text())
+
+
+def get_median_result(results):
+    """Combine several runs into one result, using the median of each metric."""
+    phase_names = {name for result in results for name in result["phases"]}
+    median_result = {
+        "wall_time": statistics.median(r["wall_time"] for r in results),
+        "phases": {
+            name: statistics.median(r["phases"].get(name, 0) for r in results)
+            for name in sorted(phase_names)
+        },
+        "runs": len(results),
+    }
+    for name in ("subprocess_count", "file_writes", "peak_rss_kb"):
+        values = [r[name] for r in results if r[name] is not None]
+        median_result[name] = statistics.median(values) if values else None
+
+    return median_result
+
+
+# --- Benchmarks ---
+
+
+@pytest.mark.parametrize("pkg_manager", ["req_txt", "poetry", "pipenv"])
+def test_deploy_benchmark(bench_project, pkg_manager, pytestconfig, tmp_path):
+    sample_project, tmp_proj_dir = bench_project
+
+    results = []
+    for run_num in range(pytestconfig.getoption("--bench-runs")):
+        msp.reset_test_project(tmp_proj_dir, pkg_manager)
+        output_path = tmp_path / f"run_{run_num}.json"
+        result = run_deploy_once(tmp_proj_dir, output_path)
+
+        assert result["exit_code"] == 0
+        results.append(result)
+
+    bench_results[f"{sample_project}-{pkg_manager}"] = get_median_result(results)
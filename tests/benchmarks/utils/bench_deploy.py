@@ -0,0 +1,161 @@
+"""Run `manage.py deploy` once, and record how much work it did.
+
+This script is run with the test project's Python interpreter, from the directory
+that contains manage.py:
+    $ b_env/bin/python bench_deploy.py --output results.json -- deploy --unit-testing
+
+It instruments the deploy command in-process, then runs manage.py as if it had been
+called from the command line. The JSON output contains:
+- wall_time: Seconds from the start of this script to the end of the command.
+- phases: Seconds spent in each phase of Command.handle(), and in the plugin.
+- subprocess_count: Number of subprocesses started.
+- file_writes: Number of files opened for writing.
+- peak_rss_kb: Peak resident memory of this process, in KB.
+- exit_code: 0 if the command finished without an error.
+"""
+
+import argparse
+import builtins
+import io
+import json
+import runpy
+import subprocess
+import sys
+import time
+from functools import wraps
+from pathlib import Path
+
+
+start_time = time.perf_counter()
+
+# Methods of Command that make up the phases of handle(), in order.
+PHASE_METHODS = [
+    "_parse_cli_options",
+    "_start_logging",
+    "_validate_command",
+    "_load_plugin",
+    "_validate_plugin",
+    "_inspect_system",
+    "_inspect_project",
+    "_add_simple_deploy_req",
+    "_confirm_automate_all",
+]
+
+phases = {}
+counts = {"subprocess_count": 0, "file_writes": 0}
+
+
+def record_phase(name, func):
+    """Wrap func so the time spent in it is added to phases[name]."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        phase_start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - phase_start
+            phases[name] = phases.get(name, 0) + elapsed
+
+    return wrapper
+
+
+def instrument_subprocesses():
+    """Count every subprocess that's started."""
+    orig_init = subprocess.Popen.__init__
+
+    @wraps(orig_init)
+    def counting_init(self, *args, **kwargs):
+        counts["subprocess_count"] += 1
+        orig_init(self, *args, **kwargs)
+
+    subprocess.Popen.__init__ = counting_init
+
+
+def instrument_file_writes():
+    """Count every file that's opened for writing."""
+    orig_open = io.open
+
+    @wraps(orig_open)
+    def counting_open(file, mode="r", *args, **kwargs):
+        if any(flag in mode for flag in "wax+"):
+            counts["file_writes"] += 1
+        return orig_open(file, mode, *args, **kwargs)
+
+    builtins.open = counting_open
+    io.open = counting_open
+
+
+def instrument_deploy():
+    """Time Django setup, each phase of handle(), and the plugin's deploy hook."""
+    import django
+    from simple_deploy.management.commands import deploy
+    from simple_deploy.plugins import pm
+
+    django.setup = record_phase("django_setup", django.setup)
+
+    for method_name in PHASE_METHODS:
+        method = getattr(deploy.Command, method_name)
+        setattr(deploy.Command, method_name, record_phase(method_name, method))
+
+    hook_starts = {}
+
+    def before(hook_name, hook_impls, kwargs):
+        hook_starts[hook_name] = time.perf_counter()
+
+    def after(outcome, hook_name, hook_impls, kwargs):
+        if hook_name == "simple_deploy_deploy":
+            elapsed = time.perf_counter() - hook_starts[hook_name]
+            phases["plugin_deploy"] = phases.get("plugin_deploy", 0) + elapsed
+
+    pm.add_hookcall_monitoring(before, after)
+
+
+def get_peak_rss_kb():
+    """Get peak RSS of this process in KB, or None where it's not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and KB on Linux.
+    if sys.platform == "darwin":
+        max_rss //= 1024
+    return max_rss
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", type=str, required=True)
+    parser.add_argument("command_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    command_args = [a for a in args.command_args if a != "--"]
+
+    # Make the project importable, as it would be when running manage.py directly.
+    sys.path.insert(0, str(Path.cwd()))
+
+    instrument_subprocesses()
+    instrument_file_writes()
+    instrument_deploy()
+
+    exit_code = 0
+    sys.argv = ["manage.py", *command_args]
+    try:
+        runpy.run_path("manage.py", run_name="__main__")
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+
+    results = {
+        "wall_time": time.perf_counter() - start_time,
+        "phases": phases,
+        "subprocess_count": counts["subprocess_count"],
+        "file_writes": counts["file_writes"],
+        "peak_rss_kb": get_peak_rss_kb(),
+        "exit_code": exit_code,
+    }
+    Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
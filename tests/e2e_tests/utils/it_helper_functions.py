@@ -4,10 +4,12 @@ The functions in this module are not specific to any one platform. If a function
   starts to be used by tests for more than one platform, it should be moved here.
 """
 
-import subprocess, shlex, sys, time, os
+import subprocess, shlex, sys, time, os, socket
 from pathlib import Path
 from textwrap import dedent
 
+import requests
+
 
 def make_sp_call(cmd, capture_output=False):
     """Make a subprocess call.
@@ -63,12 +65,72 @@ def commit_configuration_changes():
     make_sp_call("git commit -am 'Configured for deployment.'")
 
 
+def wait_until_ready(probe, deadline=60, initial_delay=0.1, max_delay=5, label=""):
+    """Call probe() until it returns True, backing off exponentially between tries.
+
+    Returns:
+        float: Seconds until probe() first returned True, or None if it never did
+        before the deadline.
+    """
+    start = time.perf_counter()
+    delay = initial_delay
+    while True:
+        if probe():
+            time_to_ready = time.perf_counter() - start
+            print(f"    {label} ready after {time_to_ready:.2f}s.")
+            return time_to_ready
+
+        remaining = deadline - (time.perf_counter() - start)
+        if remaining <= 0:
+            print(f"    {label} not ready after {deadline}s.")
+            return None
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def wait_for_url(url, deadline=60, **kwargs):
+    """Wait until url returns a response that's not a server error.
+
+    Returns:
+        float | None: Time to first healthy response; see wait_until_ready().
+    """
+
+    def probe():
+        try:
+            r = requests.get(url, timeout=5)
+        except requests.RequestException:
+            return False
+        return r.status_code < 500
+
+    return wait_until_ready(probe, deadline, label=url, **kwargs)
+
+
+def wait_for_port(port, host="localhost", deadline=30, **kwargs):
+    """Wait until something is accepting connections on host:port.
+
+    Returns:
+        float | None: Time until the port accepted a connection; see wait_until_ready().
+    """
+
+    def probe():
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    return wait_until_ready(probe, deadline, label=f"{host}:{port}", **kwargs)
+
+
 def check_deployed_app_functionality(python_cmd, url):
     """Test functionality of the deployed app.
     Note: Can't call this function test_ because pytest will try to run it directly.
     """
-    # Pause before testing functionality, otherwise app may not yet be available.
-    time.sleep(10)
+    # Wait for the app to respond before testing functionality, instead of
+    #   pausing for a fixed amount of time.
+    print("\n  Waiting for deployed app to respond...")
+    wait_for_url(url, deadline=300)
 
     print("\n  Testing functionality of deployed app...")
 
@@ -89,14 +151,25 @@ def check_local_app_functionality(python_cmd):
     print("\n  Testing local functionality with runserver...")
     make_sp_call(f"{python_cmd} manage.py migrate")
 
-    run_server = subprocess.Popen(f"{python_cmd} manage.py runserver 8008", shell=True)
-    time.sleep(1)
-
-    test_output = make_sp_call(
-        f"{python_cmd} test_deployed_app_functionality.py --url http://localhost:8008/",
-        capture_output=True,
-    ).stdout.decode()
-    run_server.terminate()
+    # Run the server without a shell, and without the autoreloader, so terminating
+    #   run_server actually stops the server.
+    run_server = subprocess.Popen(
+        [python_cmd, "manage.py", "runserver", "8008", "--noreload"]
+    )
+    try:
+        wait_for_port(8008)
+        wait_for_url("http://localhost:8008/")
+
+        test_output = make_sp_call(
+            f"{python_cmd} test_deployed_app_functionality.py --url http://localhost:8008/",
+            capture_output=True,
+        ).stdout.decode()
+    finally:
+        run_server.terminate()
+        try:
+            run_server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            run_server.kill()
 
     print(test_output)
     print("    Finished testing local functionality.")
@@ -2,7 +2,7 @@
 
 import subprocess, re, sys, os, tempfile
 from pathlib import Path
-from time import sleep
+from time import sleep, perf_counter
 
 import pytest
 
@@ -29,6 +29,11 @@ def pytest_addoption(parser):
         action="store_true",
         help="Open the test project in an active terminal window at the end of the test run",
     )
+    parser.addoption(
+        "--in-process",
+        action="store_true",
+        help="Run deploy in the test process for each test module, instead of in a subprocess",
+    )
 
 
 def pytest_sessionfinish(session, exitstatus):
@@ -81,8 +86,25 @@ def pytest_sessionfinish(session, exitstatus):
         subprocess.run(cmd.split())
 
 
+def pytest_terminal_summary(terminalreporter):
+    """Show how long it took to reset the test project for each test module."""
+    if not reset_times:
+        return
+
+    terminalreporter.section("Test project reset times")
+    for module_name, pkg_manager, elapsed in reset_times:
+        terminalreporter.write_line(f"{elapsed:8.3f}s  {pkg_manager:8}  {module_name}")
+
+    total = sum(elapsed for _, _, elapsed in reset_times)
+    terminalreporter.write_line(f"{total:8.3f}s  total ({len(reset_times)} resets)")
+
+
 # --- /Plugins ---
 
+# (module name, pkg_manager, seconds) for each reset of the test project. This is
+#   reported at the end of the test run by pytest_terminal_summary().
+reset_times = []
+
 
 # Check prerequisites before running integration tests.
 @pytest.fixture(scope="session", autouse=True)
@@ -129,7 +151,12 @@ def reset_test_project(request, tmp_project):
     """Reset the test project, so it can be used again by another test module,
     which may be another platform.
     """
+    start = perf_counter()
     msp.reset_test_project(tmp_project, request.param)
+    elapsed = perf_counter() - start
+
+    reset_times.append((request.module.__name__, request.param, elapsed))
+    print(f"\n*** Reset test project ({request.param}) in {elapsed:.3f}s ***")
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -157,7 +184,10 @@ def run_simple_deploy(reset_test_project, tmp_project, request):
     platform = plugin_name.removeprefix("dsd-")
 
     cmd = f"python manage.py deploy"
-    msp.call_simple_deploy(tmp_project, cmd, platform)
+    if request.config.getoption("--in-process"):
+        msp.call_simple_deploy_in_process(tmp_project, cmd, platform)
+    else:
+        msp.call_simple_deploy(tmp_project, cmd, platform)
 
 
 @pytest.fixture()
@@ -1,19 +1,35 @@
 import os
+import re
+import runpy
 import subprocess
 import sys
 import importlib
+import logging
+from io import StringIO
 from pathlib import Path
-from shutil import copytree, rmtree
+from shutil import copytree
 from shlex import split
 
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+
+from simple_deploy.management.commands.deploy import Command as DeployCommand
 from simple_deploy.management.commands.utils import sd_utils
+from simple_deploy.management.commands.utils.plugin_utils import sd_config
+from simple_deploy.plugins import pm
+
+from . import project_snapshots
 
 import pytest
 
 
-def setup_project(tmp_proj_dir, sd_root_dir, config):
+def setup_project(tmp_proj_dir, sd_root_dir, config, sample_project="blog_project"):
     """Set up the test project.
-    - Copy the sample project to a temp dir.
+    - Copy the sample project to a temp dir. This is blog_project unless another
+      sample project, such as blog_project_nested, is requested.
     - Set up a venv.
     - Install requirements for the sample project.
     - Install the local, editable version of simple_deploy.
@@ -32,7 +48,7 @@ def setup_project(tmp_proj_dir, sd_root_dir, config):
         uv_available = True
 
     # Copy sample project to temp dir.
-    sample_project_dir = sd_root_dir / "sample_project/blog_project"
+    sample_project_dir = sd_root_dir / "sample_project" / sample_project
     copytree(sample_project_dir, tmp_proj_dir, dirs_exist_ok=True)
 
     # Create a virtual envronment. Set the path to the environemnt, instead of
@@ -47,7 +63,9 @@ def setup_project(tmp_proj_dir, sd_root_dir, config):
     # Install requirements for sample project, from vendor/.
     #   Don't upgrade pip, as that would involve a network call. When troubleshooting,
     #   keep in mind someone at some point might just need to upgrade their pip.
-    requirements_path = tmp_proj_dir / "requirements.txt"
+    # Always install blog_project's requirements, because those are the versions that
+    #   are in vendor/. The sample projects have the same set of requirements.
+    requirements_path = sd_root_dir / "sample_project/blog_project/requirements.txt"
 
     if uv_available:
         path_to_python = venv_dir / "bin" / "python"
@@ -180,8 +198,12 @@ def setup_project(tmp_proj_dir, sd_root_dir, config):
     subprocess.run([git_exe, "commit", "-am", "Initial commit."])
     subprocess.run([git_exe, "tag", "-am", "", "INITIAL_STATE"])
 
+    # Snapshot the initial state. Each package manager's version of the project is
+    #   derived from this snapshot the first time it's needed.
+    project_snapshots.capture_snapshot(tmp_proj_dir, "initial")
+
     # Add simple_deploy to INSTALLED_APPS.
-    settings_file_path = tmp_proj_dir / "blog/settings.py"
+    settings_file_path = get_settings_path(tmp_proj_dir)
     settings_content = settings_file_path.read_text()
     new_settings_content = settings_content.replace(
         "# Third party apps.", '# Third party apps.\n    "simple_deploy",'
@@ -192,37 +214,22 @@ def setup_project(tmp_proj_dir, sd_root_dir, config):
 def reset_test_project(tmp_dir, pkg_manager):
     """Reset the test project, so it's ready to be used by another test module.
     It may be used by a different platform than the previous run.
+
+    The first reset for a package manager prepares the project from the initial
+    snapshot, and captures a snapshot of that state. Every later reset for the same
+    package manager just restores that snapshot. Restoring a snapshot also removes
+    anything written by the previous run of deploy, so there's no need to track which
+    files each platform writes.
     """
 
     os.chdir(tmp_dir)
 
+    if project_snapshots.snapshot_exists(tmp_dir, pkg_manager):
+        project_snapshots.restore_snapshot(tmp_dir, pkg_manager)
+        return
+
     # Reset to the initial state of the temp project instance.
-    subprocess.run(["git", "reset", "--hard", "INITIAL_STATE"])
-
-    # Remove any files that may remain from the last run of simple_deploy.
-    files_dirs_to_remove = [
-        # Fly.io
-        "fly.toml",
-        "Dockerfile",
-        ".dockerignore",
-        # Platform.sh
-        ".platform.app.yaml",
-        ".platform",
-        # Heroku
-        "Procfile",
-        "static",
-        # All platforms.
-        "simple_deploy_logs",
-        "__pycache__",
-        "poetry.lock",
-    ]
-
-    for entry in files_dirs_to_remove:
-        entry_path = Path(tmp_dir) / entry
-        if entry_path.is_file():
-            entry_path.unlink()
-        elif entry_path.is_dir():
-            rmtree(entry_path)
+    project_snapshots.restore_snapshot(tmp_dir, "initial")
 
     # Remove dependency management files not needed for this package manager
     if pkg_manager == "req_txt":
@@ -242,7 +249,7 @@ def reset_test_project(tmp_dir, pkg_manager):
     )
 
     # Add simple_deploy to INSTALLED_APPS.
-    settings_file_path = tmp_dir / "blog/settings.py"
+    settings_file_path = get_settings_path(tmp_dir)
     settings_content = settings_file_path.read_text()
     new_settings_content = settings_content.replace(
         "# Third party apps.", '# Third party apps.\n    "simple_deploy",'
@@ -252,6 +259,8 @@ def reset_test_project(tmp_dir, pkg_manager):
     # Make sure we have a clean status before calling deploy.
     subprocess.run(["git", "commit", "-am", "Added simple_deploy to INSTALLED_APPS."])
 
+    project_snapshots.capture_snapshot(tmp_dir, pkg_manager)
+
 
 def call_simple_deploy(tmp_dir, sd_command, platform=None):
     """Make a call to deploy, using the arguments passed in sd_command.
@@ -310,6 +319,84 @@ def call_simple_deploy(tmp_dir, sd_command, platform=None):
     return stdout, stderr
 
 
+def call_simple_deploy_in_process(tmp_dir, sd_command, platform=None):
+    """Make a call to deploy in the current process, instead of in a subprocess.
+
+    This skips the cost of starting a new interpreter, booting Django, and finding and
+    importing the plugin on every call. It accepts the same sd_command strings as
+    call_simple_deploy(), and returns output in the same form.
+
+    Each call gets:
+    - The test project's settings, applied with override_settings();
+    - A freshly initialized sd_config;
+    - A plugin manager with nothing registered;
+    - Its own log file in the test project's simple_deploy_logs/ dir.
+
+    The plugin must be installed in the environment that's running the tests.
+
+    Returns:
+    - stdout, stderr
+
+    These are both strings.
+    """
+    os.chdir(tmp_dir)
+
+    # Build the same set of args that call_simple_deploy() would use.
+    cmd_parts = split(sd_command)
+    deploy_args = cmd_parts[cmd_parts.index("deploy") + 1 :]
+    deploy_args.append("--unit-testing")
+    if platform in ("fly_io", "flyio", "platform_sh", "platformsh"):
+        deploy_args += ["--deployed-project-name", "my_blog_project"]
+    print(f"*** in-process deploy args: {deploy_args} ***")
+
+    if not settings.configured:
+        # Project settings are applied per call. Django requires a SECRET_KEY whenever
+        #   overridden settings are restored, so the base configuration needs one too.
+        settings.configure(SECRET_KEY="in-process-deploy-testing")
+        django.setup()
+
+    stdout, stderr = StringIO(), StringIO()
+    project_settings = _load_project_settings(tmp_dir)
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    root_logger.handlers = []
+
+    sd_config.__init__()
+    _unregister_plugins()
+    try:
+        with override_settings(**project_settings):
+            call_command(DeployCommand(), *deploy_args, stdout=stdout, stderr=stderr)
+    except CommandError as e:
+        # Match the output of a failed call from the command line.
+        stderr.write(f"{e.__class__.__name__}: {e}\n")
+    except SystemExit:
+        # Cancelling --automate-all exits without an error.
+        pass
+    finally:
+        _unregister_plugins()
+        for handler in root_logger.handlers:
+            handler.close()
+        root_logger.handlers = saved_handlers
+
+    return stdout.getvalue(), stderr.getvalue()
+
+
+def get_settings_path(tmp_dir):
+    """Get the path to settings.py in a test project.
+
+    Handles both the standard and the nested version of the sample project.
+
+    Returns:
+    - Path
+    """
+    for rel_path in ("blog/settings.py", "blog/blog/settings.py"):
+        settings_path = Path(tmp_dir) / rel_path
+        if settings_path.exists():
+            return settings_path
+
+    raise FileNotFoundError(f"Could not find settings.py in {tmp_dir}.")
+
+
 def make_git_call(tmp_dir, git_call):
     """Make a git call against the test project.
     Returns:
@@ -322,3 +409,34 @@ def make_git_call(tmp_dir, git_call):
     stdout, stderr = git_call_object.communicate()
 
     return stdout, stderr
+
+
+# --- Helper functions ---
+
+
+def _load_project_settings(tmp_dir):
+    """Load the test project's settings, without importing the settings module.
+
+    Settings that would reconfigure the app registry or database connections of the
+    test process are left out; deploy doesn't need them.
+
+    Returns:
+    - dict: Setting names and values.
+    """
+    manage_py_text = (Path(tmp_dir) / "manage.py").read_text()
+    m = re.search(r"DJANGO_SETTINGS_MODULE['\"],\s*['\"]([\w.]+)['\"]", manage_py_text)
+    settings_path = Path(tmp_dir) / (m.group(1).replace(".", "/") + ".py")
+
+    skipped_settings = ("INSTALLED_APPS", "DATABASES")
+    settings_namespace = runpy.run_path(str(settings_path))
+    return {
+        name: value
+        for name, value in settings_namespace.items()
+        if name.isupper() and name not in skipped_settings
+    }
+
+
+def _unregister_plugins():
+    """Unregister everything from the plugin manager, so each call starts fresh."""
+    for _, plugin in pm.list_name_plugin():
+        pm.unregister(plugin)
@@ -0,0 +1,149 @@
+"""Capture and restore snapshots of the temp test project.
+
+Resetting the test project with git means a hard reset, a hardcoded list of files
+that plugins might have written, several commits, and a rewrite of settings.py for
+every test module. A snapshot is just a copy of the whole project directory, taken
+once the project is in a known state. Restoring a snapshot removes everything in the
+project directory and copies the snapshot back, so nothing needs to know which files
+a plugin might have written.
+
+The virtual environment is never snapshotted. Running deploy doesn't modify it, and
+it's much larger than the rest of the project.
+
+Files are copied with os.copy_file_range() where it's available; that's a reflink on
+filesystems that support copy-on-write, such as Btrfs and XFS. Git objects are
+hardlinked, because git never modifies an object file after writing it. Everything
+else is a real copy, because deploy modifies files such as settings.py in place,
+which would modify a hardlinked snapshot as well.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+
+# Entries in the project root that are left alone when capturing and restoring.
+EXCLUDED_ENTRIES = ("b_env",)
+
+
+def get_snapshot_dir(proj_dir, name):
+    """Get the path to a named snapshot of the project.
+
+    Snapshots are stored next to the project, not inside it, so they don't affect
+    `git status` in the project.
+
+    Returns:
+    - Path
+    """
+    proj_dir = Path(proj_dir)
+    return proj_dir.parent / f"{proj_dir.name}_snapshots" / name
+
+
+def snapshot_exists(proj_dir, name):
+    """Check whether a named snapshot has been captured."""
+    return get_snapshot_dir(proj_dir, name).exists()
+
+
+def capture_snapshot(proj_dir, name):
+    """Capture the current state of the project as a named snapshot.
+
+    Replaces any existing snapshot with the same name.
+
+    Returns:
+    - None
+    """
+    proj_dir = Path(proj_dir)
+    snapshot_dir = get_snapshot_dir(proj_dir, name)
+    if snapshot_dir.exists():
+        shutil.rmtree(snapshot_dir)
+    snapshot_dir.mkdir(parents=True)
+
+    _copy_entries(proj_dir, snapshot_dir)
+
+
+def restore_snapshot(proj_dir, name):
+    """Restore the project to the state of a named snapshot.
+
+    Everything in the project root except the excluded entries is removed, including
+    any files a previous deploy run wrote.
+
+    Returns:
+    - None
+    """
+    proj_dir = Path(proj_dir)
+    snapshot_dir = get_snapshot_dir(proj_dir, name)
+    if not snapshot_dir.exists():
+        raise FileNotFoundError(f"No snapshot named {name} for {proj_dir}.")
+
+    for entry in os.scandir(proj_dir):
+        if entry.name in EXCLUDED_ENTRIES:
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+    _copy_entries(snapshot_dir, proj_dir)
+
+
+# --- Helper functions ---
+
+
+def _copy_entries(src_dir, dest_dir):
+    """Copy every non-excluded entry in src_dir to dest_dir."""
+    for entry in os.scandir(src_dir):
+        if entry.name in EXCLUDED_ENTRIES:
+            continue
+
+        src_path = Path(entry.path)
+        dest_path = Path(dest_dir) / entry.name
+        if entry.is_dir(follow_symlinks=False):
+            shutil.copytree(
+                src_path, dest_path, symlinks=True, copy_function=_copy_file
+            )
+        else:
+            _copy_file(src_path, dest_path)
+
+
+def _copy_file(src, dest):
+    """Copy a single file as cheaply as is safe.
+
+    Returns:
+    - Path of the new file.
+    """
+    src, dest = Path(src), Path(dest)
+
+    if src.is_symlink():
+        os.symlink(os.readlink(src), dest)
+        return dest
+
+    # Git object files are immutable, so a hardlink is safe.
+    if "objects" in src.parts and ".git" in src.parts:
+        try:
+            os.link(src, dest)
+            return dest
+        except OSError:
+            pass
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(src, dest)
+            shutil.copystat(src, dest)
+            return dest
+        except OSError:
+            # Fall back to a regular copy, ie across filesystems.
+            pass
+
+    shutil.copy2(src, dest)
+    return dest
+
+
+def _copy_file_range(src, dest):
+    """Copy a file with os.copy_file_range(), which can share extents."""
+    with open(src, "rb") as f_src, open(dest, "wb") as f_dest:
+        remaining = os.fstat(f_src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(f_src.fileno(), f_dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
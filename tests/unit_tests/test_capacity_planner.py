@@ -0,0 +1,75 @@
+"""Test sizing app server workers."""
+
+from textwrap import dedent
+
+from simple_deploy.management.commands.utils import capacity_planner
+
+import pytest
+
+
+# --- Worker sizing ---
+
+
+@pytest.mark.parametrize(
+    "profile, workers, threads", [("cpu", 3, 1), ("mixed", 5, 2), ("io", 5, 4)]
+)
+def test_plan_workers_cpu_limited(profile, workers, threads):
+    """Plenty of memory, so the number of workers depends on CPUs."""
+    plan = capacity_planner.plan_workers(
+        cpus=2, memory_mb=4096, worker_rss_mb=80, profile=profile
+    )
+    assert plan["workers"] == workers
+    assert plan["threads"] == threads
+    assert plan["max_requests"] == 1000
+    assert not plan["memory_limited"]
+
+
+def test_plan_workers_memory_limited():
+    """A large project on a small instance gets fewer workers, with more threads."""
+    plan = capacity_planner.plan_workers(
+        cpus=2, memory_mb=512, worker_rss_mb=120, profile="io"
+    )
+    # 512 MB less 102 MB headroom fits two workers at 180 MB each.
+    assert plan["workers"] == 2
+    assert plan["threads"] == 8
+    assert plan["max_requests"] == 500
+    assert plan["max_requests_jitter"] == 50
+    assert plan["memory_limited"]
+
+
+def test_plan_workers_always_one_worker():
+    plan = capacity_planner.plan_workers(cpus=1, memory_mb=128, worker_rss_mb=200)
+    assert plan["workers"] == 1
+
+
+def test_plan_workers_invalid_profile():
+    with pytest.raises(ValueError):
+        capacity_planner.plan_workers(profile="gpu")
+
+
+def test_measure_worker_rss_with_output(tmp_path):
+    """Output from the project while it boots doesn't break the measurement."""
+    (tmp_path / "noisy_settings.py").write_text(
+        dedent(
+            """\
+            print("Loading settings...")
+            SECRET_KEY = "probe"
+            WSGI_APPLICATION = "noisy_wsgi.application"
+            """
+        )
+    )
+    (tmp_path / "noisy_wsgi.py").write_text(
+        dedent(
+            """\
+            from django.core.wsgi import get_wsgi_application
+            print("Loading WSGI application...")
+            application = get_wsgi_application()
+            """
+        )
+    )
+    rss_mb = capacity_planner.measure_worker_rss(tmp_path, "noisy_settings")
+    assert rss_mb is None or rss_mb > 0
+
+    # Without a report, the planner falls back to a default value.
+    (tmp_path / "noisy_settings.py").write_text("import sys\nsys.exit()\n")
+    assert capacity_planner.measure_worker_rss(tmp_path, "noisy_settings") is None
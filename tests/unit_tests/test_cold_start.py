@@ -0,0 +1,61 @@
+"""Test cold start analysis."""
+
+from textwrap import dedent
+
+from simple_deploy.management.commands.utils import cold_start
+
+import pytest
+
+
+# --- Cold start analysis ---
+
+
+def test_parse_importtime():
+    importtime_output = """\
+import time: self [us] | cumulative | imported package
+import time:       241 |        241 | _io
+import time:        85 |         85 |   blog.helpers
+import time:      1203 |       1288 | blog.settings
+Traceback (most recent call last):"""
+    imports = cold_start.parse_importtime(importtime_output)
+
+    assert [i["name"] for i in imports] == ["_io", "blog.helpers", "blog.settings"]
+    assert [i["depth"] for i in imports] == [0, 1, 0]
+    assert imports[2]["self_us"] == 1203
+    assert imports[2]["cumulative_us"] == 1288
+
+    slowest = cold_start.get_slowest_imports(imports, count=2)
+    assert [i["name"] for i in slowest] == ["blog.settings", "_io"]
+
+
+def test_run_boot_probe_with_output(tmp_path):
+    """Output from the project while it boots doesn't get mixed into the report."""
+    (tmp_path / "noisy_settings.py").write_text(
+        dedent(
+            """\
+            print("Loading settings...")
+            SECRET_KEY = "probe"
+            INSTALLED_APPS = ["django.contrib.contenttypes"]
+            WSGI_APPLICATION = "noisy_wsgi.application"
+            """
+        )
+    )
+    (tmp_path / "noisy_wsgi.py").write_text(
+        dedent(
+            """\
+            from django.core.wsgi import get_wsgi_application
+            print("Loading WSGI application...")
+            application = get_wsgi_application()
+            """
+        )
+    )
+    report = cold_start.run_boot_probe(tmp_path, "noisy_settings")
+
+    assert list(report["apps"]) == ["django.contrib.contenttypes"]
+    assert "noisy_wsgi" in report["modules"]
+    assert "django.conf" in [i["name"] for i in report["imports"]]
+
+    # A project that exits while it's being imported never writes a report.
+    (tmp_path / "noisy_settings.py").write_text("import sys\nsys.exit()\n")
+    with pytest.raises(cold_start.ProbeReportError):
+        cold_start.run_boot_probe(tmp_path, "noisy_settings")
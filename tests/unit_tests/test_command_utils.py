@@ -0,0 +1,109 @@
+"""Tests for plugin_utils functions that run commands.
+
+These use fake CLI executables, so the code paths used by --automate-all can be
+tested without network access or platform accounts.
+"""
+
+import subprocess
+import sys
+import time
+from io import StringIO
+
+from simple_deploy.management.commands.utils import plugin_utils
+from simple_deploy.management.commands.utils.plugin_utils import sd_config
+
+import pytest
+
+
+# --- Fixtures ---
+
+# The fake_cli fixture is defined in the root conftest.py.
+
+
+@pytest.fixture()
+def output():
+    """Capture output written through plugin_utils.write_output()."""
+    orig_stdout, orig_log_output = sd_config.stdout, sd_config.log_output
+    sd_config.stdout = StringIO()
+    sd_config.log_output = False
+    yield sd_config.stdout
+    sd_config.stdout, sd_config.log_output = orig_stdout, orig_log_output
+
+
+# --- Test functions ---
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake CLIs use shebang scripts.")
+def test_run_quick_command_json_response(fake_cli):
+    fake_cli.add_command(
+        "fakeplatform",
+        responses=[{"match": ["apps", "list"], "json": [{"name": "my-app"}]}],
+    )
+
+    output = plugin_utils.run_quick_command("fakeplatform apps list --json")
+
+    assert output.returncode == 0
+    assert output.stdout.decode() == '[{"name": "my-app"}]'
+    assert fake_cli.invocations("fakeplatform")[0]["args"] == [
+        "apps",
+        "list",
+        "--json",
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake CLIs use shebang scripts.")
+def test_run_slow_command_streams_output(fake_cli, output):
+    fake_cli.add_command(
+        "fakeplatform",
+        responses=[
+            {
+                "match": ["deploy"],
+                "stderr": "Building image...\nPushing image...\nDeployed.\n",
+                "latency": 0.05,
+                "line_delay": 0.05,
+            }
+        ],
+    )
+
+    start = time.perf_counter()
+    plugin_utils.run_slow_command("fakeplatform deploy")
+    elapsed = time.perf_counter() - start
+
+    assert output.getvalue() == "Building image...\nPushing image...\nDeployed.\n"
+    assert elapsed >= 0.2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake CLIs use shebang scripts.")
+def test_run_slow_command_injected_failure(fake_cli, output):
+    fake_cli.add_command(
+        "fakeplatform",
+        responses=[
+            {
+                "match": ["deploy"],
+                "stderr": "Deployed.\n",
+                "fail_times": 1,
+                "failure": {"stderr": "Error: builder unavailable\n", "returncode": 2},
+            }
+        ],
+    )
+
+    with pytest.raises(subprocess.CalledProcessError):
+        plugin_utils.run_slow_command("fakeplatform deploy")
+    assert "builder unavailable" in output.getvalue()
+
+    # The second attempt succeeds.
+    plugin_utils.run_slow_command("fakeplatform deploy")
+    assert output.getvalue().endswith("Deployed.\n")
+    assert [r["attempt"] for r in fake_cli.invocations()] == [1, 2]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Fake CLIs use shebang scripts.")
+def test_fake_git_push_and_passthrough(fake_cli, output, tmp_path):
+    fake_cli.add_git(push_response={"stderr": "To fake-remote\n"})
+
+    plugin_utils.run_slow_command("git push fake-remote main")
+    version_output = plugin_utils.run_quick_command("git --version")
+
+    assert output.getvalue() == "To fake-remote\n"
+    assert version_output.stdout.decode().startswith("git version")
+    assert [r["args"][0] for r in fake_cli.invocations("git")] == ["push", "--version"]
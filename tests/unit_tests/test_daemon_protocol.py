@@ -0,0 +1,28 @@
+"""Test the deploy daemon's protocol helpers."""
+
+import os
+
+from simple_deploy.management.commands.utils import daemon_protocol
+
+
+# --- Deploy daemon ---
+
+
+def test_daemon_finds_project_root_and_changes(tmp_path):
+    (tmp_path / "manage.py").write_text("")
+    settings_path = tmp_path / "blog" / "settings.py"
+    settings_path.parent.mkdir()
+    settings_path.write_text("DEBUG = True\n")
+
+    project_root = daemon_protocol.find_project_root(settings_path.parent)
+    assert project_root == tmp_path.resolve()
+    socket_path = daemon_protocol.get_socket_path(project_root)
+    assert socket_path == daemon_protocol.get_socket_path(settings_path.parent.parent)
+    assert len(str(socket_path)) < 100
+
+    snapshot = daemon_protocol.snapshot([str(settings_path)])
+    assert daemon_protocol.get_changed_paths(snapshot) == []
+
+    stat = settings_path.stat()
+    os.utime(settings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert daemon_protocol.get_changed_paths(snapshot) == [str(settings_path)]
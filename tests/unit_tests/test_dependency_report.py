@@ -0,0 +1,34 @@
+"""Test the dependency footprint report."""
+
+from simple_deploy.management.commands.utils import dependency_report
+
+
+
+# --- Dependency report ---
+
+
+def test_build_dependency_report():
+    """Requirements that aren't imported at boot are flagged as unused."""
+    boot_report = {
+        "modules": ["django.conf", "asgiref"],
+        "imports": [
+            {"name": "asgiref", "self_us": 700, "cumulative_us": 700, "depth": 2},
+            {"name": "django.utils", "self_us": 800, "cumulative_us": 1500, "depth": 1},
+            {"name": "django", "self_us": 500, "cumulative_us": 2000, "depth": 0},
+            {"name": "django.conf", "self_us": 1700, "cumulative_us": 1700, "depth": 0},
+        ],
+    }
+    report = dependency_report.build_report(
+        ["django", "asgiref", "pytest", "not-an-installed-package"], boot_report
+    )
+
+    entries = {e["name"]: e for e in report["requirements"]}
+    assert entries["django"]["imported_at_boot"]
+    assert entries["django"]["import_ms"] == 3.0
+    # Packages only imported by other packages are timed as well.
+    assert entries["asgiref"]["import_ms"] == 0.7
+    assert entries["django"]["size_bytes"] > 0
+    assert not entries["pytest"]["imported_at_boot"]
+    assert report["unused"] == ["pytest"]
+    assert report["not_installed"] == ["not-an-installed-package"]
+    assert report["heaviest"][0] == "django"
@@ -0,0 +1,66 @@
+"""Tests for parts of the deploy command that don't need a full run."""
+
+from io import StringIO
+from types import SimpleNamespace
+
+from simple_deploy.management.commands import deploy
+from simple_deploy.management.commands.utils import cold_start
+from simple_deploy.management.commands.utils import log_retention
+from simple_deploy.management.commands.utils.plugin_utils import sd_config
+from simple_deploy.management.commands.utils.command_errors import (
+    SimpleDeployCommandError,
+)
+
+import pytest
+
+
+def test_analyze_migrations_without_logging(tmp_path, monkeypatch):
+    """--analyze-migrations reads past runs even when --no-logging is passed."""
+    log_dir = tmp_path / "simple_deploy_logs"
+    log_dir.mkdir()
+    deployment = {
+        "log": "simple_deploy_2024-05-01-100000.log",
+        "timestamp": "2024-05-01T10:00:00",
+        "outcome": "succeeded",
+        "migrations": ["blog.0001_initial"],
+    }
+    log_retention.record_run(log_dir, deployment)
+
+    monkeypatch.setattr(deploy, "settings", SimpleNamespace(BASE_DIR=tmp_path))
+    monkeypatch.setattr(sd_config, "stdout", StringIO())
+    monkeypatch.setattr(sd_config, "log_output", False)
+    monkeypatch.setattr(sd_config, "automate_all", False)
+
+    scanned = []
+
+    def scan(deployment=None):
+        scanned.append(deployment)
+        return {
+            "baseline": "deployed",
+            "deployed_at": deployment["timestamp"],
+            "migrations": [],
+        }
+
+    monkeypatch.setattr(deploy.migration_risk, "scan", scan)
+
+    command = deploy.Command()
+    command.analyze_migrations = True
+    command.max_migration_risk = "medium"
+    command._analyze_migrations()
+
+    assert scanned == [deployment]
+    assert "2024-05-01T10:00:00" in sd_config.stdout.getvalue()
+
+
+def test_get_boot_report_invalid_report(monkeypatch):
+    """A probe that doesn't write a report is a command error, not a traceback."""
+    monkeypatch.setattr(sd_config, "log_output", False)
+    monkeypatch.setattr(deploy, "settings", SimpleNamespace(SETTINGS_MODULE="blog"))
+
+    def run_boot_probe(project_root, settings_module):
+        raise cold_start.ProbeReportError("No such file: report.json")
+
+    monkeypatch.setattr(cold_start, "run_boot_probe", run_boot_probe)
+
+    with pytest.raises(SimpleDeployCommandError, match="report.json"):
+        deploy.Command()._get_boot_report()
@@ -0,0 +1,43 @@
+"""Test analysis of the Docker build context."""
+
+import subprocess
+
+from simple_deploy.management.commands.utils import docker_context
+
+
+# --- Docker build context ---
+
+
+def test_analyze_docker_context(tmp_path):
+    """Tracked files are kept; heavy untracked dirs and venvs are ignored."""
+    (tmp_path / "blog").mkdir()
+    (tmp_path / "blog" / "settings.py").write_text("DEBUG = False\n")
+    (tmp_path / "manage.py").write_text("# manage.py\n")
+    (tmp_path / "fixtures.sqlite3").write_text("Tracked, so it's kept.\n")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    (tmp_path / "db.sqlite3").write_text("Untracked, so it's ignored.\n")
+
+    venv_dir = tmp_path / "b_env"
+    venv_dir.mkdir()
+    (venv_dir / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (tmp_path / "node_cache").mkdir()
+    (tmp_path / "node_cache" / "bundle.bin").write_bytes(b"0" * 2 * 1024**2)
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "todo.txt").write_text("Small untracked files are kept.\n")
+    (tmp_path / ".dockerignore").write_text("*.log")
+
+    analysis = docker_context.analyze_context(tmp_path)
+
+    assert analysis["existing_patterns"] == ["*.log"]
+    assert ".git" in analysis["new_patterns"]
+    assert "b_env" in analysis["new_patterns"]
+    assert "node_cache" in analysis["new_patterns"]
+    assert "notes" not in analysis["new_patterns"]
+    assert "*.sqlite3" not in analysis["new_patterns"]
+    assert "db.sqlite3" in analysis["new_patterns"]
+    assert analysis["size_after"] < 1024 < analysis["size_before"]
+
+    contents = docker_context.merge_dockerignore("*.log", analysis["new_patterns"])
+    assert contents.startswith("*.log\n\n# Added by simple_deploy")
+    assert contents.endswith(".git\ndb.sqlite3\nb_env\nnode_cache\n")
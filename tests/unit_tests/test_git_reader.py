@@ -0,0 +1,157 @@
+"""Test the in-process git reader against the git CLI."""
+
+import os
+import shutil
+import subprocess
+
+from simple_deploy.management.commands.utils import git_reader
+
+import pytest
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="Needs git.")
+
+
+# --- Fixtures ---
+
+
+@pytest.fixture
+def repo_dir(tmp_path, monkeypatch):
+    """A repository with one commit, and config that doesn't depend on the user's."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / ".config"))
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+
+    repo_dir = tmp_path / "repo"
+    (repo_dir / "blog").mkdir(parents=True)
+    (repo_dir / "blog" / "settings.py").write_text("DEBUG = True\n")
+    (repo_dir / "manage.py").write_text("")
+    (repo_dir / ".gitignore").write_text("*.pyc\n__pycache__/\n")
+
+    git(repo_dir, "init", "-q", "-b", "main")
+    git(repo_dir, "add", ".")
+    git(repo_dir, "commit", "-qm", "Initial commit.")
+    return repo_dir
+
+
+# --- Helper functions ---
+
+
+def git(repo_dir, *args):
+    """Run git, and return its output."""
+    output = subprocess.run(["git", *args], cwd=repo_dir, capture_output=True)
+    return output.stdout.decode()
+
+
+def assert_status_matches(repo_dir):
+    repo = git_reader.find_repo(repo_dir / "blog")
+    assert repo.get_porcelain_status() == git(repo_dir, "status", "--porcelain")
+
+
+def pack_paths(repo_dir):
+    """Get the paths of the repository's pack indexes."""
+    pack_dir = repo_dir / ".git" / "objects" / "pack"
+    return [str(path) for path in pack_dir.glob("*.idx")]
+
+
+# --- Tests ---
+
+
+def test_read_head(repo_dir):
+    repo = git_reader.find_repo(repo_dir / "blog")
+    assert repo.work_tree == repo_dir.resolve()
+    assert repo.read_head() == ("main", git(repo_dir, "rev-parse", "HEAD").strip())
+
+
+def test_clean_and_simple_deploy_changes(repo_dir):
+    assert_status_matches(repo_dir)
+
+    with open(repo_dir / ".gitignore", "a") as f:
+        f.write("simple_deploy_logs/\n")
+    with open(repo_dir / "blog" / "settings.py", "a") as f:
+        f.write('INSTALLED_APPS.append("simple_deploy")\n')
+    (repo_dir / "simple_deploy_logs").mkdir()
+    (repo_dir / "simple_deploy_logs" / "deploy.log").write_text("log")
+    (repo_dir / "blog" / "settings.pyc").write_text("")
+    assert_status_matches(repo_dir)
+
+    repo = git_reader.find_repo(repo_dir)
+    diff = repo.get_diff(["blog/settings.py"])
+    assert diff.splitlines()[-1] == '+INSTALLED_APPS.append("simple_deploy")'
+
+
+def test_staged_deleted_and_untracked(repo_dir):
+    (repo_dir / "new_app").mkdir()
+    (repo_dir / "new_app" / "models.py").write_text("")
+    (repo_dir / "notes.txt").write_text("")
+    git(repo_dir, "add", "notes.txt")
+    os.remove(repo_dir / "manage.py")
+    with open(repo_dir / "blog" / "settings.py", "a") as f:
+        f.write("DEBUG = False\n")
+    git(repo_dir, "add", "blog/settings.py")
+    assert_status_matches(repo_dir)
+
+
+def test_packed_repo(repo_dir):
+    """A clone or gc packs refs and objects, including deltas against other objects."""
+    settings_path = repo_dir / "blog" / "settings.py"
+    lines = [f"SETTING_{i} = {i}\n" for i in range(200)]
+    settings_path.write_text("".join(lines))
+    git(repo_dir, "commit", "-qam", "Add settings.")
+    settings_path.write_text("".join(lines + ["DEBUG = False\n"]))
+    git(repo_dir, "commit", "-qam", "Turn off DEBUG.")
+    git(repo_dir, "gc", "-q", "--aggressive")
+    assert not (repo_dir / ".git" / "refs" / "heads" / "main").exists()
+    assert "delta" in git(repo_dir, "verify-pack", "-v", *pack_paths(repo_dir))
+
+    repo = git_reader.find_repo(repo_dir)
+    assert repo.read_head() == ("main", git(repo_dir, "rev-parse", "HEAD").strip())
+    for rev in ("HEAD:blog/settings.py", "HEAD~:blog/settings.py"):
+        sha = git(repo_dir, "rev-parse", rev).strip()
+        obj_type, contents = repo.read_object(sha)
+        assert (obj_type, contents.decode()) == ("blob", git(repo_dir, "show", rev))
+    head_tree = git(repo_dir, "rev-parse", "HEAD^{tree}").strip()
+    assert set(repo.read_tree(head_tree)) == {".gitignore", "blog", "manage.py"}
+
+    settings_path.write_text("DEBUG = True\n")
+    git(repo_dir, "add", "blog/settings.py")
+    (repo_dir / "notes.txt").write_text("")
+    assert_status_matches(repo_dir)
+
+
+def test_index_v4_needs_git_cli(repo_dir):
+    git(repo_dir, "update-index", "--index-version", "4")
+    repo = git_reader.find_repo(repo_dir)
+    with pytest.raises(git_reader.GitReaderError):
+        repo.read_index()
+
+
+def test_worktree(repo_dir):
+    worktree_dir = repo_dir.parent / "worktree"
+    git(repo_dir, "worktree", "add", "-q", str(worktree_dir))
+    with open(worktree_dir / "manage.py", "a") as f:
+        f.write("# Changed in worktree.\n")
+
+    repo = git_reader.find_repo(worktree_dir)
+    assert repo.read_head()[0] == "worktree"
+    assert repo.get_porcelain_status() == git(worktree_dir, "status", "--porcelain")
+
+
+def test_filters_need_git_cli(repo_dir):
+    """Files converted by attributes can't be compared by hashing them directly."""
+    (repo_dir / ".gitattributes").write_text("*.py text eol=crlf\n")
+    settings_path = repo_dir / "blog" / "settings.py"
+    settings_path.write_bytes(b"DEBUG = True\r\n")
+    git(repo_dir, "add", ".")
+    git(repo_dir, "commit", "-qm", "Add attributes.")
+    assert git(repo_dir, "status", "--porcelain") == ""
+
+    # Only the timestamp changes, so the contents have to be compared.
+    st = settings_path.stat()
+    os.utime(settings_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    repo = git_reader.find_repo(repo_dir)
+    with pytest.raises(git_reader.GitReaderError):
+        repo.get_status()
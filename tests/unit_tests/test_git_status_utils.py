@@ -27,6 +27,12 @@ def test_simple_git_status():
     status_output, diff_output = " M blog/settings.py\n?? simple_deploy_logs/", ""
     assert sd_utils.check_status_output(status_output, diff_output)
 
+    status_output = "?? simple_deploy_logs/\n?? services/blog/simple_deploy_logs/"
+    assert sd_utils.check_status_output(status_output, "")
+
+    status_output = "?? simple_deploy_logs/\n?? notes.txt"
+    assert not sd_utils.check_status_output(status_output, "")
+
 
 # --- Tests for checking overall git diff ---
 
@@ -195,6 +201,46 @@ def test_clean_diff_gitignore():
     assert sd_utils._check_gitignore_diff(diff_output.splitlines())
 
 
+def test_gitignore_diff_build_dir():
+    """A run with --precompress-static adds a second entry to .gitignore."""
+    diff_output = dedent(
+        """\
+        diff --git a/.gitignore b/.gitignore
+        index 9c96d1b..95a2c40 100644
+        --- a/.gitignore
+        +++ b/.gitignore
+        @@ -8,0 +9,4 @@ db.sqlite3
+        +
+        +simple_deploy_logs/
+        +
+        +simple_deploy_build/"""
+    )
+
+    assert sd_utils._check_gitignore_diff(diff_output.splitlines())
+    assert sd_utils.check_status_output(" M .gitignore\n", diff_output)
+
+    diff_output += "\n+notes.txt"
+    assert not sd_utils._check_gitignore_diff(diff_output.splitlines())
+
+
+def test_gitignore_diff_wheelhouse_rerun():
+    """After --build-wheelhouse, only the build dir has been added to .gitignore."""
+    diff_output = dedent(
+        """\
+        diff --git a/.gitignore b/.gitignore
+        index 4279ffb..5b1e0a2 100644
+        --- a/.gitignore
+        +++ b/.gitignore
+        @@ -11,0 +12,2 @@ simple_deploy_logs/
+        +
+        +simple_deploy_build/"""
+    )
+
+    status_output = " M .gitignore\n M requirements.txt\n"
+    assert sd_utils.check_status_output(" M .gitignore\n", diff_output)
+    assert not sd_utils.check_status_output(status_output, diff_output)
+
+
 def test_clean_diff_settings():
     diff_output = dedent(
         """\
@@ -0,0 +1,84 @@
+"""Test the log index, and reading logs."""
+
+from datetime import datetime
+
+from simple_deploy.management.commands.utils import log_retention
+from simple_deploy.management.commands.utils import log_index
+
+
+# --- Log index ---
+
+
+def test_log_index_updates_incrementally(tmp_path, monkeypatch):
+    log_path = tmp_path / log_retention.get_log_name(datetime(2026, 10, 19, 10, 0))
+    prefix = "2026-10-19 10:00:00,000 INFO: "
+    log_path.write_text(
+        f"{prefix}Phase: inspect\n{prefix}\n{prefix}SimpleDeployCommandError:\n"
+    )
+    log_retention.record_run(tmp_path, {"log": log_path.name, "outcome": "failed"})
+
+    # Record the line each parse starts from.
+    parsed = []
+    parse = log_index._parse
+
+    def record_parse(f, entry, complete):
+        parsed.append(entry["lines"])
+        parse(f, entry, complete)
+
+    monkeypatch.setattr(log_index, "_parse", record_parse)
+
+    # The error message is on a line that hasn't been written yet.
+    (run,) = log_index.get_runs(tmp_path)
+    assert run["phase"] == "inspect"
+    assert run["outcome"] == "failed"
+    assert run["errors"] == []
+
+    # Only the new lines are parsed; the partial line is left for later.
+    with open(log_path, "a") as f:
+        f.write(f"{prefix}\n{prefix}Could not find a .git/ directory.\n{prefix}Ph")
+    (run,) = log_index.get_runs(tmp_path)
+    assert parsed == [0, 3]
+    assert run["errors"] == [[5, "Could not find a .git/ directory."]]
+
+    # Unchanged and compressed logs aren't parsed again.
+    with open(log_path, "a") as f:
+        f.write("ase: confirm\n")
+    log_index.get_runs(tmp_path)
+    log_index.get_runs(tmp_path)
+    log_retention.compress_logs([log_path])
+    (run,) = log_index.get_runs(tmp_path)
+    assert parsed == [0, 3, 5]
+    assert run["path"].name == f"{log_path.name}.gz"
+    assert [phase for phase, _line in run["phases"]] == ["inspect", "confirm"]
+
+
+def test_tail_and_follow_logs(tmp_path):
+    log_path = tmp_path / log_retention.get_log_name(datetime(2026, 10, 19, 10, 0))
+    lines = [f"Line {i}" for i in range(2000)]
+    log_path.write_text("".join(f"{line}\n" for line in lines))
+    assert log_index.tail_lines(log_path, 3) == lines[-3:]
+
+    # Lines written after the offset is taken aren't in the tail.
+    offset = log_path.stat().st_size
+    with open(log_path, "a") as f:
+        f.write("Line 2000\n")
+    assert log_index.tail_lines(log_path, 3, end=offset) == lines[-3:]
+
+    # A run that stops writing without being recorded is followed until it's idle.
+    follow = log_index.follow(log_path, tmp_path, offset, idle_timeout=0)
+    assert list(follow) == ["Line 2000"]
+
+    # Follow yields lines written after it starts, until the run is recorded.
+    log_path.write_text("".join(f"{line}\n" for line in lines))
+    follow = log_index.follow(log_path, tmp_path, offset, poll_interval=0)
+    with open(log_path, "a") as f:
+        f.write("Line 2000\nLine 20")
+    assert next(follow) == "Line 2000"
+    with open(log_path, "a") as f:
+        f.write("01\n")
+    log_retention.record_run(tmp_path, {"log": log_path.name, "outcome": "succeeded"})
+    assert list(follow) == ["Line 2001"]
+
+    log_retention.compress_logs([log_path])
+    gz_path = tmp_path / f"{log_path.name}.gz"
+    assert log_index.tail_lines(gz_path, 3) == ["Line 1999", "Line 2000", "Line 2001"]
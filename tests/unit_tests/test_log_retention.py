@@ -0,0 +1,62 @@
+"""Test log retention and compression."""
+
+from pathlib import Path
+from datetime import datetime, timedelta
+import gzip
+
+from simple_deploy.management.commands.utils import log_retention
+
+
+# --- Log retention ---
+
+
+def test_get_expired_logs():
+    now = datetime(2024, 5, 1)
+    logs = [
+        (now - timedelta(days=days), Path(f"{days}.log"))
+        for days in (200, 30, 3, 2, 1, 0)
+    ]
+    current_log = Path("0.log")
+    sizes = {path: 10 * 1024 * 1024 for _timestamp, path in logs}
+
+    def get_expired(max_count, max_age_days, max_size_mb):
+        return log_retention.get_expired_logs(
+            logs, sizes, current_log, max_count, max_age_days, max_size_mb, now=now
+        )
+
+    assert get_expired(0, 0, 0) == []
+    assert get_expired(0, 90, 0) == [Path("200.log")]
+    assert get_expired(3, 0, 0) == [Path("200.log"), Path("30.log"), Path("3.log")]
+    assert get_expired(1, 0, 0) == [path for _timestamp, path in logs[:-1]]
+
+    # Two 10 MB logs fit in 25 MB, including the current log.
+    assert get_expired(0, 90, 25) == [path for _timestamp, path in logs[:-2]]
+
+
+def test_apply_retention_and_compression(tmp_path):
+    now = datetime.now()
+    paths = []
+    for days in (3, 2, 1, 0):
+        name = log_retention.get_log_name(now - timedelta(days=days))
+        paths.append(tmp_path / name)
+        paths[-1].write_text(f"Log from {days} day(s) ago.\n")
+        log_retention.record_run(tmp_path, {"log": name, "outcome": "succeeded"})
+    oldest, older, old, current = paths
+
+    removed = log_retention.apply_retention(tmp_path, current, max_count=3)
+    assert removed == [oldest]
+    assert [run["log"] for run in log_retention.read_runs(tmp_path)] == [
+        path.name for path in paths[1:]
+    ]
+
+    log_retention.start_compression(tmp_path, current).join()
+    assert not older.exists()
+    with gzip.open(tmp_path / f"{older.name}.gz", "rt") as f:
+        assert f.read() == "Log from 2 day(s) ago.\n"
+    assert current.exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "runs.jsonl",
+        f"{older.name}.gz",
+        f"{old.name}.gz",
+        current.name,
+    ]
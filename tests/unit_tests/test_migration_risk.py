@@ -0,0 +1,58 @@
+"""Test classifying the risk of unapplied migrations."""
+
+from simple_deploy.management.commands.utils import migration_risk
+
+from django.db import migrations, models
+from django.db.migrations.state import ModelState, ProjectState
+
+
+# --- Migration risk ---
+
+
+def test_classify_migration_operations():
+    state = ProjectState()
+    state.add_model(
+        ModelState("blogs", "blog", [("title", models.CharField(max_length=200))])
+    )
+
+    def classify(operation, created_models=set()):
+        risk, _reason = migration_risk.classify_operation(
+            operation, "blogs", state, created_models
+        )
+        return risk
+
+    add_nullable = migrations.AddField("blog", "note", models.TextField(null=True))
+    assert classify(add_nullable) == "low"
+    add_default = migrations.AddField("blog", "rank", models.IntegerField(default=0))
+    assert classify(add_default) == "medium"
+    alter_type = migrations.AlterField("blog", "title", models.TextField())
+    assert classify(alter_type) == "high"
+    add_index = migrations.AddIndex("blog", models.Index(fields=["title"], name="i"))
+    assert classify(add_index) == "high"
+    assert classify(migrations.RunPython(migrations.RunPython.noop)) == "high"
+
+    # Tables created earlier in the plan are empty, so changing them is low risk.
+    assert classify(add_index, {("blogs", "blog")}) == "low"
+
+    assert migration_risk.exceeds("high", "medium")
+    assert not migration_risk.exceeds("medium", "medium")
+    assert not migration_risk.exceeds(None, "low")
+
+
+def test_migration_baseline():
+    """Migrations are compared with the last recorded deployment, or an empty db."""
+    runs = [
+        {"timestamp": "2024-05-01T10:00:00", "migrations": ["blogs.0001_initial"]},
+        {"timestamp": "2024-05-02T10:00:00", "outcome": "failed"},
+    ]
+    deployment = migration_risk.get_last_deployment(runs)
+    assert deployment["timestamp"] == "2024-05-01T10:00:00"
+    assert migration_risk.get_last_deployment(runs[1:]) is None
+
+    report = {"baseline": "empty", "deployed_at": None, "migrations": []}
+    assert "an empty database" in migration_risk.format_report(report)
+    report = {"baseline": "deployed", "deployed_at": "2024-05-01T10:00:00"}
+    report["migrations"] = []
+    output = migration_risk.format_report(report)
+    assert "recorded as deployed on 2024-05-01T10:00:00" in output
+    assert output.endswith("No unapplied migrations.")
@@ -0,0 +1,111 @@
+"""Test the performance settings block written for production."""
+
+from types import SimpleNamespace
+
+from simple_deploy.management.commands.utils import performance_settings
+
+
+# --- Performance settings ---
+
+
+def _default_project_settings(**overrides):
+    """Settings matching a new project, for building performance settings."""
+    project_settings = {
+        "MIDDLEWARE": [
+            "django.middleware.security.SecurityMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+        ],
+        "TEMPLATES": [{"APP_DIRS": True, "OPTIONS": {}}],
+        "STORAGES": {
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        },
+        "CACHES": {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+    }
+    project_settings.update(overrides)
+    return SimpleNamespace(**project_settings)
+
+
+def test_performance_settings_defaults():
+    block = performance_settings.build_settings_block(
+        ["django"], _default_project_settings()
+    )
+
+    assert '_db["CONN_MAX_AGE"] = 600' in block
+    assert "ManifestStaticFilesStorage" in block
+    assert "Compressed" not in block
+    assert 'MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")' in block
+    assert "'django.core.files.storage.FileSystemStorage'" in block
+    assert "RedisCache" not in block
+    assert "cached.Loader" not in block
+
+
+def test_performance_settings_block_runs(monkeypatch):
+    """The block should be valid Python, and apply to production settings."""
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    block = performance_settings.build_settings_block(
+        ["django", "whitenoise", "redis"], _default_project_settings()
+    )
+    prod_settings = {
+        "DATABASES": {"default": {"ENGINE": "django.db.backends.postgresql"}},
+        "MIDDLEWARE": [
+            "django.middleware.security.SecurityMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+        ],
+        "TEMPLATES": [{"APP_DIRS": True, "OPTIONS": {}}],
+        "STORAGES": {"media": {"BACKEND": "storages.backends.s3.S3Storage"}},
+    }
+    exec(block, prod_settings)
+
+    assert prod_settings["DATABASES"]["default"]["CONN_HEALTH_CHECKS"] is True
+    assert prod_settings["MIDDLEWARE"][2] == "django.middleware.gzip.GZipMiddleware"
+    assert prod_settings["STORAGES"]["staticfiles"]["BACKEND"] == (
+        "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    )
+    assert "media" in prod_settings["STORAGES"]
+    assert prod_settings["CACHES"]["default"]["LOCATION"] == "redis://localhost:6379"
+
+
+def test_performance_settings_respects_existing_settings():
+    project_settings = _default_project_settings(
+        MIDDLEWARE=["django.middleware.gzip.GZipMiddleware"],
+        TEMPLATES=[
+            {
+                "OPTIONS": {
+                    "loaders": [
+                        (
+                            "django.template.loaders.locmem.Loader",
+                            {"index.html": "Hi", "debug": False, "extra": None},
+                        ),
+                    ]
+                }
+            }
+        ],
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache"}},
+    )
+    block = performance_settings.build_settings_block(["redis"], project_settings)
+
+    assert "GZipMiddleware" not in block
+    assert "RedisCache" not in block
+
+    # The loaders are written as Python, not JSON.
+    prefix = 'TEMPLATES[0]["OPTIONS"]["loaders"] = '
+    line = next(line for line in block.splitlines() if line.startswith(prefix))
+    prod_settings = {"TEMPLATES": [{"OPTIONS": {}}]}
+    exec(line, prod_settings)
+    assert prod_settings["TEMPLATES"][0]["OPTIONS"]["loaders"] == [
+        [
+            "django.template.loaders.cached.Loader",
+            [
+                (
+                    "django.template.loaders.locmem.Loader",
+                    {"index.html": "Hi", "debug": False, "extra": None},
+                )
+            ],
+        ]
+    ]
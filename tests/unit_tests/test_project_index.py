@@ -0,0 +1,55 @@
+"""Test the index of services in a project."""
+
+
+from simple_deploy.management.commands.utils import project_index
+
+
+
+# --- Project index ---
+
+
+def test_project_index(tmp_path):
+    """Every service is found once, and the index is reused until something changes."""
+    manage_py = 'os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blog.settings")\n'
+    for service_dir in ["services/blog", "services/shop", "node_modules/pkg", ".venv"]:
+        path = tmp_path / service_dir
+        (path / "blog").mkdir(parents=True)
+        (path / "blog" / "settings.py").write_text("")
+        (path / "manage.py").write_text(manage_py)
+    (tmp_path / ".venv" / "pyvenv.cfg").write_text("")
+    (tmp_path / ".venv" / "bin").mkdir()
+    (tmp_path / ".venv" / "bin" / "python").write_text("")
+    (tmp_path / "services" / "blog" / "pyproject.toml").write_text(
+        '[project]\ndependencies = ["django"]\n'
+    )
+    # A pyproject.toml file that only configures tools isn't a manifest.
+    (tmp_path / "services" / "shop" / "pyproject.toml").write_text("[tool.black]\n")
+    (tmp_path / "requirements.txt").write_text("django\n")
+
+    services, rescanned = project_index.get_services(tmp_path)
+    assert rescanned
+    assert [(s["name"], s["path"], s["manifest"]) for s in services] == [
+        ("blog", "services/blog", "services/blog/pyproject.toml"),
+        ("shop", "services/shop", "requirements.txt"),
+    ]
+    python_path = project_index.find_venv_python(tmp_path / "services/shop", tmp_path)
+    assert python_path == tmp_path / ".venv" / "bin" / "python"
+    services_dir = tmp_path / "services"
+    assert project_index.find_venv_python(services_dir, services_dir) is None
+
+    assert project_index.get_services(tmp_path) == (services, False)
+    assert project_index.find_service(services, "services/shop/") == services[1]
+    assert project_index.find_service(services, "missing") is None
+
+    (tmp_path / "services" / "docs").mkdir()
+    _services, rescanned = project_index.get_services(tmp_path)
+    assert rescanned
+
+
+def test_remove_option():
+    argv = ["--service", "shop", "--automate-all", "--service=blog", "--region", "x"]
+    assert project_index.remove_option(argv, "--service") == [
+        "--automate-all",
+        "--region",
+        "x",
+    ]
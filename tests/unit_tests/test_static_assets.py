@@ -0,0 +1,29 @@
+"""Test precompressing static files."""
+
+from simple_deploy.management.commands.utils import static_assets
+
+
+# --- Precompressing static files ---
+
+
+def test_precompress_skips_unchanged_files(tmp_path):
+    static_root = tmp_path / "static"
+    (static_root / "css").mkdir(parents=True)
+    css_path = static_root / "css" / "base.css"
+    css_path.write_text("body { margin: 0; padding: 0; }\n" * 100)
+    (static_root / "small.js").write_text("let x = 1;")
+    (static_root / "logo.png").write_bytes(b"\x89PNG" * 100)
+
+    summary = static_assets.precompress(static_root, max_workers=1)
+    assert summary["compressed"] == 2
+    assert summary["skipped"] == 0
+    assert summary["compressed_bytes"] < summary["original_bytes"]
+    assert (static_root / "css" / "base.css.gz").exists()
+    assert not (static_root / "small.js.gz").exists()
+    assert not (static_root / "logo.png.gz").exists()
+
+    # A second run only compresses files that changed.
+    css_path.write_text("body { margin: 1em; padding: 0; }\n" * 100)
+    summary = static_assets.precompress(static_root, max_workers=1)
+    assert summary["compressed"] == 1
+    assert summary["skipped"] == 1
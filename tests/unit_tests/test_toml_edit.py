@@ -0,0 +1,66 @@
+"""Test in-place edits of TOML files."""
+
+from textwrap import dedent
+
+from simple_deploy.management.commands.utils import toml_edit
+
+import toml
+
+
+# --- Editing TOML files ---
+
+
+def test_toml_edit_preserves_formatting():
+    contents = dedent(
+        """\
+        # Project manifest.
+        [tool.poetry]
+        name = "blog"  # The name on PyPI.
+        readme = '''
+        [tool.poetry.group.deploy]
+        '''
+        packages = [
+            { include = "blog" },
+        ]
+
+        [tool.poetry.dependencies]
+        Django = "*"
+
+        # Build settings.
+        [build-system]
+        requires = ["poetry-core"]
+        """
+    )
+    edited = toml_edit.set_key(contents, "tool.poetry.group.deploy", "optional", True)
+    edited = toml_edit.add_table(edited, "tool.poetry.group.deploy.dependencies")
+    edited = toml_edit.set_key(
+        edited, "tool.poetry.group.deploy.dependencies", "gunicorn", "*"
+    )
+    edited = toml_edit.set_key(edited, "tool.poetry.dependencies", "Django", "^5.1")
+
+    before, after = contents.split("\n# Build settings.")
+    assert edited == (
+        before.replace('Django = "*"', 'Django = "^5.1"')
+        + "\n[tool.poetry.group.deploy]\noptional = true\n"
+        + '\n[tool.poetry.group.deploy.dependencies]\ngunicorn = "*"\n'
+        + "\n# Build settings."
+        + after
+    )
+
+    # Tables defined with dotted keys can't be given a header.
+    contents = "[tool.poetry]\ngroup.deploy.optional = true\n"
+    edited = toml_edit.set_key(
+        contents, "tool.poetry.group.deploy.dependencies", "gunicorn", "*"
+    )
+    group = toml.loads(edited)["tool"]["poetry"]["group"]["deploy"]
+    assert group == {"optional": True, "dependencies": {"gunicorn": "*"}}
+
+
+def test_toml_edit_keeps_crlf():
+    """New lines in a CRLF file end with CRLF, and existing lines are unchanged."""
+    contents = '[project]\r\nname = "blog"\r\n\r\n[dependency-groups]\r\ndev = []\r\n'
+    edited = toml_edit.set_key(contents, "tool.poetry.group.deploy", "optional", True)
+    edited = toml_edit.add_to_array(edited, "dependency-groups", "deploy", "gunicorn")
+    assert edited == contents + (
+        'deploy = ["gunicorn"]\r\n\r\n[tool.poetry.group.deploy]\r\noptional = true\r\n'
+    )
@@ -5,6 +5,8 @@ Note: May need to rethink handling of sd_config, if tests start to affect each o
 
 from pathlib import Path
 import filecmp
+import json
+import shutil
 import sys
 import subprocess
 
@@ -150,6 +152,41 @@ def test_parse_pyproject_toml():
     ]
 
 
+def test_parse_pep621_pyproject():
+    path = Path(__file__).parent / "resources" / "pyproject_uv.toml"
+    requirements = sd_utils.parse_pep621_pyproject(path)
+
+    assert requirements == [
+        "Django",
+        "django-bootstrap5",
+        "psycopg",
+        "pytest",
+        "gunicorn",
+    ]
+
+
+def test_parse_uv_lock():
+    path = Path(__file__).parent / "resources" / "uv.lock"
+    versions = sd_utils.parse_uv_lock(path)
+
+    assert versions == {
+        "asgiref": "3.8.1",
+        "blog": "0.1.0",
+        "django": "5.1.3",
+        "django-bootstrap5": "24.3",
+        "gunicorn": "23.0.0",
+        "psycopg": "3.2.3",
+        "psycopg-binary": "3.2.3",
+    }
+
+
+@pytest.mark.parametrize(
+    "name", ["Django_Bootstrap5", "django.bootstrap5", "django--bootstrap5"]
+)
+def test_normalize_name(name):
+    assert sd_utils.normalize_name(name) == "django-bootstrap5"
+
+
 def test_create_poetry_deploy_group(tmp_path):
     path = Path(__file__).parent / "resources" / "pyproject_no_deploy.toml"
     contents = path.read_text()
@@ -195,6 +232,21 @@ def test_add_poetry_pkg(tmp_path):
     assert filecmp.cmp(tmp_pptoml, ref_file)
 
 
+def test_add_uv_pkg(tmp_path):
+    path = Path(__file__).parent / "resources" / "pyproject_uv.toml"
+    contents = path.read_text()
+
+    # Create tmp copy of file, and modify that one.
+    tmp_pptoml = tmp_path / "pyproject.toml"
+    tmp_pptoml.write_text(contents)
+
+    plugin_utils.add_uv_pkg(tmp_pptoml, "awesome-deployment-package", "")
+    ref_file = (
+        Path(__file__).parent / "reference_files" / "pyproject_uv_deploy_group.toml"
+    )
+    assert filecmp.cmp(tmp_pptoml, ref_file)
+
+
 def test_add_pipenv_pkg(tmp_path):
     path = Path(__file__).parent / "resources" / "Pipfile"
     contents = path.read_text()
@@ -225,3 +277,218 @@ def test_add_file(tmp_path):
 
     contents_from_file = path.read_text()
     assert contents_from_file == contents
+
+
+def test_get_paths_to_stage(tmp_path, monkeypatch):
+    """Only tracked paths that exist in the repository are staged."""
+    sd_config.unit_testing = "True"
+    sd_config.stdout = sys.stdout
+    monkeypatch.setattr(sd_config, "git_path", tmp_path / "project")
+    monkeypatch.setattr(sd_config, "touched_paths", set())
+    (tmp_path / "project").mkdir()
+
+    plugin_utils.add_file(tmp_path / "project" / "Procfile", "web: gunicorn\n")
+    plugin_utils.add_dir(tmp_path / "project" / "static")
+    plugin_utils.track_path(tmp_path / "project" / "deleted.txt")
+    plugin_utils.track_path(tmp_path / "outside.txt")
+    (tmp_path / "outside.txt").write_text("")
+
+    paths = plugin_utils._get_paths_to_stage()
+    assert paths == [
+        (tmp_path / "project" / "Procfile").resolve(),
+        (tmp_path / "project" / "static").resolve(),
+    ]
+
+
+def test_commit_changes(tmp_path, monkeypatch):
+    """Only paths deploy wrote are staged, and ignored paths are left out."""
+    project = tmp_path / "project"
+    project.mkdir()
+    for key in ["AUTHOR", "COMMITTER"]:
+        monkeypatch.setenv(f"GIT_{key}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{key}_EMAIL", "test@example.com")
+    monkeypatch.chdir(project)
+    (project / ".gitignore").write_text("simple_deploy_build/\n")
+    (project / "settings.py").write_text("DEBUG = True\n")
+    (project / "notes.txt").write_text("")
+    subprocess.run(["git", "init", "-q"], check=True)
+    subprocess.run(["git", "add", "."], check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "Initial commit."], check=True)
+
+    sd_config.unit_testing = "True"
+    sd_config.stdout = sys.stdout
+    monkeypatch.setattr(sd_config, "automate_all", True)
+    monkeypatch.setattr(sd_config, "git_path", project)
+    monkeypatch.setattr(sd_config, "touched_paths", set())
+
+    plugin_utils.add_file(project / "Procfile", "web: gunicorn\n")
+    plugin_utils.add_dir(project / "simple_deploy_build")
+    plugin_utils.track_path(project / "simple_deploy_build")
+    (project / "settings.py").write_text("DEBUG = False\n")
+    plugin_utils.track_path(project / "settings.py")
+    # Unrelated changes, to a tracked file and a new one, aren't committed.
+    (project / "notes.txt").write_text("Unrelated work in progress.\n")
+    (project / "unrelated.txt").write_text("")
+    plugin_utils.commit_changes()
+
+    output = subprocess.run(
+        ["git", "show", "--name-only", "--format="], capture_output=True, text=True
+    )
+    assert output.stdout.split() == ["Procfile", "settings.py"]
+    output = subprocess.run(
+        ["git", "status", "--porcelain"], capture_output=True, text=True
+    )
+    assert output.stdout.splitlines() == [" M notes.txt", "?? unrelated.txt"]
+
+
+def test_plan_changes_without_writing(tmp_path, monkeypatch):
+    """With a plan, changes are kept in the plan instead of written."""
+    sd_config.unit_testing = "True"
+    sd_config.stdout = sys.stdout
+    monkeypatch.setattr(sd_config, "plan", {})
+    monkeypatch.setattr(sd_config, "touched_paths", set())
+    req_txt_path = tmp_path / "requirements.txt"
+    req_txt_path.write_text("django")
+    procfile_path = tmp_path / "Procfile"
+    procfile_path.write_text("web: runserver\n")
+
+    plugin_utils.add_req_txt_pkg(req_txt_path, "gunicorn", "")
+    plugin_utils.add_req_txt_pkg(req_txt_path, "psycopg2", "<2.9")
+    plugin_utils.add_file(procfile_path, "web: gunicorn\n")
+    plugin_utils.add_dir(tmp_path / ".platform")
+
+    assert sd_config.plan == {
+        req_txt_path: "django\ngunicorn\npsycopg2<2.9",
+        procfile_path: "web: gunicorn\n",
+        tmp_path / ".platform": None,
+    }
+    assert plugin_utils.read_file(req_txt_path) == "django\ngunicorn\npsycopg2<2.9"
+    assert plugin_utils.path_exists(tmp_path / ".platform")
+    assert req_txt_path.read_text() == "django"
+    assert procfile_path.read_text() == "web: runserver\n"
+    assert not (tmp_path / ".platform").exists()
+
+
+# --- Dockerfile fragments ---
+
+
+@pytest.mark.parametrize(
+    "pkg_manager, lock_name, manifest_copy",
+    [
+        ("req_txt", None, "COPY requirements.txt ."),
+        ("poetry", "poetry.lock", "COPY pyproject.toml poetry.lock ./"),
+        ("pipenv", "Pipfile.lock", "COPY Pipfile Pipfile.lock ./"),
+    ],
+)
+def test_get_dockerfile_fragments(
+    tmp_path, monkeypatch, pkg_manager, lock_name, manifest_copy
+):
+    """Dependencies should be installed before the project is copied."""
+    resources = Path(__file__).parent / "resources"
+    for name in ["pyproject.toml", "Pipfile"]:
+        shutil.copy(resources / name, tmp_path / name)
+    if lock_name:
+        (tmp_path / lock_name).write_text("")
+    monkeypatch.setattr(sd_config, "pkg_manager", pkg_manager)
+    monkeypatch.setattr(sd_config, "pyprojecttoml_path", tmp_path / "pyproject.toml")
+    monkeypatch.setattr(sd_config, "pipfile_path", tmp_path / "Pipfile")
+
+    fragments = plugin_utils.get_dockerfile_fragments({"python_version": "3.12"})
+    dockerfile = fragments["dockerfile"]
+
+    assert dockerfile.startswith("# syntax=docker/dockerfile:1")
+    assert "FROM python:3.12-slim AS builder" in dockerfile
+    assert "FROM python:3.12-slim AS runtime" in dockerfile
+    assert "--mount=type=cache,target=/root/.cache/pip" in dockerfile
+    assert "--no-index --find-links=/wheels" in dockerfile
+    assert dockerfile.index(manifest_copy) < dockerfile.index("COPY . .")
+
+
+@pytest.mark.parametrize(
+    "pkg_manager, manifest_copy, lock_cmd",
+    [
+        ("poetry", "COPY pyproject.toml ./", "RUN poetry lock"),
+        ("pipenv", "COPY Pipfile ./", "RUN pipenv lock"),
+    ],
+)
+def test_get_dockerfile_fragments_without_lock(
+    tmp_path, monkeypatch, pkg_manager, manifest_copy, lock_cmd
+):
+    """Without a lock file, dependencies are locked from the manifest in the build."""
+    resources = Path(__file__).parent / "resources"
+    for name in ["pyproject.toml", "Pipfile"]:
+        shutil.copy(resources / name, tmp_path / name)
+    monkeypatch.setattr(sd_config, "pkg_manager", pkg_manager)
+    monkeypatch.setattr(sd_config, "pyprojecttoml_path", tmp_path / "pyproject.toml")
+    monkeypatch.setattr(sd_config, "pipfile_path", tmp_path / "Pipfile")
+
+    fragments = plugin_utils.get_dockerfile_fragments({"python_version": "3.12"})
+    dockerfile = fragments["dockerfile"]
+
+    assert ".lock ./" not in dockerfile
+    assert dockerfile.index(manifest_copy) < dockerfile.index(lock_cmd)
+
+
+def test_get_dockerfile_fragments_unlocked(tmp_path, monkeypatch):
+    """Packages missing from the lock file are added in the build, not the project."""
+    resources = Path(__file__).parent / "resources"
+    pipfile = (resources / "Pipfile").read_text()
+    pipfile = pipfile.replace('requests = "*"\n', 'requests = "*"\npsycopg2 = "<2.9"\n')
+    (tmp_path / "Pipfile").write_text(pipfile)
+    lock = {"default": {"django": {"version": "==5.1"}, "requests": {}}}
+    (tmp_path / "Pipfile.lock").write_text(json.dumps(lock))
+    monkeypatch.setattr(sd_config, "pkg_manager", "pipenv")
+    monkeypatch.setattr(sd_config, "pipfile_path", tmp_path / "Pipfile")
+
+    dockerfile = plugin_utils.get_dockerfile_fragments()["dockerfile"]
+    assert "-r requirements.txt django-bootstrap5 'psycopg2<2.9'\n" in dockerfile
+    assert "pipenv lock" not in dockerfile
+    assert (tmp_path / "Pipfile.lock").read_text() == json.dumps(lock)
+
+    # uv resolves again, keeping locked versions, only when something's missing.
+    pptoml_path = tmp_path / "pyproject.toml"
+    pptoml_path.write_text(
+        (resources / "pyproject_uv.toml")
+        .read_text()
+        .replace('"gunicorn",', '"gunicorn", "whitenoise",')
+    )
+    monkeypatch.setattr(sd_config, "pkg_manager", "uv")
+    monkeypatch.setattr(sd_config, "pyprojecttoml_path", pptoml_path)
+    monkeypatch.setattr(sd_config, "uv_lock_path", resources / "uv.lock")
+
+    dockerfile = plugin_utils.get_dockerfile_fragments()["dockerfile"]
+    assert "uv sync --no-dev --group deploy --no-install-project" in dockerfile
+
+
+def test_get_dockerfile_fragments_uv(monkeypatch):
+    """uv projects install from uv.lock into a virtual environment."""
+    resources = Path(__file__).parent / "resources"
+    monkeypatch.setattr(sd_config, "pkg_manager", "uv")
+    monkeypatch.setattr(sd_config, "pyprojecttoml_path", resources / "pyproject_uv.toml")
+    monkeypatch.setattr(sd_config, "uv_lock_path", resources / "uv.lock")
+
+    fragments = plugin_utils.get_dockerfile_fragments({"python_version": "3.12"})
+    dockerfile = fragments["dockerfile"]
+
+    assert "COPY pyproject.toml uv.lock ./" in dockerfile
+    assert "uv sync --frozen --no-dev --group deploy --no-install-project" in dockerfile
+    assert "COPY --from=builder /venv /venv" in dockerfile
+    assert dockerfile.index("uv sync") < dockerfile.index("COPY . .")
+
+
+def test_get_dockerfile_fragments_wheelhouse(tmp_path, monkeypatch):
+    """The wheelhouse is used by the builder, and left out of the runtime image."""
+    shutil.copy(Path(__file__).parent / "resources" / "requirements.txt", tmp_path)
+    monkeypatch.setattr(sd_config, "pkg_manager", "req_txt")
+    monkeypatch.setattr(sd_config, "req_txt_path", tmp_path / "requirements.txt")
+    monkeypatch.setattr(
+        sd_config, "wheelhouse_path", tmp_path / "simple_deploy_build" / "wheelhouse"
+    )
+    monkeypatch.setattr(sd_config, "project_root", tmp_path)
+    monkeypatch.setattr(plugin_utils, "build_wheelhouse", lambda **kwargs: None)
+
+    fragments = plugin_utils.get_dockerfile_fragments({"python_version": "3.12"})
+    runtime = fragments["runtime"]
+
+    assert "RUN rm -rf simple_deploy_build/wheelhouse" in runtime
+    assert runtime.rstrip().endswith("COPY --from=source /app .")
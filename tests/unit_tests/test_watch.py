@@ -0,0 +1,69 @@
+"""Test watch mode."""
+
+from textwrap import dedent
+
+from simple_deploy.management.commands.utils import watch
+
+
+
+# --- Watch mode ---
+
+
+def test_watched_paths(tmp_path):
+    settings_path = tmp_path / "blog" / "settings.py"
+    template_dir = tmp_path / "templates"
+    (template_dir / "nested").mkdir(parents=True)
+    (template_dir / "Procfile").write_text("")
+    (template_dir / "nested" / "settings.py").write_text("")
+
+    paths = watch.get_watched_paths(settings_path, tmp_path, [template_dir])
+    assert paths == [
+        settings_path,
+        tmp_path / "requirements.txt",
+        tmp_path / "Pipfile",
+        tmp_path / "Pipfile.lock",
+        tmp_path / "pyproject.toml",
+        tmp_path / "poetry.lock",
+        tmp_path / "uv.lock",
+        template_dir,
+        template_dir / "Procfile",
+        template_dir / "nested",
+        template_dir / "nested" / "settings.py",
+    ]
+
+
+def test_format_plan_and_plan_diff(tmp_path):
+    settings_path = tmp_path / "blog" / "settings.py"
+    settings_path.parent.mkdir()
+    settings_path.write_text("DEBUG = True\n")
+    procfile_path = tmp_path / "Procfile"
+    settings_block = "DEBUG = True\n\n# Platform settings.\nDEBUG = False\n"
+    plan = {settings_path: settings_block, procfile_path: "web: gunicorn\n"}
+
+    assert watch.format_plan(plan, tmp_path) == dedent(
+        """\
+        --- /dev/null
+        +++ b/Procfile
+        @@ -0,0 +1 @@
+        +web: gunicorn
+        --- a/blog/settings.py
+        +++ b/blog/settings.py
+        @@ -1 +1,4 @@
+         DEBUG = True
+        +
+        +# Platform settings.
+        +DEBUG = False"""
+    )
+    assert watch.format_plan({}, tmp_path) == "No changes planned."
+
+    # Only the changes to the plan are shown.
+    new_plan = {settings_path: settings_block, tmp_path / ".platform": None}
+    assert watch.get_plan_diff(plan, plan, tmp_path) == ""
+    assert watch.get_plan_diff(plan, new_plan, tmp_path) == dedent(
+        """\
+        New directory: .platform/
+        --- a/Procfile
+        +++ /dev/null
+        @@ -1 +0,0 @@
+        -web: gunicorn"""
+    )
@@ -0,0 +1,57 @@
+"""Test building a wheelhouse."""
+
+from simple_deploy.management.commands.utils import wheelhouse
+
+import pytest
+
+
+# --- Wheelhouse ---
+
+
+def test_pin_requirements():
+    specs = wheelhouse.pin_requirements(
+        ["pytest", "django-bootstrap5==24.3", "not-an-installed-package"]
+    )
+    assert specs[0] == f"pytest=={pytest.__version__}"
+    assert specs[1:] == ["django-bootstrap5==24.3", "not-an-installed-package"]
+
+    # Locked versions are used first, keeping extras and markers.
+    specs = wheelhouse.pin_requirements(
+        ["Django>=5.1", "psycopg[binary]>=3.2 ; sys_platform != 'win32'", "pytest"],
+        {"django": "5.1.3", "psycopg": "3.2.3"},
+    )
+    assert specs == [
+        "Django==5.1.3",
+        "psycopg[binary]==3.2.3; sys_platform != 'win32'",
+        f"pytest=={pytest.__version__}",
+    ]
+
+
+def test_fetch_wheels_uses_cache(tmp_path):
+    """Wheels are cached by pin, and linked into the wheelhouse."""
+    source_dir = tmp_path / "index"
+    source_dir.mkdir()
+    wheel_path = source_dir / "demo_pkg-1.0-py3-none-any.whl"
+    wheel_path.write_bytes(b"not really a wheel")
+    wheels = [
+        {
+            "name": "demo-pkg",
+            "version": "1.0",
+            "url": wheel_path.as_uri(),
+            "sha256": None,
+        }
+    ]
+    cache_dir = tmp_path / "cache"
+
+    results = wheelhouse.fetch_wheels(wheels, cache_dir)
+    assert results == [(cache_dir / "demo-pkg==1.0" / wheel_path.name, False)]
+
+    # The second fetch comes from the cache, even if the source is gone.
+    wheel_path.unlink()
+    results = wheelhouse.fetch_wheels(wheels, cache_dir)
+    assert results[0][1]
+
+    wheelhouse_dir = tmp_path / "wheelhouse"
+    wheelhouse.populate_wheelhouse(wheelhouse_dir, [results[0][0]], wheels)
+    assert (wheelhouse_dir / wheel_path.name).read_bytes() == b"not really a wheel"
+    assert (wheelhouse_dir / "requirements.txt").read_text() == "demo-pkg==1.0\n"
@@ -0,0 +1,230 @@
+"""Fake command-line tools for exercising --automate-all code paths offline.
+
+With --automate-all, plugins call platform CLIs such as `fly` and `heroku`, and push
+the project with git. Normally that can only be tested by e2e tests, against real
+accounts. A FakeCLI writes stand-in executables to a bin/ dir, and puts that dir at
+the front of PATH. Each fake command:
+- Records every invocation (args, cwd, time) to a shared JSON lines file;
+- Replays a canned response that matches the args it was called with;
+- Can wait before responding, and between lines of output, to simulate latency;
+- Can fail a given number of times before succeeding, to simulate flaky services.
+
+Any git command that doesn't match a canned response is passed through to the real
+git executable, so local commits still work while `git push` is faked.
+
+Usage:
+    fake_cli = FakeCLI(tmp_path)
+    fake_cli.add_command(
+        "fly",
+        responses=[
+            {"match": ["apps", "list"], "json": [{"Name": "my-app"}]},
+            {"match": ["deploy"], "stderr": "Deploying...\\nDone.\\n", "line_delay": 0.1},
+        ],
+    )
+    fake_cli.add_git(push_response={"stderr": "To fake-remote\\n", "latency": 0.5})
+    with fake_cli:
+        ...
+    assert fake_cli.invocations("fly")[0]["args"] == ["apps", "list"]
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+
+# Every fake executable runs this script, with the path to its spec file filled in.
+RUNNER_SCRIPT = r'''
+import json, os, sys, time, subprocess
+
+SPEC_PATH = {spec_path!r}
+LOG_PATH = {log_path!r}
+
+
+def count_prior_matches(name, response_index):
+    """Count earlier invocations of this command that used the same response."""
+    if not os.path.exists(LOG_PATH):
+        return 0
+    with open(LOG_PATH) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sum(
+        1 for r in records if r["name"] == name and r["response"] == response_index
+    )
+
+
+def emit(text, stream, line_delay):
+    """Write output, pausing between lines if requested."""
+    for line in text.splitlines(keepends=True):
+        stream.write(line)
+        stream.flush()
+        if line_delay:
+            time.sleep(line_delay)
+
+
+with open(SPEC_PATH) as f:
+    spec = json.load(f)
+
+name, args = spec["name"], sys.argv[1:]
+
+# Find the first response whose match list is a prefix of the args.
+response_index, response = None, None
+for index, candidate in enumerate(spec["responses"]):
+    match = candidate.get("match", [])
+    if args[: len(match)] == match:
+        response_index, response = index, candidate
+        break
+
+attempt = count_prior_matches(name, response_index) + 1
+record = {{
+    "name": name,
+    "args": args,
+    "cwd": os.getcwd(),
+    "time": time.time(),
+    "response": response_index,
+    "attempt": attempt,
+}}
+with open(LOG_PATH, "a") as f:
+    f.write(json.dumps(record) + "\n")
+
+if response is None:
+    if spec.get("passthrough"):
+        sys.exit(subprocess.run([spec["passthrough"], *args]).returncode)
+    sys.stderr.write(f"fake {{name}}: no response for args {{args}}\n")
+    sys.exit(spec.get("unmatched_returncode", 1))
+
+time.sleep(response.get("latency", 0))
+
+if attempt <= response.get("fail_times", 0):
+    failure = response.get("failure", {{}})
+    emit(failure.get("stderr", f"fake {{name}}: simulated failure\n"), sys.stderr, 0)
+    sys.exit(failure.get("returncode", 1))
+
+stdout = response.get("stdout", "")
+if "json" in response:
+    stdout = json.dumps(response["json"])
+line_delay = response.get("line_delay", 0)
+emit(stdout, sys.stdout, line_delay)
+emit(response.get("stderr", ""), sys.stderr, line_delay)
+sys.exit(response.get("returncode", 0))
+'''
+
+
+class FakeCLI:
+    """A set of fake command-line tools, placed at the front of PATH."""
+
+    def __init__(self, root_dir):
+        """Set up the directories where fake commands and their specs live."""
+        self.root_dir = Path(root_dir)
+        self.bin_dir = self.root_dir / "bin"
+        self.specs_dir = self.root_dir / "specs"
+        self.log_path = self.root_dir / "invocations.jsonl"
+
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        self.specs_dir.mkdir(parents=True, exist_ok=True)
+        self._orig_path = None
+
+    def add_command(self, name, responses=None, passthrough=None, unmatched_returncode=1):
+        """Add a fake command.
+
+        Each response is a dict. All keys are optional:
+        - match: List of leading args this response applies to. Default: all calls.
+        - stdout, stderr: Text to write to each stream.
+        - json: Object to write to stdout as JSON, instead of stdout.
+        - returncode: Exit code. Default: 0.
+        - latency: Seconds to wait before writing any output.
+        - line_delay: Seconds to wait after each line of output.
+        - fail_times: Number of calls that fail before this response succeeds.
+        - failure: dict with stderr and returncode, used for those failures.
+
+        Responses are checked in order; the first matching response is used. If no
+        response matches, the call is passed through to the passthrough executable if
+        one is given. Otherwise it fails with unmatched_returncode.
+
+        Returns:
+        - Path: Path to the fake executable.
+        """
+        spec = {
+            "name": name,
+            "responses": responses or [],
+            "passthrough": str(passthrough) if passthrough else None,
+            "unmatched_returncode": unmatched_returncode,
+        }
+        spec_path = self.specs_dir / f"{name}.json"
+        spec_path.write_text(json.dumps(spec, indent=2))
+
+        script = RUNNER_SCRIPT.format(
+            spec_path=str(spec_path), log_path=str(self.log_path)
+        )
+        script_path = self.bin_dir / name
+        script_path.write_text(f"#!{sys.executable}\n{script}")
+        script_path.chmod(0o755)
+
+        if os.name == "nt":
+            # Windows doesn't use shebang lines, so add a .cmd shim.
+            shim_path = self.bin_dir / f"{name}.cmd"
+            shim_path.write_text(f'@"{sys.executable}" "{script_path}" %*\n')
+
+        return script_path
+
+    def add_git(self, push_response=None, responses=None):
+        """Add a fake git, which fakes `git push` and passes everything else through.
+
+        Returns:
+        - Path: Path to the fake executable.
+        """
+        real_git = self._orig_which("git")
+        if push_response is None:
+            push_response = {"stderr": "To fake-remote\n   main -> main\n"}
+        push_response = {"match": ["push"], **push_response}
+
+        responses = (responses or []) + [push_response]
+        return self.add_command("git", responses=responses, passthrough=real_git)
+
+    def install(self):
+        """Put the fake commands at the front of PATH."""
+        self._orig_path = os.environ.get("PATH", "")
+        os.environ["PATH"] = os.pathsep.join([str(self.bin_dir), self._orig_path])
+
+    def uninstall(self):
+        """Restore the original PATH."""
+        if self._orig_path is not None:
+            os.environ["PATH"] = self._orig_path
+            self._orig_path = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+
+    def invocations(self, name=None):
+        """Get recorded invocations, optionally only those for one command.
+
+        Returns:
+        - List[dict]: One dict per invocation, in the order they were made.
+        """
+        if not self.log_path.exists():
+            return []
+
+        lines = self.log_path.read_text().splitlines()
+        records = [json.loads(line) for line in lines if line.strip()]
+        if name is None:
+            return records
+        return [r for r in records if r["name"] == name]
+
+    def clear_invocations(self):
+        """Forget all recorded invocations, ie between phases of a benchmark."""
+        if self.log_path.exists():
+            self.log_path.unlink()
+
+    # --- Helper methods ---
+
+    def _orig_which(self, name):
+        """Find a real executable, ignoring any fake commands."""
+        path = os.environ.get("PATH", "")
+        if self._orig_path is not None:
+            path = self._orig_path
+        path_dirs = [p for p in path.split(os.pathsep) if Path(p) != self.bin_dir]
+        return shutil.which(name, path=os.pathsep.join(path_dirs))